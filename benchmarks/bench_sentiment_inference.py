@@ -0,0 +1,186 @@
+# benchmarks/bench_sentiment_inference.py
+"""
+Benchmark throughput tahap inferensi sentimen (compute_sentiment_scores).
+
+Contoh:
+    python benchmarks/bench_sentiment_inference.py
+    python benchmarks/bench_sentiment_inference.py --batch-sizes 16,64 --threads 1,4 --backends torch,onnx
+
+Tanpa --model, benchmark memakai BERT kecil berbobot acak (offline).
+Setiap konfigurasi dijalankan di proses baru agar peak RSS tidak saling tercampur.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import multiprocessing as mp
+from datetime import datetime
+from itertools import product
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from benchmarks.synthetic_corpus import make_corpus
+from benchmarks.tiny_model import build_tiny_model
+
+RESULT_DIR = PROJECT_ROOT / "benchmarks" / "results"
+
+
+def _peak_rss_mb():
+    """Peak resident memory proses ini (MB); None bila tidak tersedia."""
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+            mem = psutil.Process().memory_info()
+            return getattr(mem, "peak_wset", mem.rss) / 2**20
+        except ImportError:
+            return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KB, macOS: byte
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+def _run_config(cfg):
+    """Dijalankan di proses terpisah: satu kombinasi backend/thread/batch."""
+    os.environ["TQDM_DISABLE"] = "1"
+
+    import torch
+    from sentiment import model_registry
+    from sentiment.sentiment_inference import compute_sentiment_scores
+
+    torch.set_num_threads(cfg["threads"])
+    if cfg["backend"] != "torch":
+        from sentiment.onnx_backend import load_onnx_model_and_tokenizer
+        entry = load_onnx_model_and_tokenizer(
+            cfg["model"], quantize=(cfg["backend"] == "onnx-int8"), num_threads=cfg["threads"]
+        )
+        model_registry.register_model(entry, cfg["model"], cfg["backend"])
+
+    df = make_corpus(cfg["n_comments"], seed=cfg["seed"])
+    kwargs = dict(
+        batch_size=cfg["batch_size"],
+        model_name=cfg["model"],
+        max_tokens=cfg["max_tokens"],
+        use_token_cache=False,
+        use_result_cache=False,
+        backend=cfg["backend"],
+    )
+
+    # pemanasan (load model, alokasi awal)
+    compute_sentiment_scores(df.head(64), **kwargs)
+
+    timings = []
+    start = time.perf_counter()
+    compute_sentiment_scores(df, batch_timings=timings, **kwargs)
+    wall = time.perf_counter() - start
+
+    latency_ms = np.array([t[3] for t in timings]) * 1000
+    real_tokens = int(sum(t[1] for t in timings))
+    padded_tokens = int(sum(t[2] for t in timings))
+    forward_time = float(sum(t[3] for t in timings))
+
+    return {
+        **cfg,
+        "n_batches": len(timings),
+        "n_unique_comments": int(sum(t[0] for t in timings)),
+        "wall_s": wall,
+        "comments_per_s": cfg["n_comments"] / wall,
+        "tokens_per_s": real_tokens / forward_time if forward_time else None,
+        "padding_ratio": padded_tokens / real_tokens if real_tokens else None,
+        "batch_latency_p50_ms": float(np.percentile(latency_ms, 50)) if len(latency_ms) else None,
+        "batch_latency_p95_ms": float(np.percentile(latency_ms, 95)) if len(latency_ms) else None,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def _int_list(value):
+    return [int(x) for x in value.split(",") if x.strip()]
+
+
+def parse_args():
+    cpu = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Benchmark inferensi sentimen IndoBERT")
+    parser.add_argument("--model", default=None,
+                        help="Nama/path model lokal (default: BERT kecil acak, offline)")
+    parser.add_argument("--n-comments", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-sizes", type=_int_list, default=[16, 64, 128])
+    parser.add_argument("--max-tokens", type=_int_list, default=[4096])
+    parser.add_argument("--threads", type=_int_list, default=sorted({1, cpu}))
+    parser.add_argument("--backends", default="torch",
+                        help="Daftar backend dipisah koma: torch, onnx, onnx-int8")
+    parser.add_argument("--output", default=None, help="Path file JSON hasil")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    model = args.model or build_tiny_model()
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+
+    configs = [
+        {
+            "model": model,
+            "backend": backend,
+            "threads": threads,
+            "batch_size": batch_size,
+            "max_tokens": max_tokens,
+            "n_comments": args.n_comments,
+            "seed": args.seed,
+        }
+        for backend, threads, batch_size, max_tokens in product(
+            backends, args.threads, args.batch_sizes, args.max_tokens
+        )
+    ]
+
+    print(f"[INFO] {len(configs)} konfigurasi, {args.n_comments} komentar sintetis, model: {model}")
+    results = []
+    ctx = mp.get_context("spawn")
+    for cfg in configs:
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as ex:
+            res = ex.submit(_run_config, cfg).result()
+        results.append(res)
+        print(
+            f"  {res['backend']:<9} threads={res['threads']:<3} batch={res['batch_size']:<4} "
+            f"max_tokens={res['max_tokens']:<6} | {res['comments_per_s']:8.1f} komentar/s "
+            f"| {res['tokens_per_s'] or 0:9.1f} token/s "
+            f"| p50 {res['batch_latency_p50_ms'] or 0:7.1f} ms p95 {res['batch_latency_p95_ms'] or 0:7.1f} ms "
+            f"| RSS {res['peak_rss_mb'] or 0:7.1f} MB"
+        )
+
+    import torch
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "torch": torch.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "model": model,
+            "n_comments": args.n_comments,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+    if args.output:
+        out_path = Path(args.output)
+    else:
+        RESULT_DIR.mkdir(parents=True, exist_ok=True)
+        out_path = RESULT_DIR / f"sentiment_inference_{datetime.now():%Y%m%d_%H%M%S}.json"
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"[DONE] Hasil benchmark tersimpan: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# benchmarks/synthetic_corpus.py
+import numpy as np
+import pandas as pd
+
+# Kosakata mirip komentar YouTube berbahasa Indonesia (sudah di-cleaning)
+VOCAB = (
+    "pak bu menteri menkeu keuangan pajak rakyat negara pemerintah uang harga "
+    "naik turun mahal murah kerja gaji utang apbn subsidi bbm beras cabe sembako "
+    "korupsi koruptor dpr presiden kebijakan ekonomi rupiah dolar investasi "
+    "saya kami kita mereka dia anda kalian ini itu yang dan atau tapi karena jadi "
+    "tidak nggak gak ga bukan jangan sudah belum masih akan bisa harus mau "
+    "mantap setuju bagus keren hebat semangat sukses amin jelek parah kecewa "
+    "bohong omong kosong pencitraan sombong pintar bodoh benar salah betul "
+    "banget sekali aja saja dong sih deh kok lah kan nih tuh wkwk wkwkwk haha "
+    "semoga mudah2an lebih baik buruk cepat lambat terus lagi juga pun hanya "
+    "di ke dari untuk dengan pada oleh dalam atas bawah sama buat kalau kapan"
+).split()
+
+PUNCT = [".", ",", "!", "?", ""]
+
+
+def make_corpus(n_comments=5_000, seed=42, reply_ratio=0.35):
+    """
+    Buat DataFrame komentar sintetis dengan distribusi panjang realistis
+    (mayoritas pendek, ekor panjang), lengkap dengan struktur thread.
+    """
+    rng = np.random.default_rng(seed)
+
+    # jumlah kata ~ lognormal: median ~8 kata, sebagian kecil >80 kata
+    n_words = np.clip(rng.lognormal(mean=2.1, sigma=0.9, size=n_comments), 1, 200).astype(int)
+    vocab = np.array(VOCAB)
+
+    comments = []
+    for n in n_words:
+        words = rng.choice(vocab, size=n)
+        text = " ".join(words)
+        comments.append(text + rng.choice(PUNCT))
+
+    # komentar generik yang sering muncul berulang
+    n_dup = int(n_comments * 0.05)
+    dup_idx = rng.choice(n_comments, size=n_dup, replace=False)
+    for i in dup_idx:
+        comments[i] = rng.choice(["mantap", "setuju", "semangat pak", "amin", "wkwkwk"])
+
+    is_reply = rng.random(n_comments) < reply_ratio
+    is_reply[0] = False
+    thread_no = np.cumsum(~is_reply)
+    thread_id = [f"{t:032x}" for t in thread_no]
+    likes = np.floor(rng.pareto(1.2, size=n_comments)).astype(int)
+
+    return pd.DataFrame({
+        "thread_id": thread_id,
+        "cleaned_comment": comments,
+        "likes_count": likes,
+        "is_reply": is_reply,
+    })
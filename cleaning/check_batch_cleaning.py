@@ -0,0 +1,84 @@
+# cleaning/check_batch_cleaning.py
+"""
+Verifikasi cleaning batch (clean_comments) terhadap golden file.
+
+1. Per baris: clean_comments(series) == clean_comment_pipeline(text) untuk semua
+   komentar di scrapping/dataset ditambah kasus tepi.
+2. Per file: hasil clean_dataframe yang disimpan sebagai CSV harus byte-identik
+   dengan cleaning/dataset/*_cleaned.csv yang ada di repo.
+
+Jalankan dari root project: python -m cleaning.check_batch_cleaning
+"""
+import os
+import sys
+import time
+import tempfile
+
+import pandas as pd
+
+from pipeline.storage import read_table
+from .cleaner import SCRAP_DATASET_DIR, CLEAN_DATASET_DIR, list_available_datasets, clean_dataframe, save_cleaned
+from .text_utils import clean_comments, clean_comment_pipeline
+
+EDGE_CASES = [
+    "", " ", "nan", "#@x", "@#y", "@user#tag teks", "(https://a.b) (  http://c.d/e)",
+    "lihat https://youtu.be/x?t=1.", "1️⃣ 2️⃣ #️⃣", "👨‍👩‍👧 keluarga", "🇮🇩 merdeka", "👍🏽👍🏽",
+    "\"\"kutipan\"\"", "'''", "...!!! mantap", "İSTANBUL ẞ", "tab\tdan\nbaris", "\x1cpemisah\x1f",
+    "“kutip miring” … ©", "mantap👍pak", "-:[ ] awal", "emoji saja 😂😂😂",
+]
+
+
+def check_rows(texts):
+    """Bandingkan per baris; mengembalikan (mismatches, durasi per-teks, durasi batch)."""
+    t0 = time.perf_counter()
+    expected = [clean_comment_pipeline(t) for t in texts]
+    t1 = time.perf_counter()
+    got = clean_comments(pd.Series(texts, dtype=object)).tolist()
+    t2 = time.perf_counter()
+    mismatches = [(t, e, g) for t, e, g in zip(texts, expected, got) if e != g]
+    return mismatches, t1 - t0, t2 - t1
+
+
+def check_golden(file_name, tmp_dir):
+    golden = os.path.join(CLEAN_DATASET_DIR, file_name.replace(".csv", "_cleaned.csv"))
+    if not os.path.exists(golden):
+        return None
+    cleaned_df, _ = clean_dataframe(read_table(os.path.join(SCRAP_DATASET_DIR, file_name)), name=file_name)
+    out = os.path.join(tmp_dir, os.path.basename(golden))
+    path = save_cleaned(cleaned_df, out, fmt="csv")
+    with open(path, "rb") as a, open(golden, "rb") as b:
+        return a.read() == b.read()
+
+
+def main():
+    failed = False
+    files = list_available_datasets()
+
+    texts = list(EDGE_CASES)
+    for f in files:
+        texts += read_table(os.path.join(SCRAP_DATASET_DIR, f))["comment"].astype(str).tolist()
+
+    mismatches, t_row, t_batch = check_rows(texts)
+    print(f"[CHECK] Per baris: {len(texts)} teks, {len(mismatches)} berbeda "
+          f"(per-teks {t_row:.2f}s, batch {t_batch:.2f}s)")
+    for text, expected, got in mismatches[:10]:
+        print(f"  ✗ {text!r}\n    pipeline: {expected!r}\n    batch   : {got!r}")
+    failed |= bool(mismatches)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for f in files:
+            same = check_golden(f, tmp_dir)
+            if same is None:
+                print(f"[SKIP] Golden file untuk {f} tidak ada")
+                continue
+            print(f"[CHECK] {f}: {'✓ identik' if same else '✗ BERBEDA'} dengan golden file")
+            failed |= not same
+
+    if failed:
+        print("\n[FAIL] Cleaning batch tidak identik dengan pipeline lama.")
+        sys.exit(1)
+    print("\n🎉 Cleaning batch identik dengan golden file.")
+
+
+if __name__ == "__main__":
+    main()
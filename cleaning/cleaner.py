@@ -1,97 +1,187 @@
 # cleaning/cleaner.py
 import os
+import numpy as np
 import pandas as pd
 from tqdm import tqdm
-from .text_utils import clean_comment_pipeline, detect_empty_reason
+from .text_utils import clean_comment_pipeline, clean_comments_flagged, flag_empty
+from pipeline.storage import list_tables, read_table, write_table
+from pipeline.thread_ids import intern_thread_ids
 
 SCRAP_DATASET_DIR = os.path.join(os.path.dirname(__file__), "..", "scrapping", "dataset")
 CLEAN_DATASET_DIR = os.path.join(os.path.dirname(__file__), "dataset")
 os.makedirs(CLEAN_DATASET_DIR, exist_ok=True)
 
 def list_available_datasets():
-    """List semua file CSV di folder scrapping/dataset."""
-    files = [f for f in os.listdir(SCRAP_DATASET_DIR) if f.endswith(".csv")]
-    files.sort()
-    return files
+    """List semua dataset (CSV/Parquet) di folder scrapping/dataset."""
+    return [p.name for p in list_tables(SCRAP_DATASET_DIR)]
+
+
+def clean_comment_column(comments, name=""):
+    """
+    Bersihkan satu kolom komentar mentah.
+    Mengembalikan (cleaned, is_empty, empty_reason, success, fail); empty_reason kategorikal,
+    NaN untuk baris yang tidak kosong.
+    """
+    comments = pd.Series(comments, dtype=object).reset_index(drop=True)
+    as_text = comments.astype(str)
+    success_count, fail_count = 0, 0
+
+    # === Cleaning + deteksi komentar kosong (batch, satu operasi per langkah untuk seluruh kolom) ===
+    try:
+        cleaned, is_empty, empty_reason = clean_comments_flagged(as_text, raw=comments)
+        success_count = len(cleaned)
+    except Exception as e:
+        # fallback per baris agar baris yang gagal tetap tercatat
+        print(f"[WARN] Cleaning batch gagal ({e}), lanjut per baris...")
+        cleaned = []
+        for i, text in tqdm(enumerate(as_text), total=len(as_text), desc=f"Cleaning {name}", ncols=90):
+            try:
+                cleaned.append(clean_comment_pipeline(text))
+                success_count += 1
+            except Exception as e:
+                print(f"[ERROR] Gagal membersihkan baris {i}: {e}")
+                cleaned.append(text)
+                fail_count += 1
+        is_empty, empty_reason = flag_empty(comments, cleaned)
+
+    return cleaned, is_empty, empty_reason, success_count, fail_count
+
+
+def build_cleaned(df, cleaned, is_empty, empty_reason, success_count, fail_count):
+    """Susun DataFrame *_cleaned dan statistik dari hasil clean_comment_column."""
+    # === Hapus baris kosong ===
+    keep = ~is_empty
+    kept = df[keep]
+
+    # === Kolom penting untuk tahap berikutnya ===
+    cleaned_df = pd.DataFrame({
+        "thread_id": intern_thread_ids(kept["thread_id"]),
+        "cleaned_comment": pd.Series(np.asarray(cleaned, dtype=object)[keep], index=kept.index),
+        "likes_count": kept["likes_count"],
+        "is_reply": kept["is_reply"]
+    })
+
+    # === Statistik kosong dari satu value_counts ===
+    reasons = pd.Series(empty_reason).value_counts()
+    stats = {
+        "total_rows": len(kept),
+        "success": success_count,
+        "fail": fail_count,
+        "deleted": int(is_empty.sum()),
+        "emoji": int(reasons.get("emoji_saja", 0)),
+        "punct": int(reasons.get("tanda_baca_saja", 0)),
+        "other": int(reasons.get("lainnya", 0)),
+    }
+    return cleaned_df, stats
+
+
+def prepare_raw(df: pd.DataFrame, name: str = ""):
+    """Validasi kolom wajib dan siapkan kolom opsional pada DataFrame mentah."""
+    if "comment" not in df.columns or "likes_count" not in df.columns:
+        raise ValueError(f"Kolom 'comment' atau 'likes_count' tidak ditemukan pada {name}.")
+
+    df = df.reset_index(drop=True)
+
+    # === Siapkan kolom opsional agar tidak error ===
+    if "thread_id" not in df.columns:
+        df["thread_id"] = None
+    if "is_reply" not in df.columns:
+        df["is_reply"] = False
+    return df
+
+
+def clean_dataframe(df: pd.DataFrame, name: str = "", num_workers: int = 1):
+    """
+    Membersihkan DataFrame komentar mentah di memori (tanpa baca/tulis file).
+    num_workers > 1: kolom komentar dibagi per chunk baris ke process pool.
+    Mengembalikan (cleaned_df, stats).
+    """
+    df = prepare_raw(df, name)
+    if num_workers > 1:
+        from .parallel_cleaning import clean_comment_column_parallel
+        result = clean_comment_column_parallel(df["comment"], num_workers=num_workers)
+    else:
+        result = clean_comment_column(df["comment"], name=name)
+    return build_cleaned(df, *result)
+
+
+def print_cleaning_summary(stats):
+    print(f"[SUMMARY] Total baris: {stats['total_rows']} | Berhasil diproses: {stats['success']} | Gagal: {stats['fail']}")
 
+    print(f"[FILTER] Baris kosong dihapus: {stats['deleted']}")
+    if stats["deleted"] > 0:
+        print(f" ├─ Hanya emoji: {stats['emoji']}")
+        print(f" ├─ Hanya tanda baca: {stats['punct']}")
+        print(f" └─ Lainnya: {stats['other']}")
+    else:
+        print("[FILTER] Tidak ada baris kosong yang dihapus.")
+
+
+def save_cleaned(cleaned_df, output_path, fmt=None):
+    """Simpan dataset *_cleaned (dipakai runner cleaning dan pipeline). Mengembalikan path file."""
+    return write_table(cleaned_df, output_path, fmt=fmt, quoting=1)
+
+
+def load_dataset_job(file_name: str, use_cache: bool = True):
+    """
+    Siapkan satu file untuk dibersihkan: cek cache, baca dan validasi dataset mentah.
+    Mengembalikan (df, output_path, key), atau None bila dilewati/gagal dibaca.
+    """
+    from pipeline.stage_cache import file_stage_key, outputs_fresh
 
-def clean_dataset(file_name: str):
-    """Membersihkan satu file dataset dan menyimpannya ke folder cleaning/dataset."""
     input_path = os.path.join(SCRAP_DATASET_DIR, file_name)
     output_name = file_name.replace(".csv", "_cleaned.csv")
     output_path = os.path.join(CLEAN_DATASET_DIR, output_name)
 
+    key = file_stage_key("cleaned", [input_path])
+    if use_cache and outputs_fresh([output_path], key):
+        print(f"\n[SKIP] {file_name}: input & kode tidak berubah, {output_name} sudah ada")
+        return None
+
     print(f"\n[PROCESS] Membersihkan file: {file_name}")
 
     # === Baca dataset mentah ===
     try:
-        df = pd.read_csv(input_path)
+        df = read_table(input_path)
     except Exception as e:
         print(f"[ERROR] Gagal membaca file {file_name}: {e}")
-        return
+        return None
 
-    # === Validasi kolom wajib ===
-    if "comment" not in df.columns or "likes_count" not in df.columns:
-        print(f"[ERROR] Kolom 'comment' atau 'likes_count' tidak ditemukan pada {file_name}.")
-        return
-
-    # === Siapkan kolom opsional agar tidak error ===
-    if "thread_id" not in df.columns:
-        df["thread_id"] = None
-    if "is_reply" not in df.columns:
-        df["is_reply"] = False
+    try:
+        df = prepare_raw(df, name=file_name)
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        return None
+    return df, output_path, key
 
-    success_count, fail_count = 0, 0
-    cleaned_comments = []
-
-    # === Lakukan cleaning komentar ===
-    for i, text in tqdm(enumerate(df["comment"].astype(str)), total=len(df), desc=f"Cleaning {file_name}", ncols=90):
-        try:
-            cleaned = clean_comment_pipeline(text)
-            cleaned_comments.append(cleaned)
-            success_count += 1
-        except Exception as e:
-            print(f"[ERROR] Gagal membersihkan baris {i}: {e}")
-            cleaned_comments.append(text)
-            fail_count += 1
-
-    df["cleaned_comment"] = cleaned_comments
-
-    # === Deteksi komentar kosong ===
-    df["empty_reason"] = df.apply(
-        lambda x: detect_empty_reason(x["comment"]) if not str(x["cleaned_comment"]).strip() else None,
-        axis=1
-    )
-
-    # === Hitung statistik kosong ===
-    empty_rows = df[df["cleaned_comment"].astype(str).str.strip() == ""]
-    count_emoji = (empty_rows["empty_reason"] == "emoji_saja").sum()
-    count_punct = (empty_rows["empty_reason"] == "tanda_baca_saja").sum()
-    count_other = (empty_rows["empty_reason"] == "lainnya").sum()
-    total_deleted = len(empty_rows)
 
-    # === Hapus baris kosong ===
-    df = df[df["cleaned_comment"].astype(str).str.strip() != ""]
+def save_dataset_result(output_path, key, cleaned_df, stats):
+    """
+    Simpan hasil akhir satu file dan catat kunci cache-nya.
+    Mengembalikan True bila file tersimpan, False bila gagal (error sudah dicetak).
+    """
+    from pipeline.stage_cache import record_outputs
 
     # === Simpan hasil akhir dengan kolom penting ===
-    cleaned_df = pd.DataFrame({
-        "thread_id": df["thread_id"],
-        "cleaned_comment": df["cleaned_comment"],
-        "likes_count": df["likes_count"],
-        "is_reply": df["is_reply"]
-    })
-
     try:
-        cleaned_df.to_csv(output_path, index=False, encoding="utf-8-sig", quoting=1)
-        print(f"[DONE] File selesai dibersihkan: {output_path}")
-        print(f"[SUMMARY] Total baris: {len(df)} | Berhasil diproses: {success_count} | Gagal: {fail_count}")
-
-        print(f"[FILTER] Baris kosong dihapus: {total_deleted}")
-        if total_deleted > 0:
-            print(f" ├─ Hanya emoji: {count_emoji}")
-            print(f" ├─ Hanya tanda baca: {count_punct}")
-            print(f" └─ Lainnya: {count_other}")
-        else:
-            print("[FILTER] Tidak ada baris kosong yang dihapus.")
+        saved = save_cleaned(cleaned_df, output_path)
+        record_outputs([output_path], key)
     except Exception as e:
-        print(f"[ERROR] Gagal menyimpan file {output_name}: {e}")
+        print(f"[ERROR] Gagal menyimpan file {os.path.basename(output_path)}: {e}")
+        return False
+    print(f"[DONE] File selesai dibersihkan: {saved}")
+    print_cleaning_summary(stats)
+    return True
+
+
+def clean_dataset(file_name: str, use_cache: bool = True):
+    """
+    Membersihkan satu file dataset dan menyimpannya ke folder cleaning/dataset.
+    use_cache=True: dilewati bila file input dan kode cleaning tidak berubah sejak run terakhir.
+    """
+    job = load_dataset_job(file_name, use_cache=use_cache)
+    if job is None:
+        return
+    df, output_path, key = job
+    cleaned_df, stats = build_cleaned(df, *clean_comment_column(df["comment"], name=file_name))
+    save_dataset_result(output_path, key, cleaned_df, stats)
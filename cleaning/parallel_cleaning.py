@@ -0,0 +1,147 @@
+# cleaning/parallel_cleaning.py
+"""
+Cleaning paralel: komentar dari satu atau banyak file dibagi per chunk baris dan
+dibersihkan di process pool. Hasil disusun kembali sesuai urutan baris asli,
+sehingga output identik dengan cleaning sekuensial.
+"""
+import os
+import multiprocessing as mp
+
+import numpy as np
+from pandas.api.types import union_categoricals
+from tqdm import tqdm
+
+from .cleaner import (
+    clean_comment_column, build_cleaned, load_dataset_job, save_dataset_result,
+    print_cleaning_summary,
+)
+
+# Jumlah baris per tugas worker
+CHUNK_ROWS = 2000
+
+STAT_KEYS = ("total_rows", "success", "fail", "deleted", "emoji", "punct", "other")
+
+
+def default_workers():
+    """Jumlah core yang boleh dipakai proses ini."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _clean_chunk(task):
+    file_no, chunk_no, comments = task
+    try:
+        return file_no, chunk_no, clean_comment_column(comments), None
+    except Exception as e:
+        # dilaporkan per file di proses utama; chunk file lain tetap diproses
+        return file_no, chunk_no, None, str(e)
+
+
+def _chunk_tasks(file_no, comments, chunk_rows):
+    for chunk_no, start in enumerate(range(0, len(comments), chunk_rows)):
+        yield file_no, chunk_no, comments.iloc[start:start + chunk_rows].tolist()
+
+
+def _merge_chunks(parts):
+    """Gabungkan hasil clean_comment_column per chunk (sudah urut) menjadi satu."""
+    cleaned = [text for part in parts for text in part[0]]
+    is_empty = np.concatenate([part[1] for part in parts])
+    empty_reason = union_categoricals([part[2] for part in parts])
+    return (cleaned, is_empty, empty_reason,
+            sum(part[3] for part in parts), sum(part[4] for part in parts))
+
+
+def _run_pool(columns, num_workers, chunk_rows, on_complete, on_error=None):
+    """
+    Bersihkan banyak kolom komentar sekaligus di satu pool.
+    on_complete(file_no, result) dipanggil begitu semua chunk satu kolom selesai.
+    on_error(file_no, message) dipanggil sekali bila ada chunk kolom itu yang gagal
+    (sisa chunk-nya diabaikan); tanpa on_error, kegagalan dinaikkan sebagai RuntimeError.
+    """
+    n_chunks = [max(1, -(-len(c) // chunk_rows)) for c in columns]
+    pending = {i: [None] * n for i, n in enumerate(n_chunks)}
+    tasks = [t for i, c in enumerate(columns) for t in _chunk_tasks(i, c, chunk_rows)]
+    # kolom kosong tetap dilaporkan (tanpa tugas worker)
+    for i, c in enumerate(columns):
+        if len(c) == 0:
+            pending.pop(i)
+            on_complete(i, clean_comment_column(c))
+
+    if not tasks:
+        return
+    workers = max(1, min(num_workers or default_workers(), len(tasks)))
+    ctx = mp.get_context("spawn")
+    with ctx.Pool(processes=workers) as pool:
+        results = pool.imap_unordered(_clean_chunk, tasks, chunksize=1)
+        for file_no, chunk_no, result, error in tqdm(results, total=len(tasks), desc="Cleaning (paralel)", ncols=90):
+            if file_no not in pending:
+                continue
+            if error is not None:
+                pending.pop(file_no)
+                if on_error is None:
+                    raise RuntimeError(error)
+                on_error(file_no, error)
+                continue
+            parts = pending[file_no]
+            parts[chunk_no] = result
+            if all(p is not None for p in parts):
+                on_complete(file_no, _merge_chunks(pending.pop(file_no)))
+
+
+def clean_comment_column_parallel(comments, num_workers=None, chunk_rows=CHUNK_ROWS):
+    """Versi paralel clean_comment_column untuk satu kolom (urutan baris dipertahankan)."""
+    out = {}
+    _run_pool([comments.reset_index(drop=True)], num_workers, chunk_rows,
+              lambda file_no, result: out.setdefault(file_no, result))
+    return out[0]
+
+
+def clean_datasets_parallel(file_names, num_workers=None, chunk_rows=CHUNK_ROWS, use_cache=True):
+    """
+    Bersihkan beberapa file sekaligus: chunk dari semua file dikirim ke satu process pool,
+    tiap file disimpan begitu seluruh chunk-nya selesai.
+    Mengembalikan statistik gabungan semua file.
+    """
+    # kegagalan satu file dilaporkan seperti mode sekuensial, file lain tetap dibersihkan
+    jobs = []
+    for file_name in file_names:
+        try:
+            job = load_dataset_job(file_name, use_cache=use_cache)
+        except Exception as e:
+            print(f"[CRITICAL] Cleaning gagal total pada {file_name}: {e}")
+            continue
+        if job is not None:
+            jobs.append((file_name, *job))
+
+    totals = dict.fromkeys(STAT_KEYS, 0)
+    if not jobs:
+        return totals
+
+    workers = num_workers or default_workers()
+    total_rows = sum(len(df) for _, df, _, _ in jobs)
+    print(f"\n[INFO] Cleaning paralel: {len(jobs)} file, {total_rows} baris, {workers} worker")
+
+    def on_complete(file_no, result):
+        file_name, df, output_path, key = jobs[file_no]
+        try:
+            cleaned_df, stats = build_cleaned(df, *result)
+            print(f"\n[INFO] {file_name}")
+            saved = save_dataset_result(output_path, key, cleaned_df, stats)
+        except Exception as e:
+            on_error(file_no, e)
+            return
+        # file yang gagal disimpan tidak ikut dihitung di statistik gabungan
+        if not saved:
+            return
+        for k in STAT_KEYS:
+            totals[k] += int(stats[k])
+
+    def on_error(file_no, error):
+        print(f"\n[CRITICAL] Cleaning gagal total pada {jobs[file_no][0]}: {error}")
+
+    _run_pool([df["comment"] for _, df, _, _ in jobs], workers, chunk_rows, on_complete, on_error)
+
+    print("\n[SUMMARY] Gabungan semua file:")
+    print_cleaning_summary(totals)
+    return totals
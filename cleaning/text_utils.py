@@ -1,42 +1,87 @@
 # cleaning/text_utils.py
 import re
 import emoji
+import numpy as np
+import pandas as pd
+
+# Pola regex dikompilasi sekali (dipakai versi per-teks maupun batch)
+MENTION_RE = re.compile(r"@\S+")
+HASHTAG_RE = re.compile(r"#\S+")
+URL_IN_PARENS_RE = re.compile(r"\(\s*https?://[^\)]*\)")
+URL_RE = re.compile(r"https?://\S+")
+NON_WORD_RE = re.compile(r"[^\w\s.,!?'\"]+")
+OUTER_QUOTES_RE = re.compile(r'^[\'"]+|[\'"]+$')
+LEADING_PUNCT_RE = re.compile(r'^[\.,;:!?\'"()\[\]\-]+')
+SPACES_RE = re.compile(r"\s+")
+
+# Mention, hashtag, dan URL berdiri sendiri dalam satu lintasan regex. Hasilnya sama
+# dengan menghapus MENTION_RE, HASHTAG_RE, lalu URL_RE berurutan: ketiganya memotong
+# token (run non-spasi) sampai spasi berikutnya, sehingga cukup memotong di posisi
+# paling kiri. Lookahead meniru urutan itu: "#@x" -> "#" (mention dihapus lebih dulu,
+# "#" sendirian bukan hashtag) dan "https://@x" -> "https://" (sisa URL kosong).
+MENTION_HASHTAG_RE = re.compile(r"@\S+|#(?!@\S)\S+")
+MENTION_HASHTAG_URL_RE = re.compile(r"@\S+|#(?!@\S)\S+|https?://(?!@\S|#(?!@\S)\S)\S+")
+
+
+# Tabel codepoint non-ASCII yang muncul di emoji mana pun. Setiap emoji (termasuk
+# keycap seperti 1️⃣) memuat minimal satu codepoint ini, sehingga teks tanpa
+# karakter ini pasti tidak diubah oleh emoji.replace_emoji.
+EMOJI_CODEPOINTS = frozenset(c for e in emoji.EMOJI_DATA for c in e if not c.isascii())
+
+
+def has_emoji_codepoint(text: str) -> bool:
+    """Cek cepat apakah teks mungkin memuat emoji (teks ASCII pasti tidak)."""
+    return not text.isascii() and not EMOJI_CODEPOINTS.isdisjoint(text)
+
 
 def remove_mentions_hashtags(text: str) -> str:
     """Menghapus @mention dan #hashtag dari teks."""
-    text = re.sub(r"@\S+", "", text)
-    text = re.sub(r"#\S+", "", text)
-    return text
+    return MENTION_HASHTAG_RE.sub("", text)
 
 def remove_urls(text: str) -> str:
     """Menghapus semua URL dan tanda kurung yang membungkusnya."""
     # hapus URL dalam kurung (contoh: (https://...))
-    text = re.sub(r"\(\s*https?://[^\)]*\)", "", text)
+    text = URL_IN_PARENS_RE.sub("", text)
     # hapus URL berdiri sendiri
-    text = re.sub(r"https?://\S+", "", text)
+    text = URL_RE.sub("", text)
     return text
 
+def remove_mentions_hashtags_urls(text: str) -> str:
+    """
+    remove_mentions_hashtags lalu remove_urls, dengan satu re.sub bila memungkinkan
+    (teks tanpa "@", "#", dan "://" dikembalikan apa adanya).
+    URL dalam kurung bisa melewati spasi dan baru terbentuk setelah mention dihapus,
+    jadi teks yang memuat "(" dan "://" tetap lewat jalur bertahap.
+    """
+    has_url = "://" in text
+    if "@" not in text and "#" not in text and not has_url:
+        return text
+    if has_url and "(" in text:
+        return remove_urls(remove_mentions_hashtags(text))
+    return MENTION_HASHTAG_URL_RE.sub("", text)
+
 def remove_emoticons(text: str) -> str:
     """Menghapus emoji & emoticon unicode."""
-    text = emoji.replace_emoji(text, replace="")
+    if has_emoji_codepoint(text):
+        text = emoji.replace_emoji(text, replace="")
     # hapus karakter non-alfanumerik kecuali tanda baca dasar
-    text = re.sub(r"[^\w\s.,!?'\"]+", " ", text)
+    text = NON_WORD_RE.sub(" ", text)
     return text
 
 def remove_outer_quotes(text: str) -> str:
     """Menghapus tanda petik di awal/akhir (termasuk ganda)."""
     text = text.strip()
-    text = re.sub(r'^[\'"]+|[\'"]+$', "", text)
+    text = OUTER_QUOTES_RE.sub("", text)
     text = text.replace('""', '"').strip('"').strip("'")
     return text.strip()
 
 def remove_punctuation_at_start(text: str) -> str:
     """Menghapus tanda baca di awal komentar."""
-    return re.sub(r'^[\.,;:!?\'"()\[\]\-]+', '', text).strip()
+    return LEADING_PUNCT_RE.sub('', text).strip()
 
 def clean_spacing(text: str) -> str:
     """Merapikan spasi berlebih."""
-    text = re.sub(r"\s+", " ", text)
+    text = SPACES_RE.sub(" ", text)
     return text.strip()
 
 def normalize_lowercase(text: str) -> str:
@@ -46,8 +91,7 @@ def normalize_lowercase(text: str) -> str:
 def clean_comment_pipeline(text: str) -> str:
     """Pipeline penuh cleaning teks komentar sesuai instruksi user."""
     text = str(text)
-    text = remove_mentions_hashtags(text)
-    text = remove_urls(text)
+    text = remove_mentions_hashtags_urls(text)
     text = remove_emoticons(text)
     text = remove_outer_quotes(text)
     text = clean_spacing(text)
@@ -55,9 +99,52 @@ def clean_comment_pipeline(text: str) -> str:
     text = normalize_lowercase(text)
     return text.strip()
 
+
+def clean_comments(texts) -> pd.Series:
+    """
+    clean_comment_pipeline untuk satu kolom: satu lintasan per baris, index dipertahankan.
+
+    Operasi `.str` pada dtype object tetap loop Python per langkah, jadi versi
+    multi-langkah justru lebih lambat daripada satu loop per-teks. Percepatan
+    cleaning berasal dari fast path emoji (has_emoji_codepoint) di remove_emoticons.
+    """
+    index = texts.index if isinstance(texts, pd.Series) else None
+    return pd.Series([clean_comment_pipeline(t) for t in texts], index=index, dtype=object)
+
+
 # =======================================================
 # HELPER: DETEKSI PENYEBAB DATA KOSONG
 # =======================================================
+EMPTY_REASONS = ["kosong_asli", "emoji_saja", "tanda_baca_saja", "lainnya"]
+
+
+def flag_empty(raw, cleaned, stripped=False):
+    """
+    Flag komentar kosong setelah cleaning dan penyebabnya (kategorikal, NaN untuk yang tidak kosong).
+    detect_empty_reason hanya dijalankan pada baris yang kosong.
+    stripped=True: `cleaned` sudah di-strip (hasil clean_comments), cukup dibandingkan dengan "".
+    """
+    cleaned = pd.Series(cleaned, dtype=object)
+    if not stripped:
+        cleaned = cleaned.map(str).str.strip()
+    is_empty = (cleaned == "").to_numpy(dtype=bool)
+
+    raw = np.asarray(raw, dtype=object)
+    reason = np.full(len(cleaned), None, dtype=object)
+    empty_idx = np.flatnonzero(is_empty)
+    reason[empty_idx] = [detect_empty_reason(raw[i]) for i in empty_idx]
+    return is_empty, pd.Categorical(reason, categories=EMPTY_REASONS)
+
+
+def clean_comments_flagged(texts, raw=None):
+    """
+    clean_comments + flag_empty dalam satu panggilan: (cleaned, is_empty, empty_reason).
+    raw: komentar asli untuk deteksi penyebab kosong (default = texts).
+    """
+    cleaned = clean_comments(texts)
+    is_empty, empty_reason = flag_empty(texts if raw is None else raw, cleaned, stripped=True)
+    return cleaned.tolist(), is_empty, empty_reason
+
 def detect_empty_reason(original_text: str) -> str:
     """Mendeteksi penyebab komentar kosong setelah cleaning."""
     if not original_text or str(original_text).strip() == "":
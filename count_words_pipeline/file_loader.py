@@ -1,14 +1,11 @@
-import os
-import pandas as pd
+from pipeline.storage import list_tables, read_table, to_text_ids
 
 def load_clean_files(dataset_path="cleaning/dataset"):
     """
-    Memuat seluruh file CSV hasil cleaning.
+    Memuat seluruh dataset hasil cleaning (CSV/Parquet).
     Mengembalikan list tuple: (filename, dataframe)
     """
     files = []
-    for file in os.listdir(dataset_path):
-        if file.endswith(".csv"):
-            df = pd.read_csv(f"{dataset_path}/{file}")
-            files.append((file.replace(".csv", ""), df))
+    for path in list_tables(dataset_path):
+        files.append((path.stem, to_text_ids(read_table(path))))
     return files
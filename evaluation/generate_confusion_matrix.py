@@ -1,5 +1,6 @@
 # evaluation/generate_confusion_matrix.py
 import os
+import sys
 import glob
 import pandas as pd
 import numpy as np
@@ -8,6 +9,11 @@ import seaborn as sns
 from sklearn.metrics import confusion_matrix
 from pathlib import Path
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from pipeline.storage import list_tables, read_table
+
 # ======================================================
 # PATH
 # ======================================================
@@ -155,8 +161,8 @@ def print_confusion_matrix_stats(cm, label):
 def evaluate_pair(video_id, indo_path, llm_path):
     """Evaluate satu video pair"""
     
-    df_indo = pd.read_csv(indo_path)
-    df_llm = pd.read_csv(llm_path)
+    df_indo = read_table(indo_path)
+    df_llm = read_table(llm_path)
     
     # Merge berdasarkan kolom umum
     df = df_indo.merge(
@@ -194,7 +200,7 @@ def main():
     all_true, all_pred = [], []
     per_video_results = []
     
-    indo_files = sorted(glob.glob(os.path.join(INDOBERT_DIR, "*_sentiment.csv")))
+    indo_files = [str(p) for p in list_tables(INDOBERT_DIR, "*_sentiment.csv")]
     
     for indo_path in indo_files:
         filename = os.path.basename(indo_path)
@@ -13,6 +13,8 @@ import sys
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 sys.path.append(str(PROJECT_ROOT))
 
+from pipeline.storage import list_tables, read_table
+
 BASE_RESULT = PROJECT_ROOT / "evaluation/llm_judge_evaluation/results"
 OUTPUT_DIR = Path(__file__).resolve().parent / "analysis_results"
 
@@ -49,7 +51,7 @@ def analyze_sentiment_distribution():
             continue
         
         exp_labels = []
-        merged_files = list(merged_dir.glob("*_merged.csv"))
+        merged_files = list_tables(merged_dir, "*_merged.csv")
         
         if not merged_files:
             print(f"[SKIP] Tidak ada merged file di {exp_name}")
@@ -58,7 +60,7 @@ def analyze_sentiment_distribution():
         # Read all merged files in this experiment
         for csv_file in merged_files:
             try:
-                df = pd.read_csv(csv_file)
+                df = read_table(csv_file)
                 if "llm_label" in df.columns:
                     labels = df["llm_label"].tolist()
                     exp_labels.extend(labels)
@@ -13,6 +13,8 @@ import sys
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
 sys.path.append(str(PROJECT_ROOT))
 
+from pipeline.storage import list_tables, read_table
+
 LABEL_ORDER = ["positif", "netral", "negatif"]
 BASE_RESULT = PROJECT_ROOT / "evaluation/llm_judge_evaluation/results"
 
@@ -75,7 +77,7 @@ def main():
 
         all_true, all_pred = [], []
 
-        merged_files = list(merged_dir.glob("*_merged.csv"))
+        merged_files = list_tables(merged_dir, "*_merged.csv")
         print(f"[DEBUG] Ditemukan {len(merged_files)} merged files di {merged_dir}")
         
         if not merged_files:
@@ -88,7 +90,7 @@ def main():
         for f in merged_files:
             try:
                 video_id = f.stem.replace("_merged", "")
-                df = pd.read_csv(f)
+                df = read_table(f)
 
                 if not {"llm_label", "indo_label"}.issubset(df.columns):
                     print(f"[SKIP] Kolom tidak lengkap di {f.name}")
@@ -1,10 +1,16 @@
 import os
+import sys
 import pandas as pd
 from pathlib import Path
 from collections import Counter
 
 from sklearn.metrics import accuracy_score, precision_recall_fscore_support
 
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+sys.path.append(str(PROJECT_ROOT))
+
+from pipeline.storage import list_tables, read_table, write_table, table_exists
+
 # ======================================================
 # PATH SETUP
 # ======================================================
@@ -57,16 +63,16 @@ def main():
         summary_rows = []
         all_true, all_pred = [], []
 
-        for summary_file in summary_dir.glob("*_summary.csv"):
+        for summary_file in list_tables(summary_dir, "*_summary.csv"):
             video_id = summary_file.stem.replace("_summary", "")
             llm_file = LLM_DIR / f"{video_id.replace('_cleaned','')}_llm.csv"
 
-            if not llm_file.exists():
+            if not table_exists(llm_file):
                 print(f"[SKIP] LLM file tidak ditemukan: {llm_file.name}")
                 continue
 
-            df_indo = pd.read_csv(summary_file)
-            df_llm = pd.read_csv(llm_file)
+            df_indo = read_table(summary_file)
+            df_llm = read_table(llm_file)
 
             # ===============================
             # INDO LABEL
@@ -92,7 +98,7 @@ def main():
             df_merge = df_indo.merge(llm_thread, on="thread_id", how="inner")
 
             out_merge = merged_dir / f"{video_id}_merged.csv"
-            df_merge.to_csv(out_merge, index=False, encoding="utf-8-sig")
+            write_table(df_merge, out_merge)
 
             y_true = df_merge["llm_label"]
             y_pred = df_merge["indo_label"]
@@ -1,13 +1,20 @@
 # evaluation/run_evaluate_indobert_vs_llm.py
 import os
+import sys
 import glob
 import pandas as pd
+from pathlib import Path
 from sklearn.metrics import (
     accuracy_score,
     precision_recall_fscore_support,
     classification_report
 )
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from pipeline.storage import list_tables, read_table
+
 # ======================================================
 # PATH
 # ======================================================
@@ -40,8 +47,8 @@ def extract_video_id(filename):
 
 
 def evaluate_pair(video_id, indo_path, llm_path):
-    df_indo = pd.read_csv(indo_path)
-    df_llm = pd.read_csv(llm_path)
+    df_indo = read_table(indo_path)
+    df_llm = read_table(llm_path)
 
     df = df_indo.merge(
         df_llm,
@@ -82,7 +89,7 @@ def main():
     summaries = []
     all_true, all_pred = [], []
 
-    indo_files = glob.glob(os.path.join(INDOBERT_DIR, "*_sentiment.csv"))
+    indo_files = [str(p) for p in list_tables(INDOBERT_DIR, "*_sentiment.csv")]
 
     for indo_path in indo_files:
         filename = os.path.basename(indo_path)
@@ -111,8 +118,8 @@ def main():
             ) as f:
                 f.write(report)
 
-            df_indo = pd.read_csv(indo_path)
-            df_llm = pd.read_csv(llm_path)
+            df_indo = read_table(indo_path)
+            df_llm = read_table(llm_path)
 
             df_merge = df_indo.merge(
                 df_llm,
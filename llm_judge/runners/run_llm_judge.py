@@ -9,6 +9,7 @@ from dotenv import load_dotenv
 sys.path.append(os.path.abspath("."))
 
 from llm_judge.chains.sentiment_chain import build_sentiment_judge
+from pipeline.storage import list_tables, read_table, to_text_ids
 
 load_dotenv()
 
@@ -20,7 +21,7 @@ os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 
 def list_datasets():
-    files = sorted([f for f in os.listdir(INPUT_DIR) if f.endswith("_cleaned.csv")])
+    files = [p.name for p in list_tables(INPUT_DIR, "*_cleaned.csv")]
     print("\n📂 Dataset tersedia:")
     for i, f in enumerate(files, 1):
         print(f"{i}. {f}")
@@ -40,7 +41,7 @@ def run_dataset_mode(judge):
         file = files[idx]
         print(f"\n▶ Memproses: {file}")
 
-        df = pd.read_csv(os.path.join(INPUT_DIR, file))
+        df = to_text_ids(read_table(os.path.join(INPUT_DIR, file)))
         out_path = os.path.join(
             OUTPUT_DIR, file.replace("_cleaned.csv", "_llm.csv")
         )
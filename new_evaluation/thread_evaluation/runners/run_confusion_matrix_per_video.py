@@ -10,6 +10,8 @@ import sys
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
 sys.path.append(str(PROJECT_ROOT))
 
+from pipeline.storage import list_tables, read_table
+
 LABEL_ORDER = ["positif", "netral", "negatif"]
 BASE_RESULT = Path("new_evaluation/thread_evaluation/results")
 
@@ -54,9 +56,9 @@ def main():
 
         all_true, all_pred = [], []
 
-        for f in merged_dir.glob("*_merged.csv"):
+        for f in list_tables(merged_dir, "*_merged.csv"):
             video_id = f.stem.replace("_thread_merged", "")
-            df = pd.read_csv(f)
+            df = read_table(f)
 
             y_true = df["llm_thread_label"]
             y_pred = df["indo_label"]
@@ -10,15 +10,18 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
 sys.path.append(str(PROJECT_ROOT))
 
-from new_evaluation.thread_evaluation.utils.label_mapper import map_score_to_label
-from new_evaluation.thread_evaluation.utils.metrics import compute_metrics, build_confusion_matrix
-
-LABEL_ORDER = ["positif", "netral", "negatif"]
+from new_evaluation.thread_evaluation.utils.metrics import compute_metrics, evaluate_thread_summary
+from pipeline.stage_cache import file_stage_key, outputs_fresh, record_outputs
+from pipeline.storage import list_tables, read_table, write_table
 
 INDOBERT_BASE = Path("sentiment/dataset/summary")
 LLM_DIR = Path("new_llm_judge/thread_evaluation/output/thread_labels")
 RESULT_BASE = Path("new_evaluation/thread_evaluation/results")
 
+# Ambang label thread (lihat label_mapper)
+POS_THRESHOLD = 0.05
+NEG_THRESHOLD = -0.05
+
 
 def main():
     experiments = [d for d in INDOBERT_BASE.iterdir() if d.is_dir()]
@@ -52,7 +55,7 @@ def main():
         summary_rows = []
         all_true, all_pred = [], []
 
-        for indo_file in exp_dir.glob("*_cleaned_summary.csv"):
+        for indo_file in list_tables(exp_dir, "*_cleaned_summary.csv"):
             raw_video_id = indo_file.stem.replace("_cleaned_summary", "")
             video_id = raw_video_id.replace("_cleaned", "")
 
@@ -64,40 +67,38 @@ def main():
 
             print(f"\n▶ Evaluasi video: {video_id}")
 
-            df_indo = pd.read_csv(indo_file)
-            df_llm = pd.read_csv(llm_file)
+            merge_path = merged_dir / f"{video_id}_merged.csv"
+            cm_path = per_video_dir / f"{video_id}_confusion_matrix.csv"
+            key = file_stage_key("evaluation", [indo_file, llm_file], {
+                "pos_threshold": POS_THRESHOLD, "neg_threshold": NEG_THRESHOLD
+            })
 
-            df_indo["indo_label"] = df_indo["weighted_avg_sentiment"].apply(map_score_to_label)
+            if outputs_fresh([merge_path, cm_path], key):
+                # input & ambang tidak berubah -> cukup baca hasil merge sebelumnya
+                print(f"[SKIP] {video_id}: input, ambang & kode tidak berubah")
+                df_merge = read_table(merge_path)
+                metrics = compute_metrics(df_merge["llm_thread_label"], df_merge["indo_label"])
+            else:
+                df_indo = read_table(indo_file)
+                df_llm = read_table(llm_file)
 
-            df_merge = df_indo.merge(df_llm, on="thread_id", how="inner")
+                df_merge, metrics, cm_df = evaluate_thread_summary(
+                    df_indo, df_llm, pos_th=POS_THRESHOLD, neg_th=NEG_THRESHOLD
+                )
 
-            df_merge = df_merge[
-                ["thread_id", "weighted_avg_sentiment", "indo_label", "llm_thread_label", "total_comments"]
-            ]
+                # === SAVE MERGED ===
+                write_table(df_merge, merge_path)
 
-            # === SAVE MERGED ===
-            merge_path = merged_dir / f"{video_id}_merged.csv"
-            df_merge.to_csv(merge_path, index=False, encoding="utf-8-sig")
+                print(f"✓ Merged → {merge_path.name}")
+                print(f"  Total thread dievaluasi: {len(df_merge)}")
 
-            print(f"✓ Merged → {merge_path.name}")
-            print(f"  Total thread dievaluasi: {len(df_merge)}")
+                cm_df.to_csv(cm_path, encoding="utf-8-sig")
+                record_outputs([merge_path, cm_path], key)
 
             # === METRICS ===
             y_true = df_merge["llm_thread_label"]
             y_pred = df_merge["indo_label"]
 
-            metrics = compute_metrics(y_true, y_pred)
-            cm = build_confusion_matrix(y_true, y_pred)
-
-            cm_df = pd.DataFrame(
-                cm,
-                index=[f"true_{l}" for l in LABEL_ORDER],
-                columns=[f"pred_{l}" for l in LABEL_ORDER]
-            )
-
-            cm_path = per_video_dir / f"{video_id}_confusion_matrix.csv"
-            cm_df.to_csv(cm_path, encoding="utf-8-sig")
-
             summary_rows.append({
                 "video": video_id,
                 **metrics,
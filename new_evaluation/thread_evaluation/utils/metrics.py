@@ -29,3 +29,36 @@ def build_confusion_matrix(y_true, y_pred):
         y_true, y_pred,
         labels=LABEL_ORDER
     )
+
+def evaluate_thread_summary(df_summary, df_llm, pos_th=0.05, neg_th=-0.05):
+    """
+    Bandingkan summary thread IndoBERT dengan label LLM (join pada thread_id).
+    Mengembalikan (df_merge, metrics, cm_df).
+    """
+    from .label_mapper import map_score_to_label
+
+    df_indo = df_summary.copy()
+    df_indo["indo_label"] = df_indo["weighted_avg_sentiment"].apply(
+        map_score_to_label, pos_th=pos_th, neg_th=neg_th
+    )
+
+    from pipeline.thread_ids import intern_thread_ids
+
+    # join pada kode int64 (no-op bila sudah di-intern oleh read_table)
+    df_indo["thread_id"] = intern_thread_ids(df_indo["thread_id"])
+    df_llm = df_llm.assign(thread_id=intern_thread_ids(df_llm["thread_id"]))
+    df_merge = df_indo.merge(df_llm, on="thread_id", how="inner")
+    df_merge = df_merge[
+        ["thread_id", "weighted_avg_sentiment", "indo_label", "llm_thread_label", "total_comments"]
+    ]
+
+    y_true = df_merge["llm_thread_label"]
+    y_pred = df_merge["indo_label"]
+
+    metrics = compute_metrics(y_true, y_pred)
+    cm_df = pd.DataFrame(
+        build_confusion_matrix(y_true, y_pred),
+        index=[f"true_{l}" for l in LABEL_ORDER],
+        columns=[f"pred_{l}" for l in LABEL_ORDER]
+    )
+    return df_merge, metrics, cm_df
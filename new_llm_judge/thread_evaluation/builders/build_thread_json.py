@@ -1,16 +1,26 @@
 # new_llm_judge/thread_evaluation/builders/build_thread_json.py
 
 import os
+import sys
 import json
-import pandas as pd
+from pathlib import Path
 from collections import defaultdict
 
+# ======================================================
+# FIX PYTHON PATH (PROJECT ROOT)
+# ======================================================
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+sys.path.append(str(PROJECT_ROOT))
+
+from pipeline.storage import list_tables, read_table, to_text_ids
+
 INPUT_DIR = "cleaning/dataset"
 OUTPUT_DIR = "new_llm_judge/thread_evaluation/output/thread_json"
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 def build_thread_json(csv_file):
-    df = pd.read_csv(csv_file)
+    # thread_id dikembalikan ke hash agar JSON bisa dicocokkan lintas tahap
+    df = to_text_ids(read_table(csv_file))
 
     threads = defaultdict(lambda: {
         "thread_id": None,
@@ -53,6 +63,5 @@ def process_dataset(csv_path):
 
 
 if __name__ == "__main__":
-    for f in os.listdir(INPUT_DIR):
-        if f.endswith("_cleaned.csv"):
-            process_dataset(os.path.join(INPUT_DIR, f))
+    for f in list_tables(INPUT_DIR, "*_cleaned.csv"):
+        process_dataset(str(f))
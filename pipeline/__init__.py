@@ -0,0 +1,10 @@
+# pipeline/__init__.py
+from .dag import Stage, resolve_order, run_dag
+from .stage_cache import (
+    STAGE_CODE,
+    code_version,
+    stage_key,
+    file_stage_key,
+    outputs_fresh,
+    record_outputs,
+)
@@ -0,0 +1,132 @@
+# pipeline/dag.py
+import time
+from collections import namedtuple
+
+from . import stage_cache
+
+# name   : nama artefak yang dihasilkan tahap ini
+# deps   : nama artefak input (hasil tahap lain atau input awal)
+# run    : fungsi run(ctx, *inputs) -> hasil (DataFrame / dict), None = dilewati
+# save   : fungsi save(ctx, hasil) untuk menyimpan artefak ke disk (opsional)
+# params : nama parameter ctx["params"] yang memengaruhi hasil (bagian dari kunci cache)
+# code   : (nama) modul yang source-nya menentukan hasil (versi kode pada kunci cache)
+Stage = namedtuple("Stage", ["name", "deps", "run", "save", "params", "code"], defaults=((), ()))
+
+
+def resolve_order(stages, targets, provided=()):
+    """Urutan topologis tahap yang dibutuhkan untuk menghasilkan `targets`."""
+    by_name = {s.name: s for s in stages}
+    done = set(provided)
+    visiting = set()
+    order = []
+
+    def visit(name):
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Siklus pada DAG di tahap '{name}'")
+        if name not in by_name:
+            raise ValueError(f"Artefak '{name}' tidak punya tahap dan tidak diberikan sebagai input")
+        visiting.add(name)
+        for dep in by_name[name].deps:
+            visit(dep)
+        visiting.discard(name)
+        done.add(name)
+        order.append(by_name[name])
+
+    for target in targets:
+        visit(target)
+    return order
+
+
+def stage_keys(order, ctx, input_keys):
+    """
+    Kunci cache setiap tahap. Kunci hanya bergantung pada kunci input, parameter,
+    dan versi kode, sehingga bisa dihitung sebelum tahap apa pun dijalankan.
+    """
+    keys = dict(input_keys)
+    params = ctx.get("params", {})
+    for stage in order:
+        keys[stage.name] = stage_cache.stage_key(
+            stage.name,
+            [keys[d] for d in stage.deps],
+            {p: params.get(p) for p in stage.params},
+            stage_cache.code_version(*stage.code),
+        )
+    return keys
+
+
+def run_dag(stages, targets, ctx, inputs=None, persist=(), input_keys=None, use_cache=False):
+    """
+    Jalankan tahap-tahap yang dibutuhkan `targets` dalam satu proses.
+    Hasil antar tahap dioper di memori; hanya artefak di `persist` yang ditulis ke disk.
+    Hasil antara dibuang begitu tidak dibutuhkan lagi oleh tahap berikutnya.
+
+    use_cache=True: hasil tahap disimpan per kunci konten (input, parameter, kode);
+    tahap dengan kunci yang sudah ada dimuat dari cache, dan tahap hulunya
+    tidak dijalankan sama sekali bila tidak dibutuhkan.
+    """
+    results = dict(inputs or {})
+    order = resolve_order(stages, targets, provided=results)
+    by_name = {s.name: s for s in order}
+
+    keys = {}
+    if use_cache:
+        input_keys = dict(input_keys or {})
+        for name, value in results.items():
+            if name not in input_keys:
+                input_keys[name] = "none" if value is None else stage_cache.dataframe_key(value)
+        keys = stage_keys(order, ctx, input_keys)
+
+    # tentukan tahap yang benar-benar perlu dijalankan / dimuat
+    required, cached = set(), set()
+
+    def require(name):
+        if name in required or name in results:
+            return
+        required.add(name)
+        if use_cache and stage_cache.has_artifact(keys[name]):
+            cached.add(name)
+            return
+        for dep in by_name[name].deps:
+            require(dep)
+
+    for target in targets:
+        require(target)
+
+    remaining_uses = {}
+    for stage in order:
+        if stage.name in required and stage.name not in cached:
+            for dep in stage.deps:
+                remaining_uses[dep] = remaining_uses.get(dep, 0) + 1
+
+    for stage in order:
+        if stage.name not in required:
+            continue
+
+        if stage.name in cached:
+            print(f"\n[CACHE] {stage.name}: kunci sama, hasil dimuat dari cache")
+            out = stage_cache.load_artifact(keys[stage.name])
+        else:
+            args = [results[d] for d in stage.deps]
+            if any(a is None for a in args):
+                print(f"[SKIP] {stage.name}: input tidak tersedia")
+                out = None
+            else:
+                print(f"\n[STEP] {stage.name}")
+                start = time.perf_counter()
+                out = stage.run(ctx, *args)
+                print(f"  ↳ {stage.name} selesai dalam {time.perf_counter() - start:.2f} s")
+                if use_cache and out is not None:
+                    stage_cache.save_artifact(keys[stage.name], out)
+
+        results[stage.name] = out
+        if out is not None and stage.name in persist and stage.save is not None:
+            stage.save(ctx, out)
+
+        for dep in stage.deps if stage.name not in cached else ():
+            remaining_uses[dep] -= 1
+            if remaining_uses[dep] == 0 and dep not in targets:
+                results.pop(dep, None)
+
+    return {name: results.get(name) for name in targets}
@@ -0,0 +1,180 @@
+# pipeline/stage_cache.py
+import os
+import json
+import pickle
+import hashlib
+import inspect
+import importlib
+
+from sentiment.checkpoint import file_sha256
+from .storage import resolve_table
+
+STAGE_CACHE_DIR = os.path.join(os.path.dirname(__file__), "cache")
+ARTIFACT_DIR = os.path.join(STAGE_CACHE_DIR, "artifacts")
+OUTPUT_RECORD_DIR = os.path.join(STAGE_CACHE_DIR, "outputs")
+
+# Batas total ukuran artefak pickle; yang paling lama tidak dipakai dihapus lebih dulu
+ARTIFACT_MAX_BYTES = 2 * 1024 ** 3
+
+# Modul yang menentukan hasil tiap tahap (versi kode pada kunci cache)
+STAGE_CODE = {
+    "cleaned": ("cleaning.cleaner", "cleaning.text_utils", "pipeline.thread_ids"),
+    "sentiment": ("sentiment.sentiment_inference", "sentiment.batching", "sentiment.model_loader",
+                  "sentiment.model_registry", "sentiment.onnx_backend", "sentiment.parallel_inference",
+                  "sentiment.result_cache", "sentiment.token_cache", "pipeline.storage"),
+    "contextual": ("sentiment.contextual_inference",),
+    "summary": ("sentiment.aggregation",),
+    "sweep": ("sentiment.aggregation", "sentiment.contextual_inference"),
+    "evaluation": ("new_evaluation.thread_evaluation.utils.metrics",
+                   "new_evaluation.thread_evaluation.utils.label_mapper"),
+}
+
+# hash file per (path, ukuran, mtime) agar file besar tidak di-hash berulang dalam satu proses
+_FILE_KEYS = {}
+
+
+def _sha256_json(obj):
+    payload = json.dumps(obj, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def file_key(path):
+    """Hash isi file input (dataset logis .csv -> file parquet/feather/csv nyata)."""
+    path = resolve_table(path)
+    st = os.stat(path)
+    memo = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    if memo not in _FILE_KEYS:
+        _FILE_KEYS[memo] = file_sha256(path)
+    return _FILE_KEYS[memo]
+
+
+def dataframe_key(df):
+    """Hash isi DataFrame (untuk input yang tidak berasal dari file)."""
+    import pandas as pd
+    h = hashlib.sha256(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    h.update(",".join(map(str, df.columns)).encode("utf-8"))
+    return h.hexdigest()
+
+
+def code_version(*modules):
+    """Versi kode = hash source modul (objek modul atau nama modul) yang menentukan hasil tahap."""
+    h = hashlib.sha256()
+    for module in modules:
+        if isinstance(module, str):
+            module = importlib.import_module(module)
+        h.update(module.__name__.encode("utf-8"))
+        h.update(file_key(inspect.getsourcefile(module)).encode("utf-8"))
+    return h.hexdigest()
+
+
+def stage_key(stage, input_keys, params=None, code=""):
+    """Kunci artefak: nama tahap + hash input + parameter + versi kode."""
+    return _sha256_json({
+        "stage": stage,
+        "inputs": list(input_keys),
+        "params": params or {},
+        "code": code,
+    })
+
+
+# =====================================================
+# ARTEFAK DI MEMORI (hasil tahap DAG, disimpan sebagai pickle)
+# =====================================================
+def _artifact_path(key):
+    return os.path.join(ARTIFACT_DIR, f"{key}.pkl")
+
+
+def has_artifact(key):
+    return os.path.exists(_artifact_path(key))
+
+
+def load_artifact(key):
+    path = _artifact_path(key)
+    with open(path, "rb") as f:
+        obj = pickle.load(f)
+    # mtime = waktu terakhir dipakai (urutan LRU untuk _evict_artifacts)
+    os.utime(path)
+    return obj
+
+
+def save_artifact(key, obj, max_bytes=ARTIFACT_MAX_BYTES):
+    os.makedirs(ARTIFACT_DIR, exist_ok=True)
+    path = _artifact_path(key)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    _evict_artifacts(max_bytes, keep=path)
+
+
+def _evict_artifacts(max_bytes, keep):
+    """Hapus artefak yang paling lama tidak dipakai sampai total <= max_bytes."""
+    entries = []
+    for e in os.scandir(ARTIFACT_DIR):
+        if e.is_file() and e.name.endswith(".pkl"):
+            st = e.stat()
+            entries.append((st.st_mtime, e.path, st.st_size))
+    total = sum(size for _, _, size in entries)
+    removed = 0
+    for _, path, size in sorted(entries):
+        if total <= max_bytes:
+            break
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    if removed:
+        print(f"[CACHE] {removed} artefak tahap lama dihapus (batas {max_bytes / 1024 ** 2:.0f} MB).")
+
+
+# =====================================================
+# FILE OUTPUT RUNNER (CSV dsb.)
+# =====================================================
+def _record_path(output_path):
+    name = hashlib.sha1(os.path.abspath(output_path).encode("utf-8")).hexdigest()
+    return os.path.join(OUTPUT_RECORD_DIR, f"{name}.json")
+
+
+def _stat(path):
+    st = os.stat(resolve_table(path))
+    return [st.st_size, st.st_mtime_ns]
+
+
+def outputs_fresh(output_paths, key):
+    """
+    True bila semua file output dibuat dari kunci yang sama dan belum diubah sejak itu.
+    """
+    for path in output_paths:
+        record_file = _record_path(path)
+        if not os.path.exists(resolve_table(path)) or not os.path.exists(record_file):
+            return False
+        try:
+            with open(record_file, "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if record.get("key") != key or record.get("stat") != _stat(path):
+            return False
+    return True
+
+
+def record_outputs(output_paths, key):
+    """Catat kunci tahap untuk file output yang baru ditulis."""
+    os.makedirs(OUTPUT_RECORD_DIR, exist_ok=True)
+    for path in output_paths:
+        record_file = _record_path(path)
+        tmp_path = f"{record_file}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"path": os.path.abspath(path), "key": key, "stat": _stat(path)}, f)
+        os.replace(tmp_path, record_file)
+
+
+def file_stage_key(stage, input_paths, params=None, modules=None):
+    """Kunci tahap untuk runner berbasis file (modul default dari STAGE_CODE)."""
+    if modules is None:
+        modules = STAGE_CODE.get(stage, ())
+    return stage_key(stage, [file_key(p) for p in input_paths], params, code_version(*modules))
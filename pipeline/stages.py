@@ -0,0 +1,171 @@
+# pipeline/stages.py
+import os
+
+import pandas as pd
+
+from cleaning.cleaner import CLEAN_DATASET_DIR, clean_dataframe, print_cleaning_summary, save_cleaned
+from sentiment.sentiment_inference import compute_sentiment_scores, OUTPUT_COLUMNS
+from sentiment.contextual_inference import adjust_sentiment_contextually
+from sentiment.aggregation import aggregate_thread_sentiments
+from sentiment.model_loader import DEFAULT_MODEL_NAME
+from .dag import Stage
+from .stage_cache import STAGE_CODE
+from .storage import read_table, table_exists, write_table
+
+SENTIMENT_DIR = os.path.join("sentiment", "dataset", "sentiment")
+CONTEXTUAL_DIR = os.path.join("sentiment", "dataset", "contextual")
+SUMMARY_DIR = os.path.join("sentiment", "dataset", "summary")
+LLM_LABEL_DIR = os.path.join("new_llm_judge", "thread_evaluation", "output", "thread_labels")
+EVAL_RESULT_DIR = os.path.join("new_evaluation", "thread_evaluation", "results")
+
+# Artefak yang bisa disimpan, sesuai urutan pipeline
+ARTIFACTS = ["cleaned", "sentiment", "contextual", "summary", "evaluation"]
+
+DEFAULT_PARAMS = {
+    "model_name": DEFAULT_MODEL_NAME,
+    "backend": "torch",
+    "batch_size": 64,
+    "num_workers": 1,
+    "reply_weight": 0.6,           # contextual adjustment
+    "main_weight": 0.4,
+    "like_weight": 0.7,            # agregasi thread
+    "reply_position_weight": 0.3,
+    "pos_threshold": 0.05,         # evaluasi (label_mapper)
+    "neg_threshold": -0.05,
+}
+
+
+def experiment_name(params):
+    """Nama folder eksperimen contextual, mis. (0.6, 0.4) -> 60_main_sentiment."""
+    return f"{int(round(params['reply_weight'] * 100))}_main_sentiment"
+
+
+def _out_path(directory, file_name):
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, file_name)
+
+
+# =====================================================
+# TAHAP
+# =====================================================
+def run_cleaning(ctx, raw):
+    cleaned, stats = clean_dataframe(raw, name=ctx["name"])
+    print_cleaning_summary(stats)
+    return cleaned
+
+
+def save_cleaning(ctx, cleaned):
+    path = _out_path(CLEAN_DATASET_DIR, f"{ctx['name']}_cleaned.csv")
+    path = save_cleaned(cleaned, path)
+    print(f"[DONE] Cleaned disimpan di: {path}")
+
+
+def run_inference(ctx, cleaned):
+    p = ctx["params"]
+    df = compute_sentiment_scores(
+        cleaned,
+        batch_size=p["batch_size"],
+        model_name=p["model_name"],
+        backend=p["backend"],
+        num_workers=p["num_workers"],
+    )
+    return df[[col for col in OUTPUT_COLUMNS if col in df.columns]]
+
+
+def save_inference(ctx, df):
+    path = write_table(df, _out_path(SENTIMENT_DIR, f"{ctx['name']}_cleaned_sentiment.csv"))
+    print(f"[DONE] Sentiment disimpan di: {path}")
+
+
+def run_contextual(ctx, df):
+    p = ctx["params"]
+    return adjust_sentiment_contextually(df, reply_weight=p["reply_weight"], main_weight=p["main_weight"])
+
+
+def save_contextual(ctx, df):
+    directory = os.path.join(CONTEXTUAL_DIR, experiment_name(ctx["params"]))
+    path = write_table(df, _out_path(directory, f"{ctx['name']}_cleaned_contextual.csv"))
+    print(f"[DONE] Contextual disimpan di: {path}")
+
+
+def run_aggregation(ctx, df):
+    p = ctx["params"]
+    return aggregate_thread_sentiments(
+        df, like_weight=p["like_weight"], reply_position_weight=p["reply_position_weight"]
+    )
+
+
+def save_aggregation(ctx, summary):
+    directory = os.path.join(SUMMARY_DIR, experiment_name(ctx["params"]))
+    path = write_table(summary, _out_path(directory, f"{ctx['name']}_cleaned_summary.csv"))
+    print(f"[DONE] Summary disimpan di: {path}")
+
+
+def llm_label_path(name):
+    return os.path.join(LLM_LABEL_DIR, f"{name}_thread_llm.csv")
+
+
+def load_llm_labels(name):
+    """Ground truth thread-level (input tahap evaluasi); None bila belum ada."""
+    path = llm_label_path(name)
+    if not table_exists(path):
+        print(f"[SKIP] Ground truth tidak ditemukan: {os.path.basename(path)}")
+        return None
+    return read_table(path)
+
+
+def run_evaluation(ctx, summary, llm_labels):
+    from new_evaluation.thread_evaluation.utils.metrics import evaluate_thread_summary
+
+    p = ctx["params"]
+    df_merge, metrics, cm_df = evaluate_thread_summary(
+        summary, llm_labels, pos_th=p["pos_threshold"], neg_th=p["neg_threshold"]
+    )
+    print(f"  Total thread dievaluasi: {len(df_merge)} | accuracy={metrics['accuracy']:.4f} "
+          f"| macro_f1={metrics['macro_f1']:.4f}")
+    return {"merged": df_merge, "metrics": metrics, "confusion_matrix": cm_df}
+
+
+def save_evaluation(ctx, result):
+    base = os.path.join(EVAL_RESULT_DIR, experiment_name(ctx["params"]))
+    merge_path = write_table(result["merged"], _out_path(os.path.join(base, "merged"), f"{ctx['name']}_merged.csv"))
+    cm_path = _out_path(os.path.join(base, "per_video"), f"{ctx['name']}_confusion_matrix.csv")
+    result["confusion_matrix"].to_csv(cm_path, encoding="utf-8-sig")
+    print(f"[DONE] Evaluasi disimpan di: {merge_path}")
+
+
+# cleaning -> inference -> contextual -> aggregation -> evaluation
+STAGES = [
+    Stage("cleaned", ("raw",), run_cleaning, save_cleaning,
+          params=(), code=STAGE_CODE["cleaned"]),
+    Stage("sentiment", ("cleaned",), run_inference, save_inference,
+          params=("model_name", "backend"), code=STAGE_CODE["sentiment"]),
+    Stage("contextual", ("sentiment",), run_contextual, save_contextual,
+          params=("reply_weight", "main_weight"), code=STAGE_CODE["contextual"]),
+    Stage("summary", ("contextual",), run_aggregation, save_aggregation,
+          params=("like_weight", "reply_position_weight"), code=STAGE_CODE["summary"]),
+    Stage("evaluation", ("summary", "llm_labels"), run_evaluation, save_evaluation,
+          params=("pos_threshold", "neg_threshold"), code=STAGE_CODE["evaluation"]),
+]
+
+
+def save_evaluation_summary(params, rows):
+    """Ringkasan metrik per video dan keseluruhan (seperti run_thread_evaluation)."""
+    from new_evaluation.thread_evaluation.utils.metrics import compute_metrics
+
+    if not rows:
+        return
+    summary_dir = os.path.join(EVAL_RESULT_DIR, experiment_name(params), "summary")
+    os.makedirs(summary_dir, exist_ok=True)
+
+    pd.DataFrame([
+        {"video": name, **res["metrics"], "total_threads": len(res["merged"])}
+        for name, res in rows
+    ]).to_csv(os.path.join(summary_dir, "summary_per_video.csv"), index=False)
+
+    all_true = pd.concat([res["merged"]["llm_thread_label"] for _, res in rows])
+    all_pred = pd.concat([res["merged"]["indo_label"] for _, res in rows])
+    pd.DataFrame([compute_metrics(all_true, all_pred)]).to_csv(
+        os.path.join(summary_dir, "overall_metrics.csv"), index=False
+    )
+    print(f"[DONE] Ringkasan evaluasi disimpan di: {summary_dir}")
@@ -0,0 +1,280 @@
+# pipeline/storage.py
+"""
+Lapisan penyimpanan dataset antar tahap.
+
+Semua kode tetap memakai path logis `*.csv`; file nyata di disk bisa berupa
+`.parquet` / `.feather` (kolumnar, bertipe) atau `.csv`. Format tulis mengikuti
+STORAGE_FORMAT (env SENTIMENT_STORAGE_FORMAT: parquet | feather | csv),
+default parquet bila pyarrow terpasang, selain itu csv.
+"""
+import os
+import glob
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .thread_ids import intern_thread_ids, decode_thread_ids, save_dictionary
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+COLUMNAR_EXTS = (".parquet", ".feather")
+TABLE_EXTS = COLUMNAR_EXTS + (".csv",)
+
+STORAGE_FORMAT = os.environ.get("SENTIMENT_STORAGE_FORMAT") or ("parquet" if HAS_PYARROW else "csv")
+
+# Skema bertipe untuk kolom yang dipakai lintas tahap
+ID_COLUMNS = ("thread_id",)
+BOOL_COLUMNS = ("is_reply",)
+INT32_COLUMNS = ("likes_count", "total_comments")
+FLOAT32_COLUMNS = (
+    "sentiment_score", "main_sentiment", "contextual_score",
+    "p_pos", "p_neu", "p_neg", "weighted_avg_sentiment",
+)
+
+
+def _check_format(fmt):
+    if fmt not in ("parquet", "feather", "csv"):
+        raise ValueError(f"Format penyimpanan tidak dikenal: {fmt}")
+    if fmt != "csv" and not HAS_PYARROW:
+        raise ImportError(f"Format {fmt} membutuhkan pyarrow (pip install pyarrow)")
+
+
+def _to_bool(col):
+    if col.dtype == bool:
+        return col
+    mapped = col.map({True: True, False: False, "True": True, "False": False,
+                      "true": True, "false": False, 1: True, 0: False})
+    if mapped.isna().any():
+        # nilai kosong / tak dikenal tetap dipertahankan
+        return col if mapped.isna().sum() > col.isna().sum() else mapped.astype("boolean")
+    return mapped.astype(bool)
+
+
+def _to_int32(col):
+    num = pd.to_numeric(col, errors="coerce")
+    if num.isna().sum() > col.isna().sum():
+        return col  # ada nilai non-numerik, jangan diubah
+    if num.isna().any():
+        return num.astype("Int32")
+    return num.astype(np.int32)
+
+
+def apply_schema(df):
+    """Samakan tipe kolom umum (thread_id kode int64, is_reply bool, likes int32, skor float32)."""
+    df = df.copy()
+    for c in ID_COLUMNS:
+        if c in df.columns:
+            df[c] = intern_thread_ids(df[c])
+    for c in BOOL_COLUMNS:
+        if c in df.columns:
+            df[c] = _to_bool(df[c])
+    for c in INT32_COLUMNS:
+        if c in df.columns:
+            df[c] = _to_int32(df[c])
+    for c in FLOAT32_COLUMNS:
+        if c in df.columns and pd.api.types.is_numeric_dtype(df[c]):
+            df[c] = df[c].astype(np.float32)
+    return df
+
+
+def to_text_ids(df):
+    """Salinan df dengan thread_id dikembalikan ke hash (untuk CSV/JSON yang dibaca manusia)."""
+    df = df.copy()
+    for c in ID_COLUMNS:
+        if c in df.columns:
+            df[c] = decode_thread_ids(df[c])
+    return df
+
+
+def _base(path):
+    base, ext = os.path.splitext(str(path))
+    return base if ext in TABLE_EXTS else str(path)
+
+
+def resolve_table(path):
+    """
+    File nyata untuk dataset logis `path`. Bila ada beberapa format, yang terbaru
+    dipakai; bila sama baru, format kolumnar didahulukan.
+    """
+    base = _base(path)
+    existing = [(i, base + ext) for i, ext in enumerate(TABLE_EXTS) if os.path.exists(base + ext)]
+    if not existing:
+        return str(path)
+    return max(existing, key=lambda item: (os.path.getmtime(item[1]), -item[0]))[1]
+
+
+def table_exists(path):
+    return os.path.exists(resolve_table(path))
+
+
+def list_tables(directory, pattern="*.csv"):
+    """
+    Daftar dataset (sebagai path logis .csv) di `directory`, apa pun format file-nya.
+    """
+    directory = Path(directory)
+    stem_pattern = pattern[:-4] if pattern.endswith(".csv") else pattern
+    found = set()
+    for ext in TABLE_EXTS:
+        for f in glob.glob(str(directory / (stem_pattern + ext))):
+            found.add(Path(_base(f) + ".csv"))
+    return sorted(found)
+
+
+def read_table(path, columns=None):
+    """Baca dataset (parquet/feather/csv) dengan skema bertipe."""
+    actual = resolve_table(path)
+    ext = os.path.splitext(actual)[1]
+    if ext == ".parquet":
+        if columns is not None:
+            import pyarrow.parquet as pq
+            names = pq.read_schema(actual).names
+            columns = [c for c in columns if c in names]
+        df = pd.read_parquet(actual, columns=columns)
+    elif ext == ".feather":
+        if columns is not None:
+            import pyarrow as pa
+            names = pa.ipc.open_file(actual).schema.names
+            columns = [c for c in columns if c in names]
+        df = pd.read_feather(actual, columns=columns)
+    else:
+        usecols = None if columns is None else (lambda c: c in columns)
+        df = pd.read_csv(actual, usecols=usecols, dtype={c: str for c in ID_COLUMNS})
+    return apply_schema(df)
+
+
+def iter_table_chunks(path, chunksize, columns=None):
+    """Baca dataset per `chunksize` baris (untuk mode streaming)."""
+    actual = resolve_table(path)
+    ext = os.path.splitext(actual)[1]
+    if ext == ".parquet":
+        import pyarrow.parquet as pq
+        pf = pq.ParquetFile(actual)
+        if columns is not None:
+            columns = [c for c in columns if c in pf.schema_arrow.names]
+        for batch in pf.iter_batches(batch_size=chunksize, columns=columns):
+            yield apply_schema(batch.to_pandas())
+    elif ext == ".feather":
+        import pyarrow as pa
+        # memory map: hanya record batch yang sedang diproses yang dimuat/di-decompress
+        with pa.memory_map(actual) as source:
+            reader = pa.ipc.open_file(source)
+            if columns is not None:
+                # urutan kolom mengikuti file, sama seperti read_table
+                columns = [c for c in reader.schema.names if c in columns]
+            # record batch file (~64k baris) dipotong/digabung ulang menjadi chunk `chunksize` baris
+            pending, rows = [], 0
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                pending.append(batch if columns is None else batch.select(columns))
+                rows += batch.num_rows
+                while rows >= chunksize:
+                    table = pa.Table.from_batches(pending)
+                    yield apply_schema(table.slice(0, chunksize).to_pandas())
+                    rest = table.slice(chunksize)
+                    pending, rows = rest.to_batches(), rest.num_rows
+            if rows:
+                yield apply_schema(pa.Table.from_batches(pending).to_pandas())
+    else:
+        usecols = None if columns is None else (lambda c: c in columns)
+        for chunk in pd.read_csv(actual, chunksize=chunksize, usecols=usecols,
+                                 dtype={c: str for c in ID_COLUMNS}):
+            yield apply_schema(chunk)
+
+
+def write_table(df, path, fmt=None, **csv_kwargs):
+    """
+    Simpan dataset di path logis `path` dalam format `fmt` (default STORAGE_FORMAT).
+    csv_kwargs hanya dipakai untuk format csv. Mengembalikan path file yang ditulis.
+    """
+    fmt = fmt or STORAGE_FORMAT
+    _check_format(fmt)
+    df = apply_schema(df)
+    out_path = f"{_base(path)}.{fmt}"
+    tmp_path = f"{out_path}.tmp"
+
+    if fmt == "csv":
+        kwargs = {"index": False, "encoding": "utf-8-sig", **csv_kwargs}
+        to_text_ids(df).to_csv(tmp_path, **kwargs)
+    else:
+        # kode int64 hanya bermakna bersama kamusnya
+        save_dictionary()
+        if fmt == "parquet":
+            df.to_parquet(tmp_path, index=False)
+        else:
+            df.reset_index(drop=True).to_feather(tmp_path)
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+def export_csv(path, out_path=None, **csv_kwargs):
+    """Ekspor dataset kolumnar ke CSV (on demand). Mengembalikan path CSV."""
+    actual = resolve_table(path)
+    out_path = str(out_path or f"{_base(path)}.csv")
+    df = to_text_ids(read_table(actual))
+    kwargs = {"index": False, "encoding": "utf-8-sig", **csv_kwargs}
+    df.to_csv(out_path, **kwargs)
+    if out_path == f"{_base(path)}.csv" and actual != out_path:
+        # isi sama: samakan mtime agar file kolumnar tetap didahulukan saat dibaca
+        st = os.stat(actual)
+        os.utime(out_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    return out_path
+
+
+# =====================================================
+# PART FILE (mode streaming): tiap chunk ditulis atomik, digabung di akhir
+# =====================================================
+def parts_dir(path):
+    return f"{_base(path)}.parts"
+
+
+def write_part(df, part_path):
+    """Tulis satu chunk sebagai file parquet (atomik)."""
+    _check_format("parquet")
+    df = apply_schema(df)
+    save_dictionary()
+    tmp_path = f"{part_path}.tmp"
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, part_path)
+
+
+def merge_parts(part_paths, path, fmt=None):
+    """Gabungkan part file secara berurutan ke satu dataset tanpa memuat semuanya ke memori."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    fmt = fmt or STORAGE_FORMAT
+    _check_format(fmt)
+    out_path = f"{_base(path)}.{fmt}"
+    tmp_path = f"{out_path}.tmp"
+
+    writer, schema = None, None
+    try:
+        for part in part_paths:
+            table = pq.read_table(part)
+            if writer is None:
+                schema = table.schema
+                if fmt == "parquet":
+                    writer = pq.ParquetWriter(tmp_path, schema)
+                elif fmt == "feather":
+                    writer = pa.ipc.new_file(tmp_path, schema)
+                else:
+                    writer = open(tmp_path, "w", newline="", encoding="utf-8-sig")
+            table = table.cast(schema)
+            if fmt == "csv":
+                to_text_ids(apply_schema(table.to_pandas())).to_csv(
+                    writer, index=False, header=(writer.tell() == 0)
+                )
+            else:
+                writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        raise ValueError("Tidak ada part untuk digabungkan")
+    os.replace(tmp_path, out_path)
+    return out_path
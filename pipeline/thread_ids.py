@@ -0,0 +1,185 @@
+# pipeline/thread_ids.py
+"""
+Interning thread_id: hash md5 (32 hex) -> kode int64.
+
+Kode diambil dari 16 hex pertama hash (64-bit) dengan bit tanda dibalik. Untuk hash
+md5 asli kode ini deterministik lintas file/proses dan urutan kode = urutan hash.
+Bila kode itu sudah dipakai id lain (prefix sama, mis. id sintetis berawalan nol),
+dipakai kode bebas berikutnya. Kode hasil probing bergantung pada isi kamus saat itu,
+jadi kamus langsung disimpan ke THREAD_ID_DICT dan menjadi acuan kode -> hash; jangan
+dihapus selama masih ada dataset Parquet/Feather yang memakai kodenya.
+Bila kamus di disk bertentangan dengan kode yang sudah dipakai proses ini (dua proses
+memberi kode berbeda), ValueError dinaikkan sebelum dataset ditulis atau dibaca,
+sehingga kode tidak pernah diam-diam di-decode ke hash yang salah.
+"""
+import os
+import re
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+THREAD_ID_DICT = os.path.join("pipeline", "thread_ids")
+
+_HEX_ID = re.compile(r"[0-9a-f]{32}")
+_SIGN_BIT = np.uint64(1 << 63)
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+_codes = {}        # kode -> hash
+_ids = {}          # hash -> kode
+_probe = {}        # kode prefix -> kode terakhir hasil probing (untuk prefix yang bertabrakan)
+_dirty = False
+_loaded = None     # (path, mtime) kamus terakhir yang dibaca
+
+
+def _dict_file():
+    try:
+        import pyarrow  # noqa: F401
+        return THREAD_ID_DICT + ".parquet"
+    except ImportError:
+        return THREAD_ID_DICT + ".csv"
+
+
+def _load():
+    """Gabungkan kamus di disk bila berubah sejak terakhir dibaca (mis. ditulis proses lain)."""
+    global _loaded
+    path = _dict_file()
+    mtime = os.stat(path).st_mtime_ns if os.path.exists(path) else None
+    if _loaded == (path, mtime):
+        return
+    _loaded = (path, mtime)
+    if mtime is None:
+        return
+    if path.endswith(".parquet"):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path, dtype={"thread_hash": str})
+    for code, value in zip(df["code"].astype(np.int64).tolist(), df["thread_hash"].tolist()):
+        known = _codes.get(code)
+        if known == value:
+            continue
+        if known is None and value not in _ids:
+            _codes[code] = value
+            _ids[value] = code
+            continue
+        raise ValueError(
+            f"Kamus thread_id {path} bertentangan dengan proses ini: kode {code} = {value} di file, "
+            f"tetapi {known if known is not None else value} memakai kode "
+            f"{code if known is not None else _ids[value]} di sini. Kemungkinan dua proses "
+            "mendaftarkan id yang prefix-nya bertabrakan bersamaan; jalankan ulang tahap ini."
+        )
+
+
+def _hash_codes(hashes):
+    """Kode int64 untuk list hash hex 32 karakter (vektorisasi via bytes.fromhex)."""
+    if not hashes:
+        return np.zeros(0, dtype=np.int64)
+    prefix = bytes.fromhex("".join(h[:16] for h in hashes))
+    return (np.frombuffer(prefix, dtype=">u8").astype(np.uint64) ^ _SIGN_BIT).view(np.int64)
+
+
+def _free_code(base):
+    """Kode bebas pertama setelah `base` (probing linear, melingkar di batas int64)."""
+    code = _probe.get(base, base)
+    while code in _codes:
+        code = _INT64_MIN if code == _INT64_MAX else code + 1
+    _probe[base] = code
+    return code
+
+
+def register(values):
+    """
+    Daftarkan nilai thread_id unik (string) dan kembalikan kodenya.
+    Nilai yang bukan hash md5 di-hash dulu dengan md5 (sama seperti make_hash_id).
+    """
+    _load()
+    global _dirty
+    codes = np.fromiter((_ids.get(v, 0) for v in values), dtype=np.int64, count=len(values))
+    new = [i for i, v in enumerate(values) if v not in _ids]
+    if not new:
+        return codes
+
+    hashes = [
+        values[i] if _HEX_ID.fullmatch(values[i]) else hashlib.md5(values[i].encode("utf-8")).hexdigest()
+        for i in new
+    ]
+    probed = False
+    # urut hash: probing dalam satu panggilan tidak bergantung urutan baris input
+    for _, i, code in sorted(zip(hashes, new, _hash_codes(hashes).tolist())):
+        value = values[i]
+        if value in _ids:  # duplikat di dalam `values`
+            codes[i] = _ids[value]
+            continue
+        if code in _codes:
+            code = _free_code(code)
+            probed = True
+        _codes[code] = value
+        _ids[value] = code
+        codes[i] = code
+        _dirty = True
+    if probed:
+        # kode hasil probing harus segera terlihat oleh proses lain
+        save_dictionary()
+    return codes
+
+
+def intern_thread_ids(values):
+    """
+    Ubah kolom thread_id menjadi kode int64 (Int64 bila ada nilai kosong).
+    Kolom yang sudah berupa kode integer dikembalikan apa adanya.
+    """
+    values = pd.Series(values)
+    if pd.api.types.is_integer_dtype(values.dtype):
+        return values if values.dtype == "Int64" else values.astype(np.int64)
+
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype(object)
+    codes, uniques = pd.factorize(values)
+    uniq_codes = register([str(v) for v in uniques])
+
+    if (codes < 0).any():
+        # kode -1 (kosong) menunjuk elemen tambahan di akhir, lalu di-mask
+        out = pd.array(np.append(uniq_codes, 0)[codes], dtype="Int64")
+        out[codes < 0] = pd.NA
+        return pd.Series(out, index=values.index, name=values.name)
+    return pd.Series(uniq_codes[codes], index=values.index, name=values.name)
+
+
+def decode_thread_ids(codes):
+    """Kembalikan kode int64 ke hash thread_id asli (object, NaN tetap NaN)."""
+    _load()
+    codes = pd.Series(codes)
+    if not pd.api.types.is_integer_dtype(codes.dtype):
+        return codes
+    idx, uniques = pd.factorize(codes)
+    try:
+        hashes = np.array([_codes[int(c)] for c in uniques] + [np.nan], dtype=object)
+    except KeyError as e:
+        raise KeyError(
+            f"Kode thread_id {e.args[0]} tidak ada di kamus {_dict_file()}; "
+            "baca ulang dataset sumber (CSV) agar kamus terbentuk kembali"
+        ) from None
+    return pd.Series(hashes[idx], index=codes.index, name=codes.name)
+
+
+def save_dictionary():
+    """Simpan kamus kode -> hash (digabung dengan isi file yang sudah ada, ditulis atomik)."""
+    global _dirty, _loaded
+    if not _dirty:
+        return
+    path = _dict_file()
+    _load()  # gabungkan entri dari proses lain
+
+    df = pd.DataFrame({
+        "code": np.fromiter(_codes.keys(), dtype=np.int64, count=len(_codes)),
+        "thread_hash": list(_codes.values()),
+    }).sort_values("code")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    if path.endswith(".parquet"):
+        df.to_parquet(tmp_path, index=False)
+    else:
+        df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    _loaded = (path, os.stat(path).st_mtime_ns)
+    _dirty = False
@@ -1,6 +1,7 @@
 # run_cleaning.py
 import os
 from cleaning.cleaner import list_available_datasets, clean_dataset
+from cleaning.parallel_cleaning import clean_datasets_parallel, default_workers
 
 def run():
     print("📁 Daftar dataset tersedia di folder 'scrapping/dataset':\n")
@@ -24,16 +25,26 @@ def run():
         if c.isdigit():
             selected_indices.append(int(c))
 
-    print("\nMemulai proses cleaning...\n")
     for idx in selected_indices:
-        if 1 <= idx <= len(datasets):
-            file_name = datasets[idx - 1]
+        if not 1 <= idx <= len(datasets):
+            print(f"[WARN] Nomor {idx} tidak valid, dilewati.")
+    selected = [datasets[idx - 1] for idx in selected_indices if 1 <= idx <= len(datasets)]
+
+    workers = input(f"Jumlah worker (Enter = {default_workers()} core, 1 = sekuensial): ").strip()
+    workers = int(workers) if workers.isdigit() and int(workers) > 0 else default_workers()
+
+    print("\nMemulai proses cleaning...\n")
+    if workers > 1 and selected:
+        try:
+            clean_datasets_parallel(selected, num_workers=workers)
+        except Exception as e:
+            print(f"[CRITICAL] Cleaning paralel gagal: {e}")
+    else:
+        for file_name in selected:
             try:
                 clean_dataset(file_name)
             except Exception as e:
                 print(f"[CRITICAL] Cleaning gagal total pada {file_name}: {e}")
-        else:
-            print(f"[WARN] Nomor {idx} tidak valid, dilewati.")
 
     print("\n✅ Semua proses cleaning selesai. Hasil tersimpan di folder 'cleaning/dataset'.")
 
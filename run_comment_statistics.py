@@ -1,5 +1,6 @@
 import os
 import pandas as pd
+from pipeline.storage import list_tables, read_table, to_text_ids
 
 # =============================
 # KONFIGURASI FOLDER
@@ -17,8 +18,8 @@ os.makedirs(OUTPUT_FOLDER, exist_ok=True)
 # =============================
 def process_file_stats(filepath):
 
-    # Baca CSV
-    df = pd.read_csv(filepath)
+    # Baca dataset (CSV/Parquet)
+    df = to_text_ids(read_table(filepath))
 
     # Validasi kolom yang wajib
     required_cols = ["thread_id", "comment", "likes_count", "is_reply"]
@@ -63,7 +64,7 @@ def process_file_stats(filepath):
 def main():
     print("\n=== Menghitung Statistik Komentar YouTube ===\n")
 
-    files = [f for f in os.listdir(SCRAPING_FOLDER) if f.endswith(".csv")]
+    files = [p.name for p in list_tables(SCRAPING_FOLDER)]
     if len(files) == 0:
         print("Tidak ada file CSV pada folder scrapping/dataset.")
         return
@@ -0,0 +1,55 @@
+# run_export_csv.py
+"""
+Ekspor dataset kolumnar (parquet/feather) ke CSV untuk dibuka di Excel / alat lain.
+Pipeline sendiri tidak membutuhkan CSV ini.
+"""
+import os
+from pathlib import Path
+
+from pipeline.storage import list_tables, resolve_table, export_csv
+
+DATASET_DIRS = [
+    os.path.join("cleaning", "dataset"),
+    os.path.join("sentiment", "dataset"),
+    os.path.join("new_evaluation", "thread_evaluation", "results"),
+]
+
+
+def list_columnar_tables():
+    tables = []
+    for root in DATASET_DIRS:
+        if not os.path.isdir(root):
+            continue
+        for directory in sorted({root, *[str(p) for p in Path(root).rglob("*") if p.is_dir()]}):
+            for path in list_tables(directory):
+                if not resolve_table(path).endswith(".csv"):
+                    tables.append(path)
+    return tables
+
+
+def main():
+    tables = list_columnar_tables()
+    if not tables:
+        print("[INFO] Tidak ada dataset parquet/feather yang perlu diekspor.")
+        return
+
+    print("\n📂 Dataset kolumnar tersedia:")
+    for i, p in enumerate(tables, 1):
+        print(f"{i}. {p}")
+
+    choice = input("\nPilih file (contoh: 1,3,5 | kosong = semua): ").strip()
+    if choice:
+        idxs = [int(x) - 1 for x in choice.split(",") if x.strip().isdigit()]
+        selected = [tables[i] for i in idxs if 0 <= i < len(tables)]
+    else:
+        selected = tables
+
+    for path in selected:
+        out = export_csv(path)
+        print(f"✓ {resolve_table(path)} -> {out}")
+
+    print("\n🎉 Ekspor CSV selesai.")
+
+
+if __name__ == "__main__":
+    main()
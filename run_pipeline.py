@@ -0,0 +1,88 @@
+# run_pipeline.py
+import os
+from cleaning.cleaner import SCRAP_DATASET_DIR, CLEAN_DATASET_DIR
+from pipeline import run_dag
+from pipeline.stage_cache import file_key
+from pipeline.storage import list_tables, read_table
+from pipeline.stages import (
+    ARTIFACTS, DEFAULT_PARAMS, STAGES, llm_label_path, load_llm_labels, save_evaluation_summary
+)
+
+
+def _select(items, prompt):
+    for i, item in enumerate(items, start=1):
+        print(f"{i}. {item}")
+    choice = input(prompt).strip()
+    if not choice:
+        return []
+    return [items[int(x) - 1] for x in choice.split(",") if x.strip().isdigit() and 1 <= int(x) <= len(items)]
+
+
+def run():
+    print("=== PIPELINE END-TO-END (cleaning → inference → contextual → agregasi → evaluasi) ===")
+    print("1️⃣ Mulai dari dataset mentah (scrapping/dataset)")
+    print("2️⃣ Mulai dari dataset bersih (cleaning/dataset)")
+    source = input("\nPilih sumber [1/2]: ").strip()
+
+    if source == "2":
+        src_dir, input_name, suffix = CLEAN_DATASET_DIR, "cleaned", "_cleaned.csv"
+    else:
+        src_dir, input_name, suffix = SCRAP_DATASET_DIR, "raw", ".csv"
+
+    files = [p.name for p in list_tables(src_dir, f"*{suffix}")]
+    if not files:
+        print(f"[INFO] Tidak ada file CSV di {src_dir}.")
+        return
+
+    print("\n📂 File tersedia:")
+    selected = _select(files, "\nPilih file (pisahkan dengan koma, contoh: 1,3): ")
+    if not selected:
+        print("Tidak ada input diberikan. Program dihentikan.")
+        return
+
+    # Hanya artefak yang dipilih yang ditulis ke disk; sisanya tetap di memori
+    options = ARTIFACTS[1:] if input_name == "cleaned" else ARTIFACTS
+    print("\n💾 Artefak yang bisa disimpan:")
+    persist = _select(options, "\nPilih artefak yang disimpan [default: summary,evaluation]: ")
+    persist = persist or ["summary", "evaluation"]
+
+    workers_in = input(f"Jumlah proses inferensi paralel [1-{os.cpu_count() or 1}, default 1]: ").strip()
+    params = dict(DEFAULT_PARAMS)
+    params["num_workers"] = int(workers_in) if workers_in.isdigit() and int(workers_in) > 0 else 1
+
+    # Tahap dengan input, parameter, dan kode yang sama dilewati (hasil dari cache)
+    use_cache = input("Gunakan cache tahap (lewati tahap yang tidak berubah)? [Y/n]: ").strip().lower() != "n"
+
+    # tahap terjauh yang diminta menentukan sampai mana pipeline berjalan;
+    # model di-load (sekali, lewat registry) hanya bila tahap inferensi benar-benar dijalankan
+    targets = [a for a in ARTIFACTS if a in persist]
+
+    evaluations = []
+    for file_name in selected:
+        name = file_name[: -len(suffix)]
+        print("\n====================================================")
+        print(f"▶ MEMPROSES FILE: {file_name}")
+        print("====================================================")
+
+        ctx = {"name": name, "params": params}
+        src_path = os.path.join(src_dir, file_name)
+        inputs = {input_name: read_table(src_path)}
+        input_keys = {input_name: file_key(src_path)}
+        if "evaluation" in targets:
+            inputs["llm_labels"] = load_llm_labels(name)
+            input_keys["llm_labels"] = file_key(llm_label_path(name)) if inputs["llm_labels"] is not None else "none"
+
+        results = run_dag(STAGES, targets, ctx, inputs=inputs, persist=persist,
+                          input_keys=input_keys, use_cache=use_cache)
+
+        if results.get("evaluation") is not None:
+            evaluations.append((name, results["evaluation"]))
+
+    if "evaluation" in persist:
+        save_evaluation_summary(params, evaluations)
+
+    print("\n🎉 Pipeline selesai.")
+
+
+if __name__ == "__main__":
+    run()
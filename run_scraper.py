@@ -8,6 +8,8 @@ import time
 from selenium.webdriver.common.by import By
 from scrapping.driver import create_driver_visible
 from scrapping.scraper import scrape_all_comments_batched
+from scrapping.scheduler import scrape_videos_parallel
+from scrapping.waits import set_wait_profile, reset_timings, print_timing_report
 
 
 def get_video_title(driver):
@@ -19,6 +21,19 @@ def get_video_title(driver):
         return "Judul tidak ditemukan"
 
 
+def print_video_result(idx, csv_path, scraped_count, displayed_total):
+    print(f"\n[FINISH] Video #{idx} -> Data disimpan ke: {csv_path}")
+    print(f"[RESULT] Total komentar di halaman: {displayed_total}")
+    print(f"[RESULT] Total komentar di-scrape: {scraped_count}")
+    if displayed_total:
+        diff = displayed_total - scraped_count
+        print(f"[CHECK] Selisih: {diff}")
+        if abs(diff) <= 5:
+            print("[OK] Akurat — jumlah hampir sama dengan tampilan YouTube ✅")
+        else:
+            print("[WARN] Terdapat perbedaan signifikan antara YouTube dan hasil scraping.")
+
+
 def run():
     print("Masukkan hingga 6 URL video YouTube (satu per baris).")
     print("Ketik 'selesai' untuk berhenti memasukkan URL.\n")
@@ -48,9 +63,50 @@ def run():
     else:
         print("\nMode aktif: ⚡ Headless mode — proses berjalan lebih cepat tanpa menampilkan browser.\n")
 
+    # 🔧 Mode pengambilan komentar
+    print("\nMode pengambilan komentar:")
+    print("  [1] Network capture — rekam respons JSON YouTube (cepat, fallback ke DOM bila gagal)")
+    print("  [2] DOM bulk — baca satu batch thread dengan satu perintah JavaScript")
+    print("  [3] DOM — baca elemen halaman satu per satu (lambat, paling teruji)")
+    mode = {"2": "bulk", "3": "dom"}.get(input("Pilihan Anda [1/2/3, Enter = 1]: ").strip(), "network")
+
+    # 🔧 Profil jeda antar aksi browser
+    print("\nProfil jeda:")
+    print("  [1] Adaptive — lanjut begitu komentar baru muncul (lebih cepat)")
+    print("  [2] Conservative — jeda tetap seperti versi lama (paling aman dari rate limit)")
+    set_wait_profile("conservative" if input("Pilihan Anda [1/2, Enter = 1]: ").strip() == "2" else "adaptive")
+    reset_timings()
+
+    # 🔧 Scraping ulang video yang sudah pernah di-scrape
+    print("\nMode inkremental: hanya tambahkan komentar baru ke dataset_video_X.csv yang sudah ada")
+    print("(berlaku bila manifest file tersebut milik video yang sama; selain itu scraping penuh).")
+    incremental = input("Aktifkan mode inkremental? [y/n]: ").strip().lower() == 'y'
+
+    num_browsers = 1
+    if len(video_urls) > 1:
+        choice = input(f"Jumlah browser paralel (1-{len(video_urls)}, Enter = 1): ").strip()
+        if choice.isdigit() and int(choice) > 0:
+            num_browsers = min(int(choice), len(video_urls))
+
     print(f"Memulai scraping untuk {len(video_urls)} video...\n")
     time.sleep(1.2)
 
+    if num_browsers > 1:
+        results = scrape_videos_parallel(video_urls, num_browsers=num_browsers, headless=not show_browser, mode=mode,
+                                         incremental=incremental)
+        for res in results:
+            print("-" * 70)
+            if res["error"]:
+                print(f"[ERROR] Video #{res['idx']} ({res['url']}): {res['error']}")
+                continue
+            print_video_result(res["idx"], res["csv_path"], res["scraped"], res["displayed"])
+
+        print_timing_report()
+        print("\n" + "=" * 70)
+        print(f"✅ Semua {len(video_urls)} video telah selesai di-scrape.")
+        print("=" * 70)
+        return
+
     # Jalankan scraping satu per satu video
     for idx, url in enumerate(video_urls, start=1):
         print("=" * 70)
@@ -58,7 +114,7 @@ def run():
         print("=" * 70)
 
         # Buat driver sesuai pilihan user
-        driver = create_driver_visible(headless=not show_browser)
+        driver = create_driver_visible(headless=not show_browser, capture_network=mode == "network")
         driver.get(url)
         time.sleep(2.5)
 
@@ -69,7 +125,8 @@ def run():
 
         # Jalankan proses scraping (batch per 10 komentar)
         csv_path, scraped_count, displayed_total = scrape_all_comments_batched(
-            driver, url, batch_size=10, save_prefix=f"dataset_video_{idx}"
+            driver, url, batch_size=10, save_prefix=f"dataset_video_{idx}", mode=mode,
+            incremental=incremental
         )
 
         # Tutup browser setelah video selesai
@@ -78,20 +135,12 @@ def run():
         except Exception:
             pass
 
-        print(f"\n[FINISH] Video #{idx} -> Data disimpan ke: {csv_path}")
-        print(f"[RESULT] Total komentar di halaman: {displayed_total}")
-        print(f"[RESULT] Total komentar di-scrape: {scraped_count}")
-        if displayed_total:
-            diff = displayed_total - scraped_count
-            print(f"[CHECK] Selisih: {diff}")
-            if abs(diff) <= 5:
-                print("[OK] Akurat — jumlah hampir sama dengan tampilan YouTube ✅")
-            else:
-                print("[WARN] Terdapat perbedaan signifikan antara YouTube dan hasil scraping.")
+        print_video_result(idx, csv_path, scraped_count, displayed_total)
 
         print("-" * 70)
         time.sleep(2)
 
+    print_timing_report()
     print("\n" + "=" * 70)
     print(f"✅ Semua {len(video_urls)} video telah selesai di-scrape.")
     print("=" * 70)
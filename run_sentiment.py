@@ -1,21 +1,38 @@
 # run_sentiment.py
 import os
-from sentiment.sentiment_inference import analyze_and_save
+from sentiment.sentiment_inference import analyze_and_save, DEFAULT_CHUNKSIZE
 from sentiment.contextual_inference import adjust_sentiment_contextually
 from sentiment.aggregation import aggregate_thread_sentiments
 from sentiment.sentiment_inference import infer_single_sentence
+from sentiment.model_registry import warmup
+from pipeline.stage_cache import file_stage_key, outputs_fresh, record_outputs
+from pipeline.storage import list_tables, write_table
+
+MODEL_NAME = "mdhugol/indonesia-bert-sentiment-classification"
 
 def run():
     print("=== MODE ANALISIS SENTIMEN (UPDATED) ===")
     print("1️⃣ Analisis dataset CSV dari folder cleaning/dataset")
     print("2️⃣ Uji coba langsung di terminal (input manual)")
-    mode = input("\nPilih mode [1/2]: ").strip()
+    print("3️⃣ Jalankan server inferensi lokal (HTTP, micro-batching)")
+    mode = input("\nPilih mode [1/2/3]: ").strip()
+
+    # =====================================================
+    # MODE 3 — SERVER INFERENSI LOKAL
+    # =====================================================
+    if mode == "3":
+        from sentiment.inference_server import serve, DEFAULT_PORT
+        port_in = input(f"Port server [{DEFAULT_PORT}]: ").strip()
+        serve(model_name=MODEL_NAME, port=int(port_in) if port_in.isdigit() else DEFAULT_PORT)
+        return
 
     # =====================================================
     # MODE 2 — INTERAKTIF (uji coba satu kalimat)
     # =====================================================
     if mode == "2":
         print("\n🧠 Mode uji coba interaktif aktif.")
+        # Model di-load sekali, lalu dipakai ulang untuk setiap kalimat
+        warmup(MODEL_NAME)
         print("Ketik kalimat untuk dianalisis. Ketik 'exit' untuk keluar.\n")
 
         while True:
@@ -25,7 +42,7 @@ def run():
                 break
             if not text:
                 continue
-            infer_single_sentence(text, model_name="mdhugol/indonesia-bert-sentiment-classification")
+            infer_single_sentence(text, model_name=MODEL_NAME)
         return
 
     # =====================================================
@@ -42,8 +59,8 @@ def run():
     os.makedirs(CONTEXTUAL_DIR, exist_ok=True)
     os.makedirs(SUMMARY_DIR, exist_ok=True)
 
-    # --- Ambil file CSV dari cleaning/dataset ---
-    files = [f for f in os.listdir(CLEAN_DIR) if f.endswith(".csv")]
+    # --- Ambil dataset dari cleaning/dataset (CSV/Parquet) ---
+    files = [p.name for p in list_tables(CLEAN_DIR)]
     if not files:
         print("[INFO] Tidak ada dataset bersih ditemukan di cleaning/dataset.")
         return
@@ -55,6 +72,17 @@ def run():
     selected = input("\nPilih file untuk analisis (pisahkan dengan koma, contoh: 1,3,5): ").strip()
     selected_indices = [int(x.strip()) for x in selected.split(",") if x.strip().isdigit()]
 
+    # Jumlah proses inferensi (tiap proses memakai sebagian core CPU)
+    workers_in = input(f"Jumlah proses inferensi paralel [1-{os.cpu_count() or 1}, default 1]: ").strip()
+    num_workers = int(workers_in) if workers_in.isdigit() and int(workers_in) > 0 else 1
+
+    # Lanjutkan run yang terputus dari checkpoint terakhir (*.manifest.json)
+    resume = input("Lanjutkan run sebelumnya bila terputus (resume)? [y/N]: ").strip().lower() == "y"
+
+    # Model di-load sekali (saat pertama kali ada file yang perlu inferensi),
+    # lalu dipakai ulang untuk file berikutnya
+    model_ready = False
+
     for idx in selected_indices:
         if not (1 <= idx <= len(files)):
             print(f"[WARN] Nomor {idx} tidak valid.")
@@ -71,31 +99,52 @@ def run():
         # Tahap 1 — SENTIMENT INFERENCE + predicted_label
         # =====================================================
         out_sentiment = os.path.join(SENTIMENT_DIR, f"{base_name}_sentiment.csv")
-        analyze_and_save(
-            csv_path=inp,
-            output_path=out_sentiment,
-            batch_size=64,
-            model_name="mdhugol/indonesia-bert-sentiment-classification"
-        )
-        print(f"[DONE] Sentiment inference tersimpan di: {out_sentiment}")
+        key = file_stage_key("sentiment", [inp], {"model_name": MODEL_NAME, "backend": "torch"})
+        if outputs_fresh([out_sentiment], key):
+            print(f"[SKIP] Sentiment inference: input, model & kode tidak berubah")
+        else:
+            if not model_ready:
+                warmup(MODEL_NAME)
+                model_ready = True
+            analyze_and_save(
+                csv_path=inp,
+                output_path=out_sentiment,
+                batch_size=64,
+                model_name=MODEL_NAME,
+                num_workers=num_workers,
+                chunksize=DEFAULT_CHUNKSIZE,
+                resume=resume
+            )
+            record_outputs([out_sentiment], key)
+            print(f"[DONE] Sentiment inference tersimpan di: {out_sentiment}")
 
         # =====================================================
         # Tahap 2 — CONTEXTUAL ADJUSTMENT
         # =====================================================
         print(f"\n[STEP] Menjalankan contextual inference untuk: {base_name}")
-        df_context = adjust_sentiment_contextually(out_sentiment)
         out_context = os.path.join(CONTEXTUAL_DIR, f"{base_name}_contextual.csv")
-        df_context.to_csv(out_context, index=False, encoding="utf-8-sig")
-        print(f"[DONE] Contextual file disimpan di: {out_context}")
+        key = file_stage_key("contextual", [out_sentiment], {"reply_weight": 0.6, "main_weight": 0.4})
+        if outputs_fresh([out_context], key):
+            print(f"[SKIP] Contextual: input, bobot & kode tidak berubah")
+        else:
+            df_context = adjust_sentiment_contextually(out_sentiment)
+            saved = write_table(df_context, out_context)
+            record_outputs([out_context], key)
+            print(f"[DONE] Contextual file disimpan di: {saved}")
 
         # =====================================================
         # Tahap 3 — THREAD-LEVEL AGGREGATION
         # =====================================================
         print(f"\n[STEP] Menjalankan agregasi thread-level untuk: {base_name}")
-        df_summary = aggregate_thread_sentiments(out_context)
         out_summary = os.path.join(SUMMARY_DIR, f"{base_name}_summary.csv")
-        df_summary.to_csv(out_summary, index=False, encoding="utf-8-sig")
-        print(f"[DONE] Summary file disimpan di: {out_summary}")
+        key = file_stage_key("summary", [out_context], {"like_weight": 0.7, "reply_position_weight": 0.3})
+        if outputs_fresh([out_summary], key):
+            print(f"[SKIP] Agregasi: input, bobot & kode tidak berubah")
+        else:
+            df_summary = aggregate_thread_sentiments(out_context)
+            saved = write_table(df_summary, out_summary)
+            record_outputs([out_summary], key)
+            print(f"[DONE] Summary file disimpan di: {saved}")
 
         print("====================================================\n")
 
@@ -0,0 +1,148 @@
+# scrapping/bulk_extract.py
+# Ekstraksi komentar satu batch thread sekaligus lewat satu execute_script
+
+import time
+
+import pandas as pd
+
+from .network_capture import CLICK_REPLY_BUTTONS_JS
+from .utils import parse_numeric_text, make_hash_id, clean_comment_text_preserve
+from .waits import pause, settle, count_nodes
+
+# Versi JavaScript dari extract_comment_richtext: emoji <img alt>, link diperluas,
+# lalu teks digabung seperti BeautifulSoup get_text(" ", strip=True).
+# unwrapRedirect = utils.unwrap_redirect.
+_RICH_TEXT_JS = """
+function unwrapRedirect(href) {
+  if (href.includes("/redirect?")) {
+    const q = new URL(href, "https://www.youtube.com").searchParams.get("q");
+    if (q) return q;
+  }
+  return href;
+}
+function richText(el) {
+  if (!el) return null;
+  const node = el.cloneNode(true);
+  for (const img of node.querySelectorAll("img")) {
+    if (img.hasAttribute("alt")) img.replaceWith(img.getAttribute("alt"));
+    else if (img.hasAttribute("src")) img.replaceWith("[emoji]");
+  }
+  const strings = (n) => {
+    const out = [];
+    const walker = document.createTreeWalker(n, NodeFilter.SHOW_TEXT);
+    while (walker.nextNode()) {
+      const t = walker.currentNode.nodeValue.trim();
+      if (t) out.push(t);
+    }
+    return out;
+  };
+  for (const a of node.querySelectorAll("a")) {
+    const href = unwrapRedirect(a.getAttribute("href") || "");
+    const text = strings(a).join(" ");
+    let repl = text;
+    if (href.startsWith("/@")) repl = text;
+    else if (href.startsWith("/watch") || href.startsWith("/channel")) {
+      const full = "https://www.youtube.com" + href;
+      repl = text ? text + " (" + full + ")" : full;
+    } else if (href.startsWith("http")) repl = text ? text + " (" + href + ")" : href;
+    a.replaceWith(repl);
+  }
+  return strings(node).join(" ");
+}
+"""
+
+# arguments[0] = list elemen ytd-comment-thread-renderer
+EXTRACT_THREADS_JS = _RICH_TEXT_JS + """
+function likes(el) {
+  const v = el.querySelector("#vote-count-middle");
+  return v ? v.innerText.trim() : "";
+}
+const rows = [];
+arguments[0].forEach((thread, i) => {
+  const main = thread.querySelector("ytd-comment-view-model#comment");
+  const text = main ? richText(main.querySelector("#content-text")) : null;
+  if (text === null) return;
+  rows.push({text: text, likes: likes(main), is_reply: false, parent: i});
+  for (const r of thread.querySelectorAll("ytd-comment-replies-renderer ytd-comment-view-model")) {
+    const rt = richText(r.querySelector("#content-text"));
+    if (rt !== null) rows.push({text: rt, likes: likes(r), is_reply: true, parent: i});
+  }
+});
+return rows;
+"""
+
+# Teks komentar utama semua thread mulai indeks arguments[0] (null bila tidak terbaca)
+MAIN_TEXTS_JS = _RICH_TEXT_JS + """
+const threads = document.querySelectorAll("ytd-comment-thread-renderer");
+const out = [];
+for (let i = arguments[0]; i < threads.length; i++) {
+  const main = threads[i].querySelector("ytd-comment-view-model#comment");
+  out.push(main ? richText(main.querySelector("#content-text")) : null);
+}
+return out;
+"""
+
+
+def expand_batch_replies(driver, threads, stable_rounds=3, max_time=120):
+    """
+    Buka semua balasan di satu batch thread: klik semua tombol sekaligus per putaran,
+    berhenti bila beberapa putaran tidak ada klik dan jumlah balasan tetap.
+    """
+    start = time.time()
+    last_count = count_nodes(driver, "ytd-comment-view-model", threads)
+    stagnant = 0
+    while stagnant < stable_rounds and time.time() - start < max_time:
+        clicked = driver.execute_script(CLICK_REPLY_BUTTONS_JS, threads) or 0
+        if clicked:
+            count = settle(driver, "bulk_click", "ytd-comment-view-model", last_count, root=threads)
+        else:
+            pause("idle")
+            count = count_nodes(driver, "ytd-comment-view-model", threads)
+        if clicked or count != last_count:
+            stagnant = 0
+            last_count = count
+        else:
+            stagnant += 1
+    return last_count
+
+
+def parse_extracted(raw_rows):
+    """
+    Ubah hasil EXTRACT_THREADS_JS menjadi DataFrame baris CSV (urutan dipertahankan):
+    thread_id, comment, likes_count, is_reply, hash.
+    """
+    df = pd.DataFrame(raw_rows, columns=["text", "likes", "is_reply", "parent"])
+    if df.empty:
+        return pd.DataFrame(columns=["thread_id", "comment", "likes_count", "is_reply", "hash"])
+
+    # sama dengan clean_comment_text_preserve
+    comment = (pd.Series(df["text"].tolist(), dtype=object)
+               .str.replace(r"\s+", " ", regex=True).str.strip())
+    # teks likes hanya punya sedikit nilai unik ("", "12", "1.2K")
+    codes, uniques = pd.factorize(df["likes"], use_na_sentinel=False)
+    likes = pd.Series([parse_numeric_text(u) for u in uniques], dtype="int64").to_numpy()[codes]
+    hashes = [make_hash_id(t) for t in comment]
+
+    is_reply = df["is_reply"].astype(bool).to_numpy()
+    main_hash = pd.Series(hashes).where(~is_reply)
+    # thread_id = hash komentar utama dari thread yang sama
+    thread_id = main_hash.groupby(df["parent"].to_numpy()).transform("first")
+
+    return pd.DataFrame({
+        "thread_id": thread_id.to_numpy(),
+        "comment": comment.to_numpy(),
+        "likes_count": likes,
+        "is_reply": is_reply,
+        "hash": hashes,
+    })
+
+
+def main_comment_hashes(driver, start=0):
+    """Hash teks komentar utama thread ke-start dst. (None bila tidak terbaca), urut DOM."""
+    texts = driver.execute_script(MAIN_TEXTS_JS, start) or []
+    return [None if t is None else make_hash_id(clean_comment_text_preserve(t)) for t in texts]
+
+
+def extract_batch(driver, threads):
+    """Satu execute_script untuk seluruh batch -> DataFrame baris komentar."""
+    return parse_extracted(driver.execute_script(EXTRACT_THREADS_JS, threads) or [])
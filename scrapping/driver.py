@@ -1,12 +1,30 @@
 # scrapping/driver.py
 # GAP 2 — WebDriver creator
 
+import threading
+
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 
-def create_driver_visible(headless=False):
+# Path chromedriver di-resolve sekali per proses (ChromeDriverManager().install()
+# memeriksa versi lewat jaringan setiap kali dipanggil)
+_DRIVER_PATH = None
+_DRIVER_LOCK = threading.Lock()
+
+
+def resolve_driver_path():
+    """Path binary chromedriver (install/cek versi hanya pada panggilan pertama)."""
+    global _DRIVER_PATH
+    with _DRIVER_LOCK:
+        if _DRIVER_PATH is None:
+            _DRIVER_PATH = ChromeDriverManager().install()
+        return _DRIVER_PATH
+
+
+def create_driver_visible(headless=False, capture_network=False):
+    """capture_network=True: aktifkan performance log (dipakai mode capture jaringan)."""
     chrome_options = Options()
     if headless:
         chrome_options.add_argument("--headless=new")
@@ -23,6 +41,9 @@ def create_driver_visible(headless=False):
         "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36"
     )
 
-    service = Service(ChromeDriverManager().install())
+    if capture_network:
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+    service = Service(resolve_driver_path())
     driver = webdriver.Chrome(service=service, options=chrome_options)
     return driver
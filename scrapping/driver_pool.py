@@ -0,0 +1,102 @@
+# scrapping/driver_pool.py
+# Pool WebDriver terbatas yang dipakai ulang antar video (thread-safe)
+
+import queue
+import threading
+from contextlib import contextmanager
+
+from .driver import create_driver_visible, resolve_driver_path
+
+# Driver di-recycle (quit + buat baru) setelah sekian halaman video agar memori Chrome tidak menumpuk
+MAX_PAGES_PER_DRIVER = 5
+
+
+def create_driver_pool(size, headless=True, max_pages=MAX_PAGES_PER_DRIVER, capture_network=False):
+    """
+    Buat pool berisi `size` slot driver. Driver dibuat saat slot pertama kali dipakai,
+    sehingga pool yang lebih besar dari jumlah video tidak membuka browser sia-sia.
+    """
+    resolve_driver_path()
+    slots = queue.Queue()
+    for _ in range(size):
+        slots.put(None)
+    return {
+        "slots": slots,
+        "headless": headless,
+        "capture_network": capture_network,
+        "max_pages": max_pages,
+        "pages": {},
+        "lock": threading.Lock(),
+        "created": 0,
+        "recycled": 0,
+    }
+
+
+def _quit(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+def acquire_driver(pool):
+    """Ambil driver dari pool (menunggu bila semua sedang dipakai)."""
+    driver = pool["slots"].get()
+    if driver is None:
+        try:
+            driver = create_driver_visible(headless=pool["headless"], capture_network=pool["capture_network"])
+        except Exception:
+            # slot dikembalikan agar video lain tetap bisa mencoba membuat browser
+            pool["slots"].put(None)
+            raise
+        with pool["lock"]:
+            pool["pages"][id(driver)] = 0
+            pool["created"] += 1
+    return driver
+
+
+def release_driver(pool, driver, broken=False):
+    """
+    Kembalikan driver ke pool setelah satu halaman video.
+    Driver yang rusak atau sudah mencapai max_pages ditutup; slot-nya diisi ulang nanti.
+    """
+    with pool["lock"]:
+        pages = pool["pages"].get(id(driver), 0) + 1
+        recycle = broken or pages >= pool["max_pages"]
+        if recycle:
+            pool["pages"].pop(id(driver), None)
+            pool["recycled"] += 1
+        else:
+            pool["pages"][id(driver)] = pages
+
+    if recycle:
+        _quit(driver)
+        pool["slots"].put(None)
+    else:
+        pool["slots"].put(driver)
+
+
+@contextmanager
+def pooled_driver(pool):
+    """with pooled_driver(pool) as driver: ... — driver otomatis dikembalikan ke pool."""
+    driver = acquire_driver(pool)
+    broken = False
+    try:
+        yield driver
+    except Exception:
+        broken = True
+        raise
+    finally:
+        release_driver(pool, driver, broken=broken)
+
+
+def close_driver_pool(pool):
+    """Tutup semua driver yang masih ada di pool."""
+    while True:
+        try:
+            driver = pool["slots"].get_nowait()
+        except queue.Empty:
+            break
+        if driver is not None:
+            _quit(driver)
+    pool["pages"].clear()
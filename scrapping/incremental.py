@@ -0,0 +1,127 @@
+# scrapping/incremental.py
+# Scraping ulang inkremental: muat hash yang sudah ada, urutkan "Newest first",
+# berhenti di komentar lama, dan catat manifest per video.
+
+import os
+import csv
+import json
+from datetime import datetime
+
+from .utils import make_hash_id
+from .waits import pause
+
+# Berhenti scroll bila sekian komentar utama terakhir yang termuat sudah ada di file
+# (lebih dari 1 agar komentar lama yang di-pin di atas tidak menghentikan scroll)
+STOP_AFTER_KNOWN = 5
+
+_OPEN_SORT_MENU_JS = """
+const trigger = document.querySelector(
+  "ytd-comments-header-renderer #sort-menu #trigger, ytd-comments-header-renderer #sort-menu tp-yt-paper-button"
+);
+if (!trigger) return false;
+trigger.click();
+return true;
+"""
+
+_PICK_NEWEST_JS = """
+const items = [...document.querySelectorAll(
+  "ytd-comments-header-renderer #sort-menu tp-yt-paper-listbox a, ytd-comments-header-renderer #sort-menu tp-yt-paper-item"
+)];
+if (!items.length) return false;
+const item = items.find(i => /newest|terbaru/i.test(i.innerText)) || items[items.length - 1];
+item.click();
+return true;
+"""
+
+
+# ==========================================================
+# Manifest per video
+# ==========================================================
+def manifest_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ".manifest.json"
+
+
+def load_manifest(csv_path):
+    path = manifest_path(csv_path)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(csv_path, video_url, mode, new_rows, total_rows, incremental):
+    """Simpan waktu scrape terakhir dan ringkasan hasil (ditulis atomik)."""
+    old = load_manifest(csv_path) or {}
+    now = datetime.now().isoformat(timespec="seconds")
+    same_video = old.get("video_url") == video_url
+    manifest = {
+        "video_url": video_url,
+        "csv": os.path.basename(csv_path),
+        "first_scrape": old.get("first_scrape", now) if same_video else now,
+        "last_scrape": now,
+        "last_mode": mode,
+        "last_incremental": incremental,
+        "last_new_rows": new_rows,
+        "total_rows": total_rows,
+        "runs": (old.get("runs", 0) if same_video else 0) + 1,
+    }
+    path = manifest_path(csv_path)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+    return manifest
+
+
+def can_resume(csv_path, video_url):
+    """Mode inkremental hanya bila CSV ada dan manifest-nya milik video yang sama."""
+    if not os.path.exists(csv_path):
+        print("[INFO] Belum ada data untuk video ini, scraping penuh.")
+        return False
+    manifest = load_manifest(csv_path)
+    if manifest is None:
+        print(f"[WARN] {os.path.basename(csv_path)} belum punya manifest, scraping penuh (file ditimpa).")
+        return False
+    if manifest.get("video_url") != video_url:
+        print(f"[WARN] {os.path.basename(csv_path)} berisi video lain ({manifest.get('video_url')}), "
+              f"scraping penuh (file ditimpa).")
+        return False
+    print(f"[INFO] Scrape terakhir: {manifest.get('last_scrape')} ({manifest.get('total_rows')} komentar)")
+    return True
+
+
+# ==========================================================
+# Data lama
+# ==========================================================
+def load_existing_hashes(csv_path):
+    """
+    Hash semua komentar yang sudah ada di CSV (untuk dedup) dan hash komentar utama
+    (= thread_id baris is_reply False, untuk batas berhenti scroll).
+    """
+    processed_hash, known_main = set(), set()
+    with open(csv_path, newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            processed_hash.add(make_hash_id(row["comment"]))
+            if row["is_reply"] == "False":
+                known_main.add(row["thread_id"])
+    return processed_hash, known_main
+
+
+def reached_known(main_hashes, known_main, stop_after=STOP_AFTER_KNOWN):
+    """True bila `stop_after` komentar utama terakhir (urut tampil) semuanya sudah dikenal."""
+    tail = [h for h in main_hashes if h is not None][-stop_after:]
+    return len(tail) == stop_after and all(h in known_main for h in tail)
+
+
+# ==========================================================
+# Urutan komentar
+# ==========================================================
+def sort_newest_first(driver):
+    """Ganti urutan komentar ke "Newest first". Mengembalikan False bila menu tidak ditemukan."""
+    if not driver.execute_script(_OPEN_SORT_MENU_JS):
+        return False
+    pause("sort_menu")
+    if not driver.execute_script(_PICK_NEWEST_JS):
+        return False
+    pause("sort_reload")
+    return True
@@ -0,0 +1,311 @@
+# scrapping/network_capture.py
+# Capture komentar dari respons JSON youtubei/v1/next (lewat performance log Chrome DevTools)
+
+import json
+import re
+
+from .utils import parse_numeric_text, make_hash_id, clean_comment_text_preserve, unwrap_redirect
+from .incremental import reached_known
+from .waits import pause, settle, count_nodes
+
+NEXT_ENDPOINT = "/youtubei/v1/next"
+
+# Tombol "View replies" / "Show more replies" di dalam thread (diklik sekaligus lewat satu execute_script).
+# arguments[0] (opsional): list elemen thread; tanpa argumen = seluruh halaman.
+CLICK_REPLY_BUTTONS_JS = """
+const roots = arguments[0] || [document];
+const selector =
+  "#more-replies button, #more-replies-sub-thread button," +
+  "ytd-comment-replies-renderer ytd-continuation-item-renderer button";
+let clicked = 0;
+for (const root of roots) {
+  for (const b of root.querySelectorAll(selector)) {
+    if (b.offsetParent === null || b.disabled || b.dataset.scraperClicked) continue;
+    if (!b.closest("ytd-comment-thread-renderer")) continue;
+    b.dataset.scraperClicked = "1";
+    b.click();
+    clicked++;
+  }
+}
+return clicked;
+"""
+
+CAPTURE_STABLE_CHECKS = 5
+CAPTURE_MAX_ROUNDS = 2000
+# request /next yang tidak selesai dalam sekian putaran drain dianggap gagal
+PENDING_MAX_ROUNDS = 30
+
+
+# ==========================================================
+# Performance log -> body respons
+# ==========================================================
+def new_capture_state():
+    """
+    State capture per driver: request /next yang sudah terlihat tapi belum selesai dimuat
+    (request_id -> putaran saat terlihat) dan jumlah respons yang gagal dibaca.
+    """
+    return {"pending": {}, "seen": set(), "round": 0, "failed": 0}
+
+
+def discard_logs(driver):
+    """Buang performance log lama (mis. dari halaman sebelumnya)."""
+    try:
+        driver.get_log("performance")
+    except Exception:
+        pass
+
+
+def drain_next_responses(driver, state):
+    """
+    Baca performance log dan kembalikan body JSON semua respons /next yang sudah selesai.
+    Body diambil segera lewat Network.getResponseBody (buffer Chrome terbatas).
+    Request yang gagal (Network.loadingFailed), tidak selesai dalam PENDING_MAX_ROUNDS
+    putaran, atau body-nya tidak bisa dibaca dihitung di state["failed"].
+    """
+    state["round"] += 1
+    finished = []
+    for entry in driver.get_log("performance"):
+        try:
+            msg = json.loads(entry["message"])["message"]
+        except Exception:
+            continue
+        method = msg.get("method")
+        params = msg.get("params", {})
+        request_id = params.get("requestId")
+        if method == "Network.responseReceived":
+            if NEXT_ENDPOINT in params.get("response", {}).get("url", "") and request_id not in state["seen"]:
+                state["pending"][request_id] = state["round"]
+        elif method == "Network.loadingFinished" and request_id in state["pending"]:
+            finished.append(request_id)
+        elif method == "Network.loadingFailed" and request_id in state["pending"]:
+            state["pending"].pop(request_id)
+            state["seen"].add(request_id)
+            state["failed"] += 1
+
+    expired = [r for r, seen_round in state["pending"].items() if state["round"] - seen_round >= PENDING_MAX_ROUNDS]
+    for request_id in expired:
+        state["pending"].pop(request_id)
+        state["seen"].add(request_id)
+        state["failed"] += 1
+
+    bodies = []
+    for request_id in finished:
+        state["pending"].pop(request_id, None)
+        state["seen"].add(request_id)
+        try:
+            body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+            bodies.append(json.loads(body["body"]))
+        except Exception:
+            state["failed"] += 1
+    return bodies
+
+
+# ==========================================================
+# JSON -> record komentar
+# ==========================================================
+def _link_text(text, url):
+    """Tampilan link mengikuti extract_comment_richtext (versi DOM)."""
+    if url.startswith("/@"):
+        return text
+    if url.startswith("/watch") or url.startswith("/channel"):
+        full = "https://www.youtube.com" + url
+        return f"{text} ({full})" if text else full
+    if url.startswith("http"):
+        return f"{text} ({url})" if text else url
+    return text
+
+
+def _join_segments(segments):
+    """Gabung segmen seperti BeautifulSoup get_text(" ", strip=True) + rapikan spasi."""
+    text = " ".join(s.strip() for s in segments if s and s.strip())
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _command_url(command):
+    meta = command.get("commandMetadata", {}).get("webCommandMetadata", {})
+    url = meta.get("url") or command.get("urlEndpoint", {}).get("url", "")
+    return unwrap_redirect(url)
+
+
+def _entity_text(content):
+    """Teks commentEntityPayload.properties.content (link di commandRuns diperluas)."""
+    # startIndex/length dihitung dalam unit UTF-16 (string JavaScript), bukan codepoint Python
+    raw = content.get("content", "").encode("utf-16-le")
+
+    def piece(a, b=None):
+        return raw[2 * a:None if b is None else 2 * b].decode("utf-16-le", errors="ignore")
+
+    runs = sorted(content.get("commandRuns", []), key=lambda r: r.get("startIndex", 0))
+    segments, pos = [], 0
+    for run in runs:
+        start, length = run.get("startIndex", 0), run.get("length", 0)
+        command = run.get("onTap", {}).get("innertubeCommand", {})
+        url = _command_url(command)
+        if start < pos or not url:
+            continue
+        segments.append(piece(pos, start))
+        segments.append(_link_text(piece(start, start + length).strip(), url))
+        pos = start + length
+    segments.append(piece(pos))
+    return _join_segments(segments)
+
+
+def _runs_text(runs):
+    """Teks contentText.runs (format commentRenderer lama)."""
+    segments = []
+    for run in runs:
+        endpoint = run.get("navigationEndpoint")
+        if endpoint:
+            segments.append(_link_text(run.get("text", "").strip(), _command_url(endpoint)))
+        else:
+            segments.append(run.get("text", ""))
+    return _join_segments(segments)
+
+
+def _walk(obj, key):
+    """Cari semua nilai dengan nama `key` di JSON bersarang (urutan dokumen)."""
+    stack = [obj]
+    while stack:
+        cur = stack.pop()
+        if isinstance(cur, dict):
+            if key in cur:
+                yield cur[key]
+            stack.extend(reversed(list(cur.values())))
+        elif isinstance(cur, list):
+            stack.extend(reversed(cur))
+
+
+def _record(comment_id, text, likes_text, reply_level=None):
+    is_reply = "." in comment_id if reply_level is None else reply_level > 0
+    return {
+        "comment_id": comment_id,
+        "parent_id": comment_id.split(".")[0] if is_reply else None,
+        "comment": clean_comment_text_preserve(text),
+        "likes_count": parse_numeric_text(likes_text),
+        "is_reply": is_reply,
+    }
+
+
+def parse_next_response(body):
+    """
+    Ambil komentar dari satu respons /next.
+    Mendukung format entity (frameworkUpdates.entityBatchUpdate) dan commentRenderer lama.
+    Mengembalikan list dict: comment_id, parent_id, comment, likes_count, is_reply.
+    """
+    records = []
+    for mutations in _walk(body.get("frameworkUpdates", {}), "mutations"):
+        for m in mutations:
+            payload = m.get("payload", {}).get("commentEntityPayload")
+            if not payload:
+                continue
+            props = payload.get("properties", {})
+            comment_id = props.get("commentId")
+            if not comment_id:
+                continue
+            toolbar = payload.get("toolbar", {})
+            records.append(_record(
+                comment_id,
+                _entity_text(props.get("content", {})),
+                toolbar.get("likeCountNotliked", ""),
+                reply_level=props.get("replyLevel"),
+            ))
+
+    for renderer in _walk(body.get("onResponseReceivedEndpoints", []), "commentRenderer"):
+        comment_id = renderer.get("commentId")
+        if not comment_id:
+            continue
+        records.append(_record(
+            comment_id,
+            _runs_text(renderer.get("contentText", {}).get("runs", [])),
+            renderer.get("voteCount", {}).get("simpleText", ""),
+        ))
+    return records
+
+
+# ==========================================================
+# Capture penuh satu video
+# ==========================================================
+def capture_comments(driver, progress=None, stable_checks=CAPTURE_STABLE_CHECKS, max_rounds=CAPTURE_MAX_ROUNDS,
+                     known_main=None):
+    """
+    Scroll halaman dan klik semua tombol balasan (satu execute_script per putaran),
+    sambil merekam respons /next. Berhenti bila beberapa putaran tidak ada thread,
+    klik, atau respons baru.
+    known_main (mode inkremental): scroll dihentikan begitu komentar utama terakhir yang
+    terekam sudah ada di data lama; balasan thread yang sudah termuat tetap dibuka.
+    Mengembalikan dict comment_id -> record (urutan kedatangan).
+    """
+    state = new_capture_state()
+    comments = {}
+    main_hashes = []
+    stable = 0
+    last_threads = -1
+    scrolling = True
+
+    for _ in range(max_rounds):
+        if scrolling:
+            driver.execute_script("window.scrollTo(0, document.documentElement.scrollHeight);")
+            threads = settle(driver, "capture_scroll", "ytd-comment-thread-renderer", last_threads)
+        else:
+            threads = last_threads
+        clicked = driver.execute_script(CLICK_REPLY_BUTTONS_JS) or 0
+        if clicked:
+            settle(driver, "capture_click", "ytd-comment-view-model", count_nodes(driver, "ytd-comment-view-model"))
+        elif not scrolling:
+            pause("idle")
+
+        new_records = 0
+        for body in drain_next_responses(driver, state):
+            for rec in parse_next_response(body):
+                if rec["comment_id"] not in comments:
+                    comments[rec["comment_id"]] = rec
+                    new_records += 1
+                    if not rec["is_reply"]:
+                        main_hashes.append(make_hash_id(rec["comment"]))
+
+        if threads == last_threads and not clicked and not new_records and not state["pending"]:
+            stable += 1
+        else:
+            stable = 0
+            last_threads = threads
+        if progress is not None and new_records:
+            progress(len(comments))
+        if stable >= stable_checks:
+            break
+        if scrolling and known_main is not None and new_records and reached_known(main_hashes, known_main):
+            print(f"[INFO] Komentar lama tercapai setelah {len(main_hashes)} komentar utama, scroll dihentikan.")
+            scrolling = False
+
+    if state["failed"]:
+        print(f"[WARN] {state['failed']} respons /next gagal dimuat/dibaca; komentar di dalamnya tidak terekam.")
+    return comments
+
+
+def order_thread_rows(comments):
+    """
+    Susun record capture menjadi baris CSV: komentar utama diikuti balasannya,
+    thread_id = hash teks komentar utama (sama seperti mode DOM).
+    Mengembalikan (rows, orphan_replies).
+    """
+    mains, replies = [], {}
+    for rec in comments.values():
+        if rec["is_reply"]:
+            replies.setdefault(rec["parent_id"], []).append(rec)
+        else:
+            mains.append(rec)
+
+    rows, orphans = [], 0
+    main_ids = {rec["comment_id"] for rec in mains}
+    for parent_id, recs in replies.items():
+        if parent_id not in main_ids:
+            orphans += len(recs)
+
+    for main in mains:
+        thread_id = make_hash_id(main["comment"])
+        rows.append({"thread_id": thread_id, "comment": main["comment"],
+                     "likes_count": main["likes_count"], "is_reply": False, "hash": thread_id})
+        for r in replies.get(main["comment_id"], []):
+            rows.append({"thread_id": thread_id, "comment": r["comment"],
+                         "likes_count": r["likes_count"], "is_reply": True,
+                         "hash": make_hash_id(r["comment"])})
+    return rows, orphans
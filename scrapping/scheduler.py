@@ -0,0 +1,76 @@
+# scrapping/scheduler.py
+# Scheduler scraping multi-video: beberapa video berjalan bersamaan di pool driver
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .driver_pool import create_driver_pool, pooled_driver, close_driver_pool, MAX_PAGES_PER_DRIVER
+from .scraper import scrape_all_comments_batched, BATCH_SIZE
+
+
+def _make_progress(state, idx, n_videos):
+    """Callback progres per video yang mencetak total gabungan semua video."""
+    def report(scraped_total, done=False):
+        with state["lock"]:
+            state["scraped"][idx] = scraped_total
+            if done:
+                state["done"] += 1
+            total = sum(state["scraped"].values())
+            elapsed = time.time() - state["start"]
+            print(f"[PROGRESS] Video selesai {state['done']}/{n_videos} | "
+                  f"komentar terkumpul: {total} | {total / max(elapsed, 1e-9):.1f} komentar/detik")
+    return report
+
+
+def _scrape_one(pool, idx, url, batch_size, save_prefix, mode, incremental, report):
+    with pooled_driver(pool) as driver:
+        csv_path, scraped, displayed = scrape_all_comments_batched(
+            driver, url, batch_size=batch_size, save_prefix=f"{save_prefix}_{idx}", progress=report, mode=mode,
+            incremental=incremental,
+        )
+    report(scraped, done=True)
+    return {"idx": idx, "url": url, "csv_path": csv_path, "scraped": scraped, "displayed": displayed, "error": None}
+
+
+def scrape_videos_parallel(video_urls, num_browsers=3, headless=True, batch_size=BATCH_SIZE,
+                           max_pages_per_driver=MAX_PAGES_PER_DRIVER, save_prefix="dataset_video", mode="dom",
+                           incremental=False):
+    """
+    Scrape beberapa video sekaligus dengan maksimal `num_browsers` browser aktif.
+    Video ke-i disimpan sebagai {save_prefix}_{i}.csv (sama seperti mode sekuensial).
+    Mengembalikan list hasil per video, urut sesuai input.
+    """
+    num_browsers = max(1, min(num_browsers, len(video_urls)))
+    pool = create_driver_pool(num_browsers, headless=headless, max_pages=max_pages_per_driver,
+                              capture_network=mode == "network")
+    state = {"lock": threading.Lock(), "scraped": {}, "done": 0, "start": time.time()}
+
+    print(f"[INFO] Scraping {len(video_urls)} video dengan {num_browsers} browser paralel "
+          f"(recycle setiap {max_pages_per_driver} video)")
+
+    results = {}
+    try:
+        with ThreadPoolExecutor(max_workers=num_browsers) as executor:
+            futures = {
+                executor.submit(
+                    _scrape_one, pool, idx, url, batch_size, save_prefix, mode, incremental,
+                    _make_progress(state, idx, len(video_urls))
+                ): (idx, url)
+                for idx, url in enumerate(video_urls, start=1)
+            }
+            for fut in as_completed(futures):
+                idx, url = futures[fut]
+                try:
+                    results[idx] = fut.result()
+                except Exception as e:
+                    print(f"[ERROR] Video #{idx} gagal di-scrape: {e}")
+                    results[idx] = {"idx": idx, "url": url, "csv_path": None, "scraped": 0,
+                                    "displayed": None, "error": str(e)}
+    finally:
+        close_driver_pool(pool)
+
+    elapsed = time.time() - state["start"]
+    print(f"[TIME] Total durasi scraping: {elapsed:.1f} detik "
+          f"({pool['created']} browser dibuat, {pool['recycled']} di-recycle)")
+    return [results[i] for i in sorted(results)]
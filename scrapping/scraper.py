@@ -1,6 +1,5 @@
 import os
 import time
-import random
 import csv
 import re
 from tqdm import tqdm
@@ -12,15 +11,21 @@ from .utils import extract_comment_richtext
 
 from .driver import create_driver_visible
 from .utils import parse_numeric_text, make_hash_id, clean_comment_text_preserve
+from .network_capture import discard_logs, capture_comments, order_thread_rows
+from .bulk_extract import expand_batch_replies, extract_batch, main_comment_hashes
+from .incremental import can_resume, load_existing_hashes, reached_known, sort_newest_first, save_manifest
+from .waits import pause, settle, wait_for_growth
 
 # ==========================================================
 # Config
 # ==========================================================
 BATCH_SIZE = 10
 INITIAL_SCROLLS = (400, 800, 1200)
-SCROLL_PAUSE = (0.5, 1.0)
 MAX_GLOBAL_SCROLLS = 300
 STABLE_CHECKS = 5
+# "network": rekam JSON youtubei/v1/next (fallback ke DOM bila gagal)
+# "bulk": baca DOM satu execute_script per batch thread; "dom": baca elemen satu per satu
+CAPTURE_MODES = ("network", "bulk", "dom")
 DATASET_DIR = os.path.join(os.path.dirname(__file__), "dataset")
 os.makedirs(DATASET_DIR, exist_ok=True)
 
@@ -62,7 +67,7 @@ def _scroll_until_comments_area(driver, max_tries=20):
     # --- Fase 1: pastikan modul komentar sudah dimuat ---
     for i in range(max_tries):
         driver.execute_script("window.scrollBy(0, 400);")
-        time.sleep(0.9 + random.random() * 0.4)
+        pause("area_scroll")
         try:
             comments_area = driver.find_element(By.TAG_NAME, "ytd-comments")
             if comments_area.is_displayed():
@@ -80,7 +85,7 @@ def _scroll_until_comments_area(driver, max_tries=20):
     print("[INFO] Scroll tambahan untuk memastikan header komentar terlihat...")
     for j in range(8):
         driver.execute_script("window.scrollBy(0, 300);")
-        time.sleep(0.8 + random.random() * 0.3)
+        pause("header_scroll")
         try:
             header_el = driver.find_element(
                 By.XPATH, "//ytd-comments-header-renderer//h2[@id='count']"
@@ -140,15 +145,32 @@ def _wait_for_comment_count(driver, timeout=25):
     return None
 
 
-def _continuous_scroll_until_stable(driver, max_scrolls=MAX_GLOBAL_SCROLLS, stable_checks=STABLE_CHECKS):
-    """Scroll sampai tidak ada thread baru yang termuat."""
+def _open_csv_writer(csv_path, append=False):
+    """append=True: lanjutkan file lama (mode inkremental) tanpa menulis header lagi."""
+    f = open(csv_path, "a" if append else "w", newline="", encoding="utf-8-sig")
+    writer = csv.DictWriter(f, fieldnames=["thread_id", "comment", "likes_count", "is_reply"], quoting=csv.QUOTE_MINIMAL)
+    if not append:
+        writer.writeheader()
+    return f, writer
+
+
+def _continuous_scroll_until_stable(driver, max_scrolls=MAX_GLOBAL_SCROLLS, stable_checks=STABLE_CHECKS, known_main=None):
+    """
+    Scroll sampai tidak ada thread baru yang termuat.
+    known_main (mode inkremental, urutan "Newest first"): berhenti begitu thread
+    terakhir yang termuat sudah ada di data lama.
+    """
     last_count = 0
     stable = 0
+    main_hashes = []
     for _ in range(max_scrolls):
         driver.execute_script("window.scrollTo(0, document.documentElement.scrollHeight);")
-        time.sleep(random.uniform(*SCROLL_PAUSE))
-        threads_now = driver.find_elements(By.XPATH, "//ytd-comment-thread-renderer")
-        cur = len(threads_now)
+        cur = settle(driver, "scroll", "ytd-comment-thread-renderer", last_count)
+        if known_main is not None and cur > len(main_hashes):
+            main_hashes += main_comment_hashes(driver, start=len(main_hashes))
+            if reached_known(main_hashes, known_main):
+                print(f"[INFO] Komentar lama tercapai setelah {cur} thread, scroll dihentikan.")
+                return cur
         if cur == last_count:
             stable += 1
         else:
@@ -176,12 +198,7 @@ def expand_replies_recursive_v2(thread, driver, csv_writer, processed_hash, thre
 
     def wait_new_replies(old_count, timeout=6):
         """Tunggu hingga jumlah reply bertambah, atau timeout."""
-        for _ in range(int(timeout * 2)):  # per 0.5 detik
-            cur = len(thread.find_elements(By.XPATH, ".//ytd-comment-view-model"))
-            if cur > old_count:
-                return cur
-            time.sleep(0.5)
-        return old_count
+        return wait_for_growth(driver, "ytd-comment-view-model", old_count, timeout, root=thread, name="new_replies")
 
     while True:
         if time.time() - start_time > max_time_per_thread:
@@ -209,19 +226,19 @@ def expand_replies_recursive_v2(thread, driver, csv_writer, processed_hash, thre
         for btn in buttons:
             try:
                 driver.execute_script("arguments[0].scrollIntoView({block:'center'});", btn)
-                time.sleep(random.uniform(0.25, 0.45))
+                pause("before_click")
                 safe_click(driver, btn)
                 any_clicked = True
                 print(f"[DEBUG] Klik tombol 'Show more replies' di depth={nested_level}...")
 
                 prev_reply_count = wait_new_replies(prev_reply_count, timeout=8)
-                time.sleep(random.uniform(0.4, 0.8))
+                pause("after_click")
             except Exception:
                 continue
 
         # Jika tidak ada klik tapi tombol masih ada, beri kesempatan terakhir
         if not any_clicked:
-            time.sleep(random.uniform(0.7, 1.0))
+            pause("idle")
 
         # Stop bila tidak ada balasan baru >10 detik
         cur_count = len(thread.find_elements(By.XPATH, ".//ytd-comment-view-model"))
@@ -241,7 +258,7 @@ def expand_replies_recursive_v2(thread, driver, csv_writer, processed_hash, thre
             try:
                 for btn in r.find_elements(By.XPATH, ".//tp-yt-paper-button[@id='more']"):
                     safe_click(driver, btn)
-                    time.sleep(0.05)
+                    pause("read_more")
 
                 r_element = r.find_element(By.ID, "content-text")
                 r_text = clean_comment_text_preserve(extract_comment_richtext(r_element))
@@ -275,12 +292,12 @@ def expand_replies_recursive_v2(thread, driver, csv_writer, processed_hash, thre
 def process_thread_fully(thread, driver, csv_writer, processed_hash):
     """Proses satu komentar utama + semua balasannya (depth-first)."""
     driver.execute_script("arguments[0].scrollIntoView({block:'center'});", thread)
-    time.sleep(0.15)
+    pause("thread_focus")
 
     # Buka “Read more” pada komentar utama
     for btn in thread.find_elements(By.XPATH, ".//tp-yt-paper-button[@id='more']"):
         safe_click(driver, btn)
-        time.sleep(0.05)
+        pause("read_more")
 
     # Ambil komentar utama
     try:
@@ -309,28 +326,44 @@ def process_thread_fully(thread, driver, csv_writer, processed_hash):
     first_buttons = thread.find_elements(By.XPATH, ".//ytd-button-renderer[@id='more-replies']")
     for btn in first_buttons:
         safe_click(driver, btn)
-        time.sleep(0.25)
+        pause("first_replies")
 
     # Jalankan recursive expansion untuk memastikan semua balasan habis
-    time.sleep(0.3)
+    pause("before_expand")
     expand_replies_recursive_v2(thread, driver, csv_writer, processed_hash, thread_id=cid, depth=1)
 
 
 # ==========================================================
 # Batch-level scraping
 # ==========================================================
-def scrape_in_batches(driver, batch_size, csv_path):
-    """Scrape komentar dalam batch dengan progress bar."""
+def _write_bulk_batch(driver, batch_threads, writer, processed_hash):
+    """Buka balasan lalu ekstrak seluruh batch dengan satu execute_script."""
+    expand_batch_replies(driver, batch_threads)
+    rows = extract_batch(driver, batch_threads)
+    for thread_id, comment, likes, is_reply, h in rows.itertuples(index=False, name=None):
+        if h in processed_hash:
+            continue
+        writer.writerow({"thread_id": thread_id, "comment": comment, "likes_count": likes, "is_reply": is_reply})
+        processed_hash.add(h)
+
+
+def scrape_in_batches(driver, batch_size, csv_path, progress=None, bulk=False, processed_hash=None):
+    """
+    Scrape komentar dalam batch dengan progress bar.
+    progress(scraped_total): callback setelah tiap batch (mode paralel; progress bar per batch dimatikan).
+    bulk=True: tiap batch dibaca dengan satu execute_script (bulk_extract), bukan per elemen.
+    processed_hash (mode inkremental): hash komentar yang sudah ada; hanya komentar baru
+    yang ditambahkan ke akhir file.
+    """
     threads = driver.find_elements(By.XPATH, "//ytd-comment-thread-renderer")
     total_threads = len(threads)
     n_batches = (total_threads + batch_size - 1) // batch_size
 
-    f = open(csv_path, "w", newline="", encoding="utf-8-sig")
-    writer = csv.DictWriter(f, fieldnames=["thread_id", "comment", "likes_count", "is_reply"], quoting=csv.QUOTE_MINIMAL)
-    writer.writeheader()
+    append = processed_hash is not None
+    f, writer = _open_csv_writer(csv_path, append=append)
 
-    processed_hash = set()
-    scraped_total = 0
+    processed_hash = processed_hash if append else set()
+    scraped_total = len(processed_hash)
 
     for batch_index in range(n_batches):
         start = batch_index * batch_size
@@ -340,31 +373,92 @@ def scrape_in_batches(driver, batch_size, csv_path):
         print(f"\n[BATCH {batch_index+1}/{n_batches}] Memproses {len(batch_threads)} komentar utama...")
         start_time = time.time()
 
-        for thr in tqdm(batch_threads, desc=f" Batch {batch_index+1}/{n_batches}", ncols=80):
+        if bulk:
             try:
-                process_thread_fully(thr, driver, writer, processed_hash)
-            except Exception:
-                continue
-            time.sleep(0.07 + random.random() * 0.05)
+                _write_bulk_batch(driver, batch_threads, writer, processed_hash)
+            except Exception as e:
+                print(f"[ERROR] Gagal mengekstrak batch {batch_index+1}: {e}")
+        else:
+            for thr in tqdm(batch_threads, desc=f" Batch {batch_index+1}/{n_batches}", ncols=80,
+                            disable=progress is not None):
+                try:
+                    process_thread_fully(thr, driver, writer, processed_hash)
+                except Exception:
+                    continue
+                pause("between_threads")
 
         elapsed = time.time() - start_time
         scraped_total = len(processed_hash)
         print(f"[TIME] Durasi batch {batch_index+1}: {elapsed:.1f} detik")
         print(f"[DONE] Batch {batch_index+1}/{n_batches} selesai. Total komentar unik: {scraped_total}")
         print("-" * 70)
+        if progress is not None:
+            progress(scraped_total)
 
     f.close()
     return scraped_total
 
 
+# ==========================================================
+# Network capture
+# ==========================================================
+def scrape_network(driver, csv_path, progress=None, processed_hash=None, known_main=None):
+    """
+    Ambil komentar dari respons /next yang direkam (tanpa membaca DOM per komentar).
+    Format CSV dan deduplikasi hash sama dengan scrape_in_batches (termasuk mode inkremental).
+    Mengembalikan jumlah komentar unik, atau None bila tidak ada yang terekam.
+    """
+    start_time = time.time()
+    try:
+        comments = capture_comments(driver, progress=progress, known_main=known_main)
+    except Exception as e:
+        print(f"[WARN] Capture jaringan gagal: {e}")
+        return None
+    if not comments:
+        return None
+
+    rows, orphans = order_thread_rows(comments)
+    append = processed_hash is not None
+    f, writer = _open_csv_writer(csv_path, append=append)
+    processed_hash = processed_hash if append else set()
+    for row in rows:
+        if row["hash"] in processed_hash:
+            continue
+        writer.writerow({k: row[k] for k in ("thread_id", "comment", "likes_count", "is_reply")})
+        processed_hash.add(row["hash"])
+    f.close()
+
+    if orphans:
+        print(f"[WARN] {orphans} balasan dilewati (komentar utamanya tidak terekam).")
+    print(f"[TIME] Durasi capture jaringan: {time.time() - start_time:.1f} detik")
+    print(f"[DONE] Capture jaringan selesai. Total komentar unik: {len(processed_hash)}")
+    return len(processed_hash)
+
+
 # ==========================================================
 # Entry point
 # ==========================================================
-def scrape_all_comments_batched(driver, video_url, batch_size=BATCH_SIZE, save_prefix="dataset_video"):
-    """Main entry point untuk scraping 1 video YouTube."""
+def scrape_all_comments_batched(driver, video_url, batch_size=BATCH_SIZE, save_prefix="dataset_video", progress=None,
+                                mode="dom", incremental=False):
+    """
+    Main entry point untuk scraping 1 video YouTube.
+    mode: salah satu CAPTURE_MODES. mode="network" butuh driver dengan capture_network=True;
+    bila tidak ada respons yang terekam, otomatis kembali ke mode DOM.
+    incremental=True: bila file video ini sudah ada (manifest cocok), komentar diurutkan
+    "Newest first", scroll berhenti di komentar lama, dan hanya komentar/balasan baru
+    yang ditambahkan. Balasan baru pada thread lama di bawah batas itu tidak terambil.
+    """
     csv_path = os.path.join(DATASET_DIR, f"{save_prefix}.csv")
 
     print(f"\n[START] Scraping video: {video_url}")
+    processed_hash, known_main = None, None
+    if incremental and can_resume(csv_path, video_url):
+        processed_hash, known_main = load_existing_hashes(csv_path)
+        print(f"[INFO] Mode inkremental: {len(processed_hash)} komentar sudah ada.")
+    existing_rows = len(processed_hash) if processed_hash is not None else 0
+
+    if mode == "network":
+        discard_logs(driver)
     driver.get(video_url)
 
     # ✅ Tunggu video utama termuat
@@ -386,14 +480,36 @@ def scrape_all_comments_batched(driver, video_url, batch_size=BATCH_SIZE, save_p
         print("[INFO] Komentar pertama muncul.")
     except Exception:
         print("[ERROR] Tidak ada komentar muncul (timeout).")
-        return csv_path, 0, displayed_total
+        return csv_path, existing_rows, displayed_total
 
-    # ✅ Scroll sampai semua thread dimuat
-    total_threads = _continuous_scroll_until_stable(driver)
-    print(f"[INFO] Jumlah thread komentar termuat: {total_threads}")
-
-    # ✅ Jalankan batching
-    scraped_total = scrape_in_batches(driver, batch_size, csv_path)
+    if known_main is not None:
+        if mode == "network":
+            discard_logs(driver)  # respons urutan "Top comments" tidak dipakai
+        if sort_newest_first(driver):
+            print("[INFO] Komentar diurutkan: Newest first.")
+        else:
+            print("[WARN] Menu urutan komentar tidak ditemukan, scroll sampai habis.")
+
+    scraped_total = None
+    if mode == "network":
+        scraped_total = scrape_network(driver, csv_path, progress=progress,
+                                       processed_hash=processed_hash, known_main=known_main)
+        if scraped_total is None:
+            print("[WARN] Tidak ada respons komentar yang terekam, kembali ke mode DOM.")
+
+    if scraped_total is None:
+        # ✅ Scroll sampai semua thread dimuat
+        total_threads = _continuous_scroll_until_stable(driver, known_main=known_main)
+        print(f"[INFO] Jumlah thread komentar termuat: {total_threads}")
+
+        # ✅ Jalankan batching
+        scraped_total = scrape_in_batches(driver, batch_size, csv_path, progress=progress, bulk=mode == "bulk",
+                                          processed_hash=processed_hash)
+
+    save_manifest(csv_path, video_url, mode, scraped_total - existing_rows, scraped_total,
+                  incremental=known_main is not None)
+    if known_main is not None:
+        print(f"[SUMMARY] Komentar baru ditambahkan: {scraped_total - existing_rows}")
 
     print(f"\n[SUMMARY] Komentar di YouTube: {displayed_total if displayed_total else 'Tidak terbaca'}")
     print(f"[SUMMARY] Komentar berhasil di-scrape: {scraped_total}")
@@ -2,6 +2,7 @@
 # GAP 1 — Imports & Helper Functions
 
 import re, hashlib
+from urllib.parse import urlparse, parse_qs
 from bs4 import BeautifulSoup
 
 
@@ -51,6 +52,18 @@ def clean_comment_text_preserve(text):
     return s
 
 
+def unwrap_redirect(href):
+    """
+    Link eksternal di komentar dibungkus YouTube (/redirect?...&q=<url>, token berubah
+    tiap sesi) → kembalikan URL tujuan sebenarnya agar teks & hash komentar stabil.
+    """
+    if "/redirect?" in href:
+        target = parse_qs(urlparse(href).query).get("q")
+        if target:
+            return target[0]
+    return href
+
+
 def extract_comment_richtext(element):
     """
     Mengambil isi komentar YouTube dengan:
@@ -71,7 +84,7 @@ def extract_comment_richtext(element):
 
         # Ganti semua link <a href="...">
         for a in soup.find_all("a"):
-            href = a.get("href", "")
+            href = unwrap_redirect(a.get("href", ""))
             text = a.get_text(" ", strip=True)
 
             # 1️⃣ Jika mention akun (/@username) → tampilkan teks saja
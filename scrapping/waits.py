@@ -0,0 +1,196 @@
+# scrapping/waits.py
+# Jeda scraper: profil "adaptive" (MutationObserver, selesai begitu node baru muncul)
+# atau "conservative" (jeda tetap seperti versi lama), plus histogram waktu tunggu.
+
+import time
+import random
+import threading
+
+# Nilai: angka = jeda tetap, tuple = random.uniform(a, b)
+PROFILES = {
+    "conservative": {
+        "adaptive": False,
+        "area_scroll": (0.9, 1.3),
+        "header_scroll": (0.8, 1.1),
+        "scroll": (0.5, 1.0),
+        "thread_focus": 0.15,
+        "read_more": 0.05,
+        "first_replies": 0.25,
+        "before_expand": 0.3,
+        "before_click": (0.25, 0.45),
+        "after_click": (0.4, 0.8),
+        "idle": (0.7, 1.0),
+        "between_threads": (0.07, 0.12),
+        "capture_scroll": (0.6, 1.0),
+        "capture_click": (0.6, 1.0),
+        "bulk_click": (0.4, 0.8),
+        "sort_menu": (0.8, 1.2),
+        "sort_reload": (2.0, 2.5),
+        "poll": 0.5,
+    },
+    "adaptive": {
+        "adaptive": True,
+        "area_scroll": (0.25, 0.4),
+        "header_scroll": (0.2, 0.3),
+        # batas tunggu MutationObserver (detik) untuk langkah yang menunggu node baru
+        "scroll": 1.5,
+        "thread_focus": 0.0,
+        "read_more": 0.0,
+        "first_replies": 0.0,
+        "before_expand": 0.0,
+        "before_click": 0.0,
+        "after_click": 0.0,
+        "idle": (0.1, 0.2),
+        "between_threads": 0.0,
+        "capture_scroll": 1.0,
+        "capture_click": 2.0,
+        "bulk_click": 2.0,
+        "sort_menu": (0.3, 0.5),
+        "sort_reload": (1.0, 1.5),
+        "poll": 0.5,
+    },
+}
+DEFAULT_PROFILE = "adaptive"
+
+# Bucket histogram (detik)
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0)
+
+_profile = PROFILES[DEFAULT_PROFILE]
+_timings = {}
+_LOCK = threading.Lock()
+
+# arguments: roots (list elemen / null = document), selector, old_count, timeout_ms, callback
+_WAIT_FOR_GROWTH_JS = """
+const [roots, selector, oldCount, timeoutMs] = arguments;
+const done = arguments[arguments.length - 1];
+const scopes = roots || [document];
+const count = () => scopes.reduce((n, r) => n + r.querySelectorAll(selector).length, 0);
+let c = count();
+if (c > oldCount) return done(c);
+let timer = null;
+const obs = new MutationObserver(() => {
+  c = count();
+  if (c > oldCount) { obs.disconnect(); clearTimeout(timer); done(c); }
+});
+obs.observe(document.body, {childList: true, subtree: true});
+timer = setTimeout(() => { obs.disconnect(); done(count()); }, timeoutMs);
+"""
+
+_COUNT_JS = """
+const [roots, selector] = arguments;
+return (roots || [document]).reduce((n, r) => n + r.querySelectorAll(selector).length, 0);
+"""
+
+
+def set_wait_profile(name):
+    """Pilih profil jeda ("adaptive" / "conservative") untuk semua scraper di proses ini."""
+    global _profile
+    if name not in PROFILES:
+        raise ValueError(f"Profil jeda tidak dikenal: {name} (pilihan: {', '.join(PROFILES)})")
+    _profile = PROFILES[name]
+
+
+def _record(name, seconds):
+    with _LOCK:
+        _timings.setdefault(name, []).append(seconds)
+
+
+def pause(name):
+    """Jeda tetap sesuai profil aktif (dicatat ke histogram)."""
+    value = _profile[name]
+    seconds = random.uniform(*value) if isinstance(value, tuple) else value
+    if seconds > 0:
+        time.sleep(seconds)
+    _record(name, seconds)
+
+
+def _as_roots(root):
+    if root is None:
+        return None
+    return root if isinstance(root, (list, tuple)) else [root]
+
+
+def count_nodes(driver, selector, root=None):
+    return driver.execute_script(_COUNT_JS, _as_roots(root), selector)
+
+
+def wait_for_growth(driver, selector, old_count, timeout, root=None, name="growth"):
+    """
+    Tunggu sampai jumlah node `selector` (di dalam root) > old_count, atau timeout.
+    Adaptive: MutationObserver di browser (satu perintah WebDriver).
+    Conservative: polling setiap profile["poll"] detik seperti versi lama.
+    Mengembalikan jumlah node terakhir.
+    """
+    start = time.time()
+    roots = _as_roots(root)
+    try:
+        if _profile["adaptive"]:
+            cur = driver.execute_async_script(_WAIT_FOR_GROWTH_JS, roots, selector, old_count, int(timeout * 1000))
+        else:
+            cur = old_count
+            for _ in range(int(timeout / _profile["poll"])):
+                n = count_nodes(driver, selector, roots)
+                if n > old_count:
+                    cur = n
+                    break
+                time.sleep(_profile["poll"])
+    except Exception:
+        cur = old_count
+    _record(name, time.time() - start)
+    return cur
+
+
+def settle(driver, name, selector, old_count, root=None):
+    """
+    Jeda setelah aksi (scroll/klik) lalu kembalikan jumlah node `selector`.
+    Conservative: jeda tetap lalu hitung; adaptive: tunggu node baru (batas = nilai profil).
+    """
+    if _profile["adaptive"]:
+        return wait_for_growth(driver, selector, old_count, _profile[name], root=root, name=name)
+    pause(name)
+    return count_nodes(driver, selector, root)
+
+
+# ==========================================================
+# Histogram waktu tunggu
+# ==========================================================
+def reset_timings():
+    with _LOCK:
+        _timings.clear()
+
+
+def timing_summary():
+    """Dict nama -> {n, total, mean, p50, p90, max, buckets}."""
+    with _LOCK:
+        items = {k: sorted(v) for k, v in _timings.items()}
+    summary = {}
+    for name, vals in items.items():
+        n = len(vals)
+        buckets = [0] * (len(BUCKETS) + 1)
+        for v in vals:
+            buckets[next((i for i, b in enumerate(BUCKETS) if v <= b), len(BUCKETS))] += 1
+        summary[name] = {
+            "n": n,
+            "total": sum(vals),
+            "mean": sum(vals) / n,
+            "p50": vals[n // 2],
+            "p90": vals[min(n - 1, int(n * 0.9))],
+            "max": vals[-1],
+            "buckets": buckets,
+        }
+    return summary
+
+
+def print_timing_report():
+    summary = timing_summary()
+    if not summary:
+        return
+    name = next(k for k, v in PROFILES.items() if v is _profile)
+    total = sum(s["total"] for s in summary.values())
+    print(f"\n[TIME] Waktu tunggu scraper (profil {name}): total {total:.1f} detik")
+    labels = [f"≤{b}s" for b in BUCKETS] + [f">{BUCKETS[-1]}s"]
+    for key, s in sorted(summary.items(), key=lambda kv: -kv[1]["total"]):
+        print(f"  {key:<16} n={s['n']:<6} total={s['total']:7.1f}s  mean={s['mean']:.2f}s  "
+              f"p50={s['p50']:.2f}s  p90={s['p90']:.2f}s  max={s['max']:.2f}s")
+        hist = "  ".join(f"{lab}:{c}" for lab, c in zip(labels, s["buckets"]) if c)
+        print(f"  {'':<16} {hist}")
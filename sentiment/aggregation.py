@@ -1,6 +1,10 @@
 # sentiment/aggregation.py
+import numpy as np
 import pandas as pd
 
+from pipeline.storage import read_table, write_table
+from pipeline.thread_ids import intern_thread_ids
+
 
 def compute_weighted_thread_sentiment(
     df,
@@ -12,6 +16,8 @@ def compute_weighted_thread_sentiment(
         raise ValueError(f"Kolom wajib: {required}")
 
     df = df.copy()
+    # groupby pada kode int64 (no-op bila sudah di-intern oleh read_table)
+    df["thread_id"] = intern_thread_ids(df["thread_id"])
     df["likes_count"] = df["likes_count"].fillna(0).astype(float)
 
     df["weight"] = (
@@ -22,7 +28,7 @@ def compute_weighted_thread_sentiment(
     df["weighted_score"] = df["contextual_score"] * df["weight"]
 
     summary = (
-        df.groupby("thread_id")
+        df.groupby("thread_id", observed=True)
         .agg(
             total_weight=("weight", "sum"),
             weighted_sum=("weighted_score", "sum"),
@@ -55,7 +61,7 @@ def aggregate_thread_sentiments(
     reply_position_weight=0.3
 ):
     if isinstance(csv_path_or_df, str):
-        df = pd.read_csv(csv_path_or_df)
+        df = read_table(csv_path_or_df)
     else:
         df = csv_path_or_df.copy()
 
@@ -69,3 +75,154 @@ def aggregate_thread_sentiments(
     print(f"[RESULT] Overall sentiment: {overall:.4f}")
 
     return summary
+
+
+# =====================================================
+# SWEEP GRID BOBOT (banyak kombinasi sekaligus)
+# =====================================================
+def sweep_thread_sentiment(
+    df,
+    like_weights,
+    reply_weights,
+    context_weights=None
+):
+    """
+    Hitung weighted_avg_sentiment per thread untuk seluruh grid bobot sekaligus.
+
+    weight = like_w * (likes + 1) + reply_w * is_reply linear terhadap bobot, sehingga
+    cukup menghitung segment-sum (np.add.reduceat) atas baris yang diurutkan per thread:
+        total_weight = like_w * Σ(likes+1) + reply_w * Σis_reply
+        weighted_sum = like_w * Σ(c·(likes+1)) + reply_w * Σ(c·is_reply)
+
+    context_weights: list (reply_weight, main_weight) untuk contextual adjustment
+    (butuh kolom sentiment_score). Jika None, dipakai kolom contextual_score apa adanya.
+    """
+    from .contextual_inference import build_thread_index, contextual_scores
+
+    like_w = np.asarray(like_weights, dtype=np.float64)
+    reply_w = np.asarray(reply_weights, dtype=np.float64)
+
+    if context_weights is None:
+        if "contextual_score" not in df.columns:
+            raise ValueError("Kolom wajib: contextual_score (atau berikan context_weights)")
+        ctx = df["contextual_score"].to_numpy(dtype=np.float64)[:, None]
+    else:
+        if "sentiment_score" not in df.columns:
+            raise ValueError("Kolom wajib untuk context_weights: sentiment_score")
+        ctx = contextual_scores(df["sentiment_score"].to_numpy(), build_thread_index(df), context_weights)
+
+    # urutkan baris per thread_id (urutan sama dengan groupby), buang thread_id kosong
+    codes, thread_ids = pd.factorize(intern_thread_ids(df["thread_id"]), sort=True)
+    valid = codes >= 0
+    order = np.argsort(codes[valid], kind="stable")
+    rows = np.flatnonzero(valid)[order]
+    sorted_codes = codes[rows]
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+
+    likes = df["likes_count"].fillna(0).to_numpy(dtype=np.float64)[rows] + 1
+    is_reply = df["is_reply"].astype(int).to_numpy(dtype=np.float64)[rows]
+    # NaN (reply tanpa komentar utama) dianggap 0 seperti sum() pada groupby
+    ctx = np.nan_to_num(ctx[rows], nan=0.0)
+
+    if len(rows):
+        sum_likes = np.add.reduceat(likes, starts)
+        sum_reply = np.add.reduceat(is_reply, starts)
+        sum_ctx_likes = np.add.reduceat(ctx * likes[:, None], starts, axis=0)
+        sum_ctx_reply = np.add.reduceat(ctx * is_reply[:, None], starts, axis=0)
+    else:
+        sum_likes = sum_reply = np.zeros(0)
+        sum_ctx_likes = sum_ctx_reply = np.zeros((0, ctx.shape[1]))
+    total_comments = np.diff(np.r_[starts, len(rows)])
+
+    # (thread, like_w, reply_w)
+    total_weight = (
+        sum_likes[:, None, None] * like_w[None, :, None]
+        + sum_reply[:, None, None] * reply_w[None, None, :]
+    )
+    # (thread, like_w, reply_w, context)
+    weighted_sum = (
+        sum_ctx_likes[:, None, None, :] * like_w[None, :, None, None]
+        + sum_ctx_reply[:, None, None, :] * reply_w[None, None, :, None]
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weighted_avg = np.clip(weighted_sum / total_weight[..., None], -1, 1)
+
+    return {
+        "thread_id": np.asarray(thread_ids[sorted_codes[starts]] if len(rows) else [], dtype=np.int64),
+        "total_comments": total_comments,
+        "like_weights": like_w,
+        "reply_weights": reply_w,
+        "context_weights": np.asarray(context_weights if context_weights is not None else [[np.nan, np.nan]],
+                                      dtype=np.float64),
+        "total_weight": total_weight,
+        "weighted_avg_sentiment": weighted_avg,
+        "overall_sentiment": _overall_sentiment(weighted_avg, total_weight),
+    }
+
+
+def _overall_sentiment(weighted_avg, total_weight):
+    """Sentimen keseluruhan per kombinasi bobot: (like_w, reply_w, context)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        overall_num = np.nansum(weighted_avg * total_weight[..., None], axis=0)
+        overall_den = total_weight.sum(axis=0)[..., None]
+        return np.where(overall_den == 0, 0.0, overall_num / overall_den)
+
+
+def sweep_summary(sweep, like_idx, reply_idx, context_idx=0):
+    """Ambil satu kombinasi dari hasil sweep dalam format compute_weighted_thread_sentiment."""
+    total_weight = sweep["total_weight"][:, like_idx, reply_idx]
+    avg = sweep["weighted_avg_sentiment"][:, like_idx, reply_idx, context_idx]
+    return pd.DataFrame({
+        "thread_id": sweep["thread_id"],
+        "total_weight": total_weight,
+        "weighted_sum": avg * total_weight,
+        "total_comments": sweep["total_comments"],
+        "weighted_avg_sentiment": avg,
+    })
+
+
+def save_sweep(sweep, path):
+    """
+    Simpan hasil sweep sebagai satu tabel lewat pipeline.storage (parquet/feather/csv):
+    satu baris per (thread, like_w, reply_w, context), urut seperti array sweep.
+    Mengembalikan path file yang ditulis.
+    """
+    avg = sweep["weighted_avg_sentiment"]
+    n_threads, n_like, n_reply, n_ctx = avg.shape
+    grid = n_like * n_reply * n_ctx
+    context = sweep["context_weights"]
+    table = pd.DataFrame({
+        "thread_id": np.repeat(sweep["thread_id"], grid),
+        "like_weight": np.tile(np.repeat(sweep["like_weights"], n_reply * n_ctx), n_threads),
+        "reply_weight": np.tile(np.repeat(sweep["reply_weights"], n_ctx), n_threads * n_like),
+        "context_reply_weight": np.tile(context[:, 0], n_threads * n_like * n_reply),
+        "context_main_weight": np.tile(context[:, 1], n_threads * n_like * n_reply),
+        "total_comments": np.repeat(sweep["total_comments"], grid),
+        "total_weight": np.repeat(sweep["total_weight"].reshape(-1), n_ctx),
+        "weighted_avg_sentiment": avg.reshape(-1),
+    })
+    return write_table(table, path)
+
+
+def load_sweep(path):
+    """Kebalikan save_sweep: tabel sweep -> dict array seperti hasil sweep_thread_sentiment."""
+    df = read_table(path)
+    like_w = pd.unique(df["like_weight"].to_numpy(dtype=np.float64))
+    reply_w = pd.unique(df["reply_weight"].to_numpy(dtype=np.float64))
+    context = df[["context_reply_weight", "context_main_weight"]].to_numpy(dtype=np.float64)
+    n_ctx = len(pd.unique(pd.Series(map(tuple, context), dtype=object)))
+    grid = len(like_w) * len(reply_w) * n_ctx
+    n_threads = len(df) // grid if grid else 0
+
+    avg = df["weighted_avg_sentiment"].to_numpy(dtype=np.float64).reshape(n_threads, len(like_w), len(reply_w), n_ctx)
+    total_weight = df["total_weight"].to_numpy(dtype=np.float64)[::n_ctx].reshape(avg.shape[:3]) if grid else avg[..., 0]
+    return {
+        "thread_id": df["thread_id"].to_numpy()[::grid] if grid else np.zeros(0, dtype=np.int64),
+        "total_comments": df["total_comments"].to_numpy(dtype=np.int64)[::grid] if grid else np.zeros(0, dtype=np.int64),
+        "like_weights": like_w,
+        "reply_weights": reply_w,
+        "context_weights": context[:n_ctx],
+        "total_weight": total_weight,
+        "weighted_avg_sentiment": avg,
+        "overall_sentiment": _overall_sentiment(avg, total_weight),
+    }
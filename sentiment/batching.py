@@ -0,0 +1,56 @@
+# sentiment/batching.py
+import numpy as np
+
+# Anggaran token per batch (jumlah baris x panjang token terpanjang setelah padding)
+DEFAULT_MAX_TOKENS = 4096
+
+
+def plan_length_batches(lengths, max_tokens=DEFAULT_MAX_TOKENS, max_batch_size=None):
+    """
+    Kelompokkan indeks komentar berdasarkan panjang token.
+
+    Komentar diurutkan dari yang terpendek, lalu dipotong menjadi batch
+    sehingga (jumlah baris x panjang terpanjang di batch) <= max_tokens.
+    Mengembalikan list array indeks baris ASLI, sehingga hasil bisa
+    dikembalikan ke urutan input dengan `out[idx] = hasil_batch`.
+    """
+    lengths = np.asarray(lengths, dtype=np.int64)
+    order = np.argsort(lengths, kind="stable")
+    n = len(order)
+
+    batches = []
+    start = 0
+    while start < n:
+        end = start + 1
+        while end < n:
+            rows = end - start + 1
+            if max_batch_size and rows > max_batch_size:
+                break
+            # urutan naik -> baris terakhir selalu yang terpanjang
+            if rows * lengths[order[end]] > max_tokens:
+                break
+            end += 1
+        batches.append(order[start:end])
+        start = end
+
+    return batches
+
+
+def collate_batch(input_ids, idx, pad_token_id=0, with_token_type_ids=True):
+    """
+    Padding satu batch (hanya sampai panjang terpanjang di batch itu).
+    `input_ids` berupa list token id per komentar (tanpa padding).
+    """
+    seqs = [input_ids[i] for i in idx]
+    max_len = max(len(s) for s in seqs)
+
+    ids = np.full((len(seqs), max_len), pad_token_id, dtype=np.int64)
+    mask = np.zeros((len(seqs), max_len), dtype=np.int64)
+    for row, s in enumerate(seqs):
+        ids[row, :len(s)] = s
+        mask[row, :len(s)] = 1
+
+    batch = {"input_ids": ids, "attention_mask": mask}
+    if with_token_type_ids:
+        batch["token_type_ids"] = np.zeros_like(ids)
+    return batch
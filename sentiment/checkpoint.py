@@ -0,0 +1,54 @@
+# sentiment/checkpoint.py
+import os
+import json
+import hashlib
+
+
+def file_sha256(path, block_size=1 << 20):
+    """Hash isi file (dibaca per blok)."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def manifest_path(output_path):
+    """Lokasi manifest sidecar untuk satu file output."""
+    return f"{output_path}.manifest.json"
+
+
+def load_manifest(output_path):
+    path = manifest_path(output_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        print(f"[WARN] Manifest rusak, diabaikan: {path}")
+        return None
+
+
+def save_manifest(output_path, manifest):
+    """Tulis manifest secara atomik (file sementara lalu rename)."""
+    path = manifest_path(output_path)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def can_resume(manifest, expected):
+    """
+    Cek apakah manifest lama cocok dengan run sekarang (hash input dan parameter).
+    Mengembalikan (bisa_resume, alasan).
+    """
+    if manifest is None:
+        return False, "manifest tidak ditemukan"
+    for key, value in expected.items():
+        if manifest.get(key) != value:
+            return False, f"'{key}' berbeda dari run sebelumnya"
+    return True, ""
@@ -1,18 +1,93 @@
 # sentiment/contextual_inference.py
+from collections import namedtuple
+
 import pandas as pd
 import numpy as np
 
+from pipeline.storage import read_table
+
+# main_offset[i] = posisi baris komentar utama dari thread baris i (-1 bila tidak ada)
+ThreadIndex = namedtuple("ThreadIndex", ["main_offset", "is_reply"])
+
+
+def _check_weights(reply_weight, main_weight):
+    if not np.isclose(reply_weight + main_weight, 1.0):
+        raise ValueError("reply_weight + main_weight harus = 1.0")
+
+
+def build_thread_index(df):
+    """
+    Precompute indeks thread: untuk setiap baris, offset baris komentar utama
+    (komentar utama pertama per thread_id, sama seperti drop_duplicates).
+    """
+    required = {"thread_id", "is_reply"}
+    if not required.issubset(df.columns):
+        raise ValueError(f"Kolom wajib: {required}")
+
+    # NaN thread_id tetap dianggap satu kelompok (mengikuti perilaku merge pandas)
+    codes, _ = pd.factorize(df["thread_id"], use_na_sentinel=False)
+    is_main = (df["is_reply"] == False).to_numpy()
+    is_reply = (df["is_reply"] == True).to_numpy()
+
+    main_rows = np.flatnonzero(is_main)
+    thread_main = np.full(codes.max() + 1 if len(codes) else 0, -1, dtype=np.int64)
+    uniq_codes, first_pos = np.unique(codes[main_rows], return_index=True)
+    thread_main[uniq_codes] = main_rows[first_pos]
+
+    return ThreadIndex(main_offset=thread_main[codes], is_reply=is_reply)
+
+
+def main_sentiment_from_index(scores, index):
+    """Gather skor komentar utama untuk setiap baris (NaN bila thread tanpa komentar utama)."""
+    scores = np.asarray(scores, dtype=np.float64)
+    has_main = index.main_offset >= 0
+    return np.where(has_main, scores[np.where(has_main, index.main_offset, 0)], np.nan)
+
+
+def contextual_scores(scores, index, weight_pairs, main_sentiment=None):
+    """
+    Hitung contextual_score untuk banyak pasangan (reply_weight, main_weight) sekaligus.
+    Hasil berbentuk (n_baris, n_pasangan); komentar utama tetap memakai skornya sendiri.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    if main_sentiment is None:
+        main_sentiment = main_sentiment_from_index(scores, index)
+
+    reply_w = np.array([rw for rw, _ in weight_pairs], dtype=np.float64)
+    main_w = np.array([mw for _, mw in weight_pairs], dtype=np.float64)
+
+    blended = scores[:, None] * reply_w[None, :] + main_sentiment[:, None] * main_w[None, :]
+    return np.where(index.is_reply[:, None], blended, scores[:, None])
+
+
+def adjust_sentiment_contextually_many(df, experiments):
+    """
+    Semua eksperimen bobot dalam satu pass (tanpa merge/copy DataFrame).
+    `experiments`: dict nama -> (reply_weight, main_weight).
+    Mengembalikan (main_sentiment, dict nama -> array contextual_score).
+    """
+    for reply_w, main_w in experiments.values():
+        _check_weights(reply_w, main_w)
+    if "sentiment_score" not in df.columns:
+        raise ValueError("Kolom wajib: {'thread_id', 'sentiment_score', 'is_reply'}")
+
+    index = build_thread_index(df)
+    scores = df["sentiment_score"].to_numpy(dtype=np.float64)
+    main_sentiment = main_sentiment_from_index(scores, index)
+    matrix = contextual_scores(scores, index, list(experiments.values()), main_sentiment=main_sentiment)
+
+    return main_sentiment, {name: matrix[:, j] for j, name in enumerate(experiments)}
+
 
 def adjust_sentiment_contextually(
     df_or_path,
     reply_weight=0.6,
     main_weight=0.4
 ):
-    if not np.isclose(reply_weight + main_weight, 1.0):
-        raise ValueError("reply_weight + main_weight harus = 1.0")
+    _check_weights(reply_weight, main_weight)
 
     if isinstance(df_or_path, str):
-        df = pd.read_csv(df_or_path)
+        df = read_table(df_or_path)
     else:
         df = df_or_path.copy()
 
@@ -23,27 +98,20 @@ def adjust_sentiment_contextually(
     print(f"[PROCESS] Contextual adjustment reply={reply_weight}, main={main_weight}")
 
     # =====================================================
-    # 1️⃣ Ambil SENTIMEN KOMENTAR UTAMA (SATU PER THREAD)
+    # 1️⃣ Indeks thread: baris komentar utama untuk setiap baris
     # =====================================================
-    main_sentiment = (
-        df[df["is_reply"] == False]
-        .drop_duplicates(subset=["thread_id"])
-        .set_index("thread_id")["sentiment_score"]
-        .rename("main_sentiment")
-    )
-
-    df = df.merge(main_sentiment, on="thread_id", how="left")
+    index = build_thread_index(df)
+    scores = df["sentiment_score"].to_numpy(dtype=np.float64)
+    main_sentiment = main_sentiment_from_index(scores, index)
 
     # =====================================================
     # 2️⃣ Contextual adjustment (HANYA UNTUK BALASAN)
     # =====================================================
-    df["contextual_score"] = df["sentiment_score"]
-
-    mask_reply = df["is_reply"] == True
-    df.loc[mask_reply, "contextual_score"] = (
-        reply_weight * df.loc[mask_reply, "sentiment_score"]
-        + main_weight * df.loc[mask_reply, "main_sentiment"]
-    )
+    df = df.reset_index(drop=True)
+    df["main_sentiment"] = main_sentiment
+    df["contextual_score"] = contextual_scores(
+        scores, index, [(reply_weight, main_weight)], main_sentiment=main_sentiment
+    )[:, 0]
 
     # =====================================================
     # 3️⃣ LOG DEBUG (SANGAT DISARANKAN)
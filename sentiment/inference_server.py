@@ -0,0 +1,207 @@
+# sentiment/inference_server.py
+import os
+import json
+import time
+import queue
+import threading
+import socketserver
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .model_registry import warmup
+from .sentiment_inference import score_texts
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_MAX_BATCH = 64
+DEFAULT_MAX_WAIT_MS = 10
+
+_STOP = object()
+
+
+class MicroBatcher:
+    """
+    Mengumpulkan request yang datang bersamaan menjadi satu batch inferensi.
+    Batch dijalankan ketika sudah berisi `max_batch_size` teks atau
+    `max_wait_ms` sejak teks pertama masuk, mana yang lebih dulu.
+    """
+
+    def __init__(self, model_name=None, backend="torch",
+                 max_batch_size=DEFAULT_MAX_BATCH, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        self.model_name = model_name
+        self.backend = backend
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.n_requests = 0
+        self.n_batches = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._loop, name="micro-batcher", daemon=True)
+
+    def start(self):
+        # model tetap di memori selama server hidup
+        warmup(self.model_name, backend=self.backend)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def submit(self, text):
+        fut = Future()
+        self._queue.put((str(text), fut))
+        return fut
+
+    def predict(self, texts, timeout=30):
+        """Skor untuk list teks; dipanggil dari thread mana pun."""
+        futures = [self.submit(t) for t in texts]
+        return [f.result(timeout=timeout) for f in futures]
+
+    def _collect(self, first):
+        items = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(items) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._queue.put(_STOP)
+                break
+            items.append(item)
+        return items
+
+    def _loop(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+
+            items = self._collect(first)
+            texts = [t for t, _ in items]
+            try:
+                scores, labels = score_texts(texts, model_name=self.model_name, backend=self.backend)
+            except Exception as e:
+                for _, fut in items:
+                    fut.set_exception(e)
+                continue
+
+            self.n_requests += len(items)
+            self.n_batches += 1
+            for (_, fut), score, label in zip(items, scores, labels):
+                fut.set_result({"sentiment_score": float(score), "predicted_label": label})
+
+
+def _make_handler(batcher):
+    class SentimentRequestHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status, payload):
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path != "/health":
+                return self._send_json(404, {"error": "not found"})
+            self._send_json(200, {
+                "status": "ok",
+                "model": batcher.model_name,
+                "backend": batcher.backend,
+                "requests": batcher.n_requests,
+                "batches": batcher.n_batches,
+            })
+
+        def do_POST(self):
+            if self.path != "/predict":
+                return self._send_json(404, {"error": "not found"})
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                return self._send_json(400, {"error": "body harus JSON"})
+
+            if not isinstance(payload, dict):
+                return self._send_json(400, {"error": "body harus objek JSON"})
+            if "texts" in payload:
+                texts = payload["texts"]
+            elif "text" in payload:
+                texts = [payload["text"]]
+            else:
+                return self._send_json(400, {"error": "gunakan field 'text' atau 'texts'"})
+            # validasi di sini agar input salah tidak masuk antrean batch bersama request lain
+            if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+                return self._send_json(400, {"error": "'text' harus string dan 'texts' harus list string"})
+
+            try:
+                results = batcher.predict(texts)
+            except Exception as e:
+                return self._send_json(500, {"error": str(e)})
+            self._send_json(200, {"results": results})
+
+        def log_message(self, format, *args):
+            # log per request dimatikan agar tidak memperlambat server
+            pass
+
+    return SentimentRequestHandler
+
+
+# backlog default (5) terlalu kecil untuk banyak klien bersamaan
+REQUEST_QUEUE_SIZE = 256
+
+
+class _SentimentHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = REQUEST_QUEUE_SIZE
+
+
+if hasattr(socketserver, "UnixStreamServer"):
+    class _ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+        request_queue_size = REQUEST_QUEUE_SIZE
+
+        def get_request(self):
+            request, _ = super().get_request()
+            # BaseHTTPRequestHandler mengharapkan alamat (host, port)
+            return request, ("unix", 0)
+
+
+def serve(model_name=None, backend="torch", host=DEFAULT_HOST, port=DEFAULT_PORT, unix_socket=None,
+          max_batch_size=DEFAULT_MAX_BATCH, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+    """
+    Jalankan server inferensi lokal (HTTP via TCP atau Unix socket).
+
+    Endpoint:
+      POST /predict  {"text": "..."} atau {"texts": [...]}
+                     -> {"results": [{"sentiment_score": .., "predicted_label": ..}, ...]}
+      GET  /health
+    """
+    batcher = MicroBatcher(model_name, backend, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms).start()
+    handler = _make_handler(batcher)
+
+    if unix_socket:
+        if not hasattr(socketserver, "UnixStreamServer"):
+            raise RuntimeError("Unix socket tidak didukung di sistem operasi ini, gunakan host/port.")
+        if os.path.exists(unix_socket):
+            os.remove(unix_socket)
+        server = _ThreadingUnixHTTPServer(unix_socket, handler)
+        where = f"unix:{unix_socket}"
+    else:
+        server = _SentimentHTTPServer((host, port), handler)
+        where = f"http://{host}:{port}"
+
+    print(f"[INFO] Server inferensi aktif di {where} "
+          f"(max_batch={max_batch_size}, max_wait={max_wait_ms} ms). Tekan Ctrl+C untuk berhenti.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n[INFO] Server dihentikan.")
+    finally:
+        server.server_close()
+        batcher.stop()
+        if unix_socket and os.path.exists(unix_socket):
+            os.remove(unix_socket)
@@ -2,7 +2,10 @@
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
 import torch
 
-def load_model_and_tokenizer(model_name="mdhugol/indonesia-bert-sentiment-classification"):
+DEFAULT_MODEL_NAME = "mdhugol/indonesia-bert-sentiment-classification"
+
+def load_model_and_tokenizer(model_name=DEFAULT_MODEL_NAME):
+    model_name = model_name or DEFAULT_MODEL_NAME
     print(f"[INFO] Loading fine-tuned sentiment model: {model_name}")
     tokenizer = AutoTokenizer.from_pretrained(model_name)
     model = AutoModelForSequenceClassification.from_pretrained(model_name)
@@ -0,0 +1,83 @@
+# sentiment/model_registry.py
+import threading
+from collections import OrderedDict
+
+import torch
+
+from .model_loader import load_model_and_tokenizer, DEFAULT_MODEL_NAME
+
+# Jumlah maksimum model yang disimpan di memori sekaligus (LRU)
+MAX_LOADED_MODELS = 2
+
+_REGISTRY = OrderedDict()
+_LOCK = threading.Lock()
+
+
+def _load(model_name, backend):
+    if backend == "torch":
+        return load_model_and_tokenizer(model_name=model_name)
+    if backend in ("onnx", "onnx-int8"):
+        from .onnx_backend import load_onnx_model_and_tokenizer
+        return load_onnx_model_and_tokenizer(model_name, quantize=(backend == "onnx-int8"))
+    raise ValueError(f"Backend tidak dikenal: {backend} (pilihan: torch, onnx, onnx-int8)")
+
+
+def get_model(model_name=None, backend="torch"):
+    """
+    Ambil (tokenizer, model, device, id2label) dari registry proses.
+    Model hanya di-load sekali per (nama, backend); bila registry penuh,
+    model yang paling lama tidak dipakai akan dilepas.
+    """
+    key = (model_name or DEFAULT_MODEL_NAME, backend)
+
+    with _LOCK:
+        if key in _REGISTRY:
+            _REGISTRY.move_to_end(key)
+            return _REGISTRY[key]
+
+        entry = _load(key[0], backend)
+        _REGISTRY[key] = entry
+
+        while len(_REGISTRY) > MAX_LOADED_MODELS:
+            evicted, _ = _REGISTRY.popitem(last=False)
+            print(f"[INFO] Model dilepas dari registry (LRU): {evicted}")
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+
+        return entry
+
+
+def register_model(entry, model_name=None, backend="torch"):
+    """Daftarkan (tokenizer, model, device, id2label) yang sudah di-load sendiri."""
+    key = (model_name or DEFAULT_MODEL_NAME, backend)
+    with _LOCK:
+        _REGISTRY[key] = entry
+        _REGISTRY.move_to_end(key)
+
+
+def warmup(model_name=None, backend="torch"):
+    """Load model lebih awal dan jalankan satu forward pass kecil."""
+    tokenizer, model, device, _ = get_model(model_name, backend=backend)
+    inputs = tokenizer("pemanasan model", return_tensors="pt")
+    inputs = {k: v.to(device) for k, v in inputs.items()}
+    with torch.no_grad():
+        model(**inputs)
+    print(f"[INFO] Model siap digunakan: {model_name or DEFAULT_MODEL_NAME}")
+
+
+def release_model(model_name=None, backend="torch"):
+    """Lepaskan satu model dari registry (jika ada)."""
+    with _LOCK:
+        _REGISTRY.pop((model_name or DEFAULT_MODEL_NAME, backend), None)
+
+
+def clear_registry():
+    """Kosongkan seluruh registry."""
+    with _LOCK:
+        _REGISTRY.clear()
+
+
+def loaded_models():
+    """Daftar (nama model, backend) yang sedang dimuat (urutan LRU -> MRU)."""
+    with _LOCK:
+        return list(_REGISTRY.keys())
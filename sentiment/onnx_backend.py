@@ -0,0 +1,142 @@
+# sentiment/onnx_backend.py
+import os
+import inspect
+from types import SimpleNamespace
+
+import numpy as np
+import torch
+from transformers import AutoConfig, AutoTokenizer, AutoModelForSequenceClassification
+
+from .model_loader import DEFAULT_MODEL_NAME
+
+ONNX_DIR = os.path.join(os.path.dirname(__file__), "cache", "onnx")
+
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
+
+def _onnx_paths(model_name, out_dir=ONNX_DIR):
+    safe_name = model_name.strip("/").replace("/", "__")
+    folder = os.path.join(out_dir, safe_name)
+    return folder, os.path.join(folder, "model.onnx"), os.path.join(folder, "model.int8.onnx")
+
+
+def export_to_onnx(model_name=DEFAULT_MODEL_NAME, out_dir=ONNX_DIR, quantize=False):
+    """
+    Ekspor model HuggingFace ke ONNX (sekali saja), opsional dengan
+    dynamic int8 quantization. Mengembalikan path file .onnx yang dipakai.
+    """
+    model_name = model_name or DEFAULT_MODEL_NAME
+    folder, fp32_path, int8_path = _onnx_paths(model_name, out_dir)
+    os.makedirs(folder, exist_ok=True)
+
+    if not os.path.exists(fp32_path):
+        print(f"[INFO] Ekspor model ke ONNX: {model_name}")
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = AutoModelForSequenceClassification.from_pretrained(model_name)
+        model.eval()
+
+        dummy = tokenizer(["contoh komentar"], return_tensors="pt")
+        # nama input harus mengikuti urutan argumen forward(), bukan urutan key tokenizer
+        forward_args = list(inspect.signature(model.forward).parameters)
+        input_names = [name for name in forward_args if name in dummy]
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+        dynamic_axes["logits"] = {0: "batch"}
+
+        # gunakan exporter TorchScript (mendukung dynamic_axes) bila ada pilihan
+        export_kwargs = {}
+        if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+            export_kwargs["dynamo"] = False
+
+        tmp_path = f"{fp32_path}.tmp{os.getpid()}"
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                (dict(dummy),),
+                tmp_path,
+                input_names=input_names,
+                output_names=["logits"],
+                dynamic_axes=dynamic_axes,
+                opset_version=17,
+                **export_kwargs,
+            )
+        os.replace(tmp_path, fp32_path)
+        print(f"[DONE] ONNX tersimpan: {fp32_path}")
+
+    if not quantize:
+        return fp32_path
+
+    if not os.path.exists(int8_path):
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+
+        print("[INFO] Dynamic int8 quantization...")
+        tmp_path = f"{int8_path}.tmp{os.getpid()}"
+        quantize_dynamic(fp32_path, tmp_path, weight_type=QuantType.QInt8)
+        os.replace(tmp_path, int8_path)
+        print(f"[DONE] ONNX int8 tersimpan: {int8_path}")
+
+    return int8_path
+
+
+class OnnxSequenceClassifier:
+    """
+    Pembungkus ONNX Runtime dengan antarmuka yang sama seperti model HuggingFace
+    (`model(**inputs).logits`, `model.config`, `model.eval()`), sehingga bisa
+    dipakai langsung oleh compute_sentiment_scores / infer_single_sentence.
+    """
+
+    def __init__(self, onnx_path, config, num_threads=None):
+        import onnxruntime as ort
+
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            opts.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(onnx_path, opts, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.config = config
+
+    def eval(self):
+        return self
+
+    def to(self, device):
+        return self
+
+    def __call__(self, **inputs):
+        feed = {}
+        for name, value in inputs.items():
+            if name not in self.input_names:
+                continue
+            if isinstance(value, torch.Tensor):
+                value = value.cpu().numpy()
+            feed[name] = np.asarray(value, dtype=np.int64)
+        logits = self.session.run(["logits"], feed)[0]
+        return SimpleNamespace(logits=torch.from_numpy(logits))
+
+
+def load_onnx_model_and_tokenizer(model_name=DEFAULT_MODEL_NAME, quantize=False, num_threads=None):
+    """Padanan load_model_and_tokenizer untuk backend ONNX Runtime (CPU)."""
+    model_name = model_name or DEFAULT_MODEL_NAME
+    onnx_path = export_to_onnx(model_name, quantize=quantize)
+
+    print(f"[INFO] Loading ONNX sentiment model: {onnx_path}")
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    config = AutoConfig.from_pretrained(model_name)
+    model = OnnxSequenceClassifier(onnx_path, config, num_threads=num_threads)
+    device = torch.device("cpu")
+
+    id2label = config.id2label
+    print(f"[INFO] Label mapping: {id2label}")
+    return tokenizer, model, device, id2label
+
+
+def drift_summary(df_ref, df_other):
+    """Bandingkan hasil dua backend (kolom sentiment_score & predicted_label)."""
+    diff = np.abs(df_ref["sentiment_score"].to_numpy() - df_other["sentiment_score"].to_numpy())
+    agree = (df_ref["predicted_label"].to_numpy() == df_other["predicted_label"].to_numpy())
+    return {
+        "n_rows": int(len(diff)),
+        "mean_abs_score_diff": float(diff.mean()) if len(diff) else 0.0,
+        "max_abs_score_diff": float(diff.max()) if len(diff) else 0.0,
+        "label_agreement": float(agree.mean()) if len(agree) else 1.0,
+        "label_flips": int((~agree).sum()),
+    }
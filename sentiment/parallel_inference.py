@@ -0,0 +1,145 @@
+# sentiment/parallel_inference.py
+import os
+import queue
+import atexit
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import torch
+from tqdm import tqdm
+from torch.nn.functional import softmax
+from transformers import AutoConfig
+
+from .model_loader import DEFAULT_MODEL_NAME
+from .model_registry import get_model
+
+# Pool worker dipertahankan antar pemanggilan (satu per model/backend/jumlah worker)
+_POOLS = {}
+
+# State di dalam proses worker
+_WORKER = {}
+
+
+def _core_groups(num_workers):
+    """Bagi core CPU yang tersedia menjadi `num_workers` kelompok."""
+    if hasattr(os, "sched_getaffinity"):
+        cores = sorted(os.sched_getaffinity(0))
+    else:
+        cores = list(range(os.cpu_count() or 1))
+    groups = np.array_split(np.array(cores), min(num_workers, len(cores)))
+    return [g.tolist() for g in groups]
+
+
+def _worker_init(model_name, backend, core_queue):
+    # tidak pernah menunggu: bila kelompok core sudah habis dipakai, pakai semua core
+    try:
+        cores = core_queue.get_nowait()
+    except queue.Empty:
+        cores = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count() or 1))
+    if hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, cores)
+        except OSError:
+            pass
+    torch.set_num_threads(max(1, len(cores)))
+
+    tokenizer, model, device, _ = get_model(model_name, backend=backend)
+    _WORKER["model"] = model
+    _WORKER["device"] = device
+
+
+def _worker_infer(task):
+    batch_no, batch = task
+    model = _WORKER["model"]
+    device = _WORKER["device"]
+    inputs = {k: torch.from_numpy(v).to(device) for k, v in batch.items()}
+    with torch.no_grad():
+        logits = model(**inputs).logits
+        probs = softmax(logits, dim=-1).cpu().numpy()
+    return batch_no, probs
+
+
+def get_pool(num_workers, model_name=None, backend="torch"):
+    """
+    Buat (atau pakai ulang) pool worker; tiap worker punya model dan core sendiri.
+    Nama model divalidasi dulu di proses utama (hanya config) agar kesalahan muncul
+    sebagai exception, bukan worker yang gagal start.
+    """
+    key = (model_name, backend, num_workers)
+    if key in _POOLS:
+        return _POOLS[key]
+
+    AutoConfig.from_pretrained(model_name or DEFAULT_MODEL_NAME)
+
+    ctx = mp.get_context("spawn")
+    groups = _core_groups(num_workers)
+    core_queue = ctx.Queue()
+    for g in groups:
+        core_queue.put(g)
+
+    print(f"[INFO] Menjalankan {len(groups)} worker inferensi "
+          f"({', '.join(str(len(g)) for g in groups)} core per worker)")
+    pool = ProcessPoolExecutor(
+        max_workers=len(groups),
+        mp_context=ctx,
+        initializer=_worker_init,
+        initargs=(model_name, backend, core_queue)
+    )
+    _POOLS[key] = pool
+    return pool
+
+
+def _drop_pool(pool):
+    for key, p in list(_POOLS.items()):
+        if p is pool:
+            _POOLS.pop(key)
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_pools():
+    """Hentikan semua pool worker."""
+    for pool in _POOLS.values():
+        pool.shutdown(wait=True)
+    _POOLS.clear()
+
+
+atexit.register(shutdown_pools)
+
+
+def predict_batches_sharded(batches, collate, n_rows, n_labels, num_workers,
+                            model_name=None, backend="torch"):
+    """
+    Jalankan forward pass untuk setiap batch indeks di beberapa proses.
+    `collate(idx)` menghasilkan dict array numpy untuk satu batch.
+    Hasil digabung kembali sesuai urutan baris input.
+    """
+    pool = get_pool(num_workers, model_name=model_name, backend=backend)
+    probs_all = np.zeros((n_rows, n_labels), dtype=np.float32)
+
+    # batch dikirim bertahap (maksimal 2 per worker sedang diproses) agar memori terbatas
+    tasks = ((i, collate(idx)) for i, idx in enumerate(batches))
+    max_inflight = 2 * max(1, num_workers)
+    inflight = set()
+    try:
+        with tqdm(total=len(batches), desc="Sentiment inference (sharded)", ncols=80) as bar:
+            for task in tasks:
+                inflight.add(pool.submit(_worker_infer, task))
+                if len(inflight) >= max_inflight:
+                    done, inflight = wait(inflight, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        batch_no, probs = fut.result()
+                        probs_all[batches[batch_no]] = probs
+                        bar.update(1)
+            for fut in list(inflight):
+                batch_no, probs = fut.result()
+                probs_all[batches[batch_no]] = probs
+                bar.update(1)
+    except BrokenProcessPool:
+        # worker mati (crash / gagal load model): pool dibuang agar panggilan berikutnya membuat ulang
+        print("[ERROR] Worker inferensi berhenti tidak normal; pool dihentikan.")
+        _drop_pool(pool)
+        raise
+
+    return probs_all
@@ -0,0 +1,123 @@
+# sentiment/result_cache.py
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+import numpy as np
+
+RESULT_CACHE_PATH = os.path.join(os.path.dirname(__file__), "cache", "results.sqlite")
+DEFAULT_MAX_ENTRIES = 500_000
+
+# Batas jumlah parameter per query SQLite
+_CHUNK = 500
+
+_CACHES = {}
+
+
+def normalize_text(text):
+    """Normalisasi ringan (spasi) sebelum hashing; tidak mengubah hasil tokenisasi."""
+    return " ".join(str(text).split())
+
+
+def text_hash(text):
+    """Hash komentar yang sudah dinormalisasi."""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class SentimentResultCache:
+    """
+    Cache persisten (SQLite) untuk vektor probabilitas per (model, hash teks).
+    Ukuran dibatasi `max_entries`; entri yang paling lama tidak dipakai dihapus lebih dulu.
+    """
+
+    def __init__(self, path=RESULT_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS results (
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                probs BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON results(last_used)")
+        self._conn.commit()
+
+    def get_many(self, model, hashes):
+        """Kembalikan dict hash -> np.ndarray(float32) untuk hash yang ada di cache."""
+        found = {}
+        with self._lock:
+            for i in range(0, len(hashes), _CHUNK):
+                chunk = hashes[i:i + _CHUNK]
+                marks = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, probs FROM results WHERE model = ? AND text_hash IN ({marks})",
+                    [model, *chunk]
+                ).fetchall()
+                for h, blob in rows:
+                    found[h] = np.frombuffer(blob, dtype=np.float32)
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE results SET last_used = ? WHERE model = ? AND text_hash = ?",
+                    [(now, model, h) for h in found]
+                )
+                self._conn.commit()
+
+            self.hits += len(found)
+            self.misses += len(hashes) - len(found)
+        return found
+
+    def put_many(self, model, hashes, probs):
+        """Simpan probabilitas (satu baris per hash), lalu evict bila melebihi batas."""
+        now = time.time()
+        probs = np.asarray(probs, dtype=np.float32)
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO results (model, text_hash, probs, last_used) VALUES (?, ?, ?, ?)",
+                [(model, h, p.tobytes(), now) for h, p in zip(hashes, probs)]
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        excess = total - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM results WHERE rowid IN "
+                "(SELECT rowid FROM results ORDER BY last_used ASC LIMIT ?)",
+                (excess,)
+            )
+            print(f"[CACHE] {excess} entri hasil lama dihapus (batas {self.max_entries}).")
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def get_result_cache(path=RESULT_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+    """Satu instance cache per path dalam satu proses."""
+    if path not in _CACHES:
+        _CACHES[path] = SentimentResultCache(path, max_entries=max_entries)
+    return _CACHES[path]
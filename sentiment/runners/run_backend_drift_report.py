@@ -0,0 +1,82 @@
+# sentiment/runners/run_backend_drift_report.py
+import os
+import time
+import pandas as pd
+from sentiment import model_registry
+from sentiment.sentiment_inference import compute_sentiment_scores
+from sentiment.onnx_backend import drift_summary
+from pipeline.storage import list_tables, read_table
+
+CLEAN_DIR = os.path.join("cleaning", "dataset")
+REPORT_DIR = os.path.join("sentiment", "analysis_results")
+MODEL_NAME = "mdhugol/indonesia-bert-sentiment-classification"
+CANDIDATES = ["onnx", "onnx-int8"]
+
+
+def _run(df, backend):
+    start = time.perf_counter()
+    out = compute_sentiment_scores(
+        df,
+        model_name=MODEL_NAME,
+        backend=backend,
+        # tanpa cache hasil maupun token: tiap backend diukur penuh dengan kondisi sama
+        use_result_cache=False,
+        use_token_cache=False
+    )
+    return out, time.perf_counter() - start
+
+
+def main():
+    files = [p.name for p in list_tables(CLEAN_DIR)]
+    if not files:
+        print("[INFO] Tidak ada file CSV di cleaning/dataset")
+        return
+
+    df = pd.concat(
+        [read_table(os.path.join(CLEAN_DIR, f)) for f in files],
+        ignore_index=True
+    )
+    print(f"[INFO] Total komentar untuk perbandingan: {len(df)}")
+
+    # Semua backend tetap di memori, dan dijalankan sekali untuk load/ekspor
+    # model agar waktu load tidak ikut terhitung
+    model_registry.MAX_LOADED_MODELS = max(model_registry.MAX_LOADED_MODELS, len(CANDIDATES) + 1)
+    for backend in ["torch", *CANDIDATES]:
+        _run(df.head(8), backend)
+
+    ref, ref_time = _run(df, "torch")
+
+    lines = [
+        "LAPORAN DRIFT BACKEND INFERENSI INDOBERT",
+        f"Model        : {MODEL_NAME}",
+        f"File         : {', '.join(files)}",
+        f"Total baris  : {len(df)}",
+        f"[torch] waktu: {ref_time:.2f} s ({len(df) / ref_time:.1f} komentar/s)",
+        "",
+    ]
+
+    for backend in CANDIDATES:
+        out, elapsed = _run(df, backend)
+        s = drift_summary(ref, out)
+        lines += [
+            f"=== {backend} ===",
+            f"  Waktu              : {elapsed:.2f} s ({len(df) / elapsed:.1f} komentar/s)",
+            f"  Speedup vs torch   : {ref_time / elapsed:.2f}x",
+            f"  Mean |Δ score|     : {s['mean_abs_score_diff']:.6f}",
+            f"  Max  |Δ score|     : {s['max_abs_score_diff']:.6f}",
+            f"  Kesamaan label     : {s['label_agreement'] * 100:.2f}% ({s['label_flips']} label berubah)",
+            "",
+        ]
+
+    report = "\n".join(lines)
+    print("\n" + report)
+
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    out_path = os.path.join(REPORT_DIR, "backend_drift_report.txt")
+    with open(out_path, "w", encoding="utf-8") as f:
+        f.write(report)
+    print(f"[DONE] Laporan tersimpan: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
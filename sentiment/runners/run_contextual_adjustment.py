@@ -1,7 +1,9 @@
 # sentiment/runners/run_contextual_adjustment.py
+import os
 from pathlib import Path
-import pandas as pd
-from sentiment.contextual_inference import adjust_sentiment_contextually
+from sentiment.contextual_inference import adjust_sentiment_contextually_many
+from pipeline.storage import list_tables, read_table, write_table
+from pipeline.stage_cache import file_stage_key, outputs_fresh, record_outputs
 
 INPUT_DIR = Path("sentiment/dataset/sentiment")
 
@@ -12,7 +14,7 @@ EXPERIMENTS = {
 }
 
 def main():
-    files = list(INPUT_DIR.glob("*.csv"))
+    files = list_tables(INPUT_DIR)
     if not files:
         print("[INFO] Tidak ada file sentiment untuk diproses.")
         return
@@ -24,28 +26,38 @@ def main():
     choice = input("\nPilih file (contoh: 1,2): ").strip()
     idxs = [int(x)-1 for x in choice.split(",") if x.strip().isdigit()]
 
-    for exp_name, (reply_w, main_w) in EXPERIMENTS.items():
-        print(f"\n=== EXPERIMENT {exp_name} ===")
-        out_dir = Path(f"sentiment/dataset/contextual/{exp_name}")
-        out_dir.mkdir(parents=True, exist_ok=True)
+    out_dirs = {}
+    for exp_name in EXPERIMENTS:
+        out_dirs[exp_name] = Path(f"sentiment/dataset/contextual/{exp_name}")
+        out_dirs[exp_name].mkdir(parents=True, exist_ok=True)
 
-        for i in idxs:
-            if i < 0 or i >= len(files):
-                continue
+    for i in idxs:
+        if i < 0 or i >= len(files):
+            continue
 
-            f = files[i]
-            df = pd.read_csv(f)
+        f = files[i]
+        out_paths = {
+            exp_name: out_dirs[exp_name] / f.name.replace("_sentiment.csv", "_contextual.csv")
+            for exp_name in EXPERIMENTS
+        }
+        key = file_stage_key("contextual", [f], {"experiments": EXPERIMENTS})
+        if outputs_fresh(out_paths.values(), key):
+            print(f"\n[SKIP] {f.name}: input, bobot & kode tidak berubah")
+            continue
 
-            print(f"[PROCESS] {f.name}")
-            df_ctx = adjust_sentiment_contextually(
-                df,
-                reply_weight=reply_w,
-                main_weight=main_w
-            )
+        df = read_table(f)
 
-            out_path = out_dir / f.name.replace("_sentiment.csv", "_contextual.csv")
-            df_ctx.to_csv(out_path, index=False, encoding="utf-8-sig")
-            print(f"✓ Saved: {out_path.name}")
+        # Semua eksperimen bobot dihitung sekaligus dari satu indeks thread
+        print(f"\n[PROCESS] {f.name} ({len(EXPERIMENTS)} eksperimen)")
+        main_sentiment, ctx_scores = adjust_sentiment_contextually_many(df, EXPERIMENTS)
+        df["main_sentiment"] = main_sentiment
+
+        for exp_name, scores in ctx_scores.items():
+            df["contextual_score"] = scores
+            out_path = out_paths[exp_name]
+            saved = write_table(df, out_path)
+            print(f"✓ [{exp_name}] Saved: {os.path.basename(saved)}")
+        record_outputs(out_paths.values(), key)
 
     print("\n🎉 Contextual adjustment selesai.")
 
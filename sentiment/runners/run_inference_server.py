@@ -0,0 +1,31 @@
+# sentiment/runners/run_inference_server.py
+import argparse
+from sentiment.inference_server import (
+    serve, DEFAULT_HOST, DEFAULT_PORT, DEFAULT_MAX_BATCH, DEFAULT_MAX_WAIT_MS
+)
+
+MODEL_NAME = "mdhugol/indonesia-bert-sentiment-classification"
+
+def main():
+    parser = argparse.ArgumentParser(description="Server inferensi sentimen lokal (micro-batching)")
+    parser.add_argument("--model", default=MODEL_NAME)
+    parser.add_argument("--backend", default="torch", choices=["torch", "onnx", "onnx-int8"])
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix-socket", default=None, help="Path Unix socket (menggantikan host/port)")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH)
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT_MS)
+    args = parser.parse_args()
+
+    serve(
+        model_name=args.model,
+        backend=args.backend,
+        host=args.host,
+        port=args.port,
+        unix_socket=args.unix_socket,
+        max_batch_size=args.max_batch,
+        max_wait_ms=args.max_wait_ms
+    )
+
+if __name__ == "__main__":
+    main()
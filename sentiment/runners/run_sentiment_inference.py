@@ -1,14 +1,17 @@
 # sentiment/runners/run_sentiment_inference.py
 import os
-from sentiment.sentiment_inference import analyze_and_save
+from sentiment.sentiment_inference import analyze_and_save, DEFAULT_CHUNKSIZE
+from pipeline.stage_cache import file_stage_key, outputs_fresh, record_outputs
+from pipeline.storage import list_tables
 
 CLEAN_DIR = os.path.join("cleaning", "dataset")
 OUTPUT_DIR = os.path.join("sentiment", "dataset", "sentiment")
+MODEL_NAME = "mdhugol/indonesia-bert-sentiment-classification"
 
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 def main():
-    files = [f for f in os.listdir(CLEAN_DIR) if f.endswith(".csv")]
+    files = [p.name for p in list_tables(CLEAN_DIR)]
     if not files:
         print("[INFO] Tidak ada file CSV di cleaning/dataset")
         return
@@ -29,13 +32,20 @@ def main():
         inp = os.path.join(CLEAN_DIR, fname)
         out = os.path.join(OUTPUT_DIR, f"{base}_sentiment.csv")
 
+        key = file_stage_key("sentiment", [inp], {"model_name": MODEL_NAME, "backend": "torch"})
+        if outputs_fresh([out], key):
+            print(f"\n[SKIP] {fname}: input, model & kode tidak berubah")
+            continue
+
         print(f"\n▶ Sentiment inference: {fname}")
         analyze_and_save(
             csv_path=inp,
             output_path=out,
             batch_size=64,
-            model_name="mdhugol/indonesia-bert-sentiment-classification"
+            model_name=MODEL_NAME,
+            chunksize=DEFAULT_CHUNKSIZE
         )
+        record_outputs([out], key)
 
         print(f"✓ Saved: {out}")
 
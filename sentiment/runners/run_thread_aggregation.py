@@ -1,10 +1,14 @@
 # sentiment/runners/run_thread_aggregation.py
+import os
 from pathlib import Path
-import pandas as pd
 from sentiment.aggregation import aggregate_thread_sentiments
+from pipeline.storage import list_tables, read_table, write_table
+from pipeline.stage_cache import file_stage_key, outputs_fresh, record_outputs
 
 BASE_CONTEXTUAL_DIR = Path("sentiment/dataset/contextual")
 BASE_SUMMARY_DIR = Path("sentiment/dataset/summary")
+LIKE_WEIGHT = 0.7
+REPLY_POSITION_WEIGHT = 0.3
 
 def main():
     experiments = [d for d in BASE_CONTEXTUAL_DIR.iterdir() if d.is_dir()]
@@ -29,16 +33,26 @@ def main():
 
         print(f"\n=== AGGREGATION {exp_dir.name} ===")
 
-        for csv_file in exp_dir.glob("*.csv"):
+        for csv_file in list_tables(exp_dir):
+            out_path = summary_dir / csv_file.name.replace("_contextual.csv", "_cleaned_summary.csv")
+            key = file_stage_key("summary", [csv_file], {
+                "like_weight": LIKE_WEIGHT, "reply_position_weight": REPLY_POSITION_WEIGHT
+            })
+            if outputs_fresh([out_path], key):
+                print(f"[SKIP] {csv_file.name}: input, bobot & kode tidak berubah")
+                continue
+
             print(f"[PROCESS] {csv_file.name}")
 
-            df = pd.read_csv(csv_file)
-            summary = aggregate_thread_sentiments(df)
+            df = read_table(csv_file)
+            summary = aggregate_thread_sentiments(
+                df, like_weight=LIKE_WEIGHT, reply_position_weight=REPLY_POSITION_WEIGHT
+            )
 
-            out_path = summary_dir / csv_file.name.replace("_contextual.csv", "_cleaned_summary.csv")
-            summary.to_csv(out_path, index=False, encoding="utf-8-sig")
+            saved = write_table(summary, out_path)
+            record_outputs([out_path], key)
 
-            print(f"✓ Saved: {out_path.name}")
+            print(f"✓ Saved: {os.path.basename(saved)}")
 
     print("\n🎉 Agregasi thread-level selesai.")
 
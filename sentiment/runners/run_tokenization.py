@@ -0,0 +1,34 @@
+# sentiment/runners/run_tokenization.py
+import os
+from pipeline.storage import list_tables, read_table
+from sentiment.model_registry import get_model
+from sentiment.token_cache import tokenize_cached
+from sentiment.result_cache import normalize_text
+
+CLEAN_DIR = os.path.join("cleaning", "dataset")
+MODEL_NAME = "mdhugol/indonesia-bert-sentiment-classification"
+
+def main():
+    files = [p.name for p in list_tables(CLEAN_DIR)]
+    if not files:
+        print("[INFO] Tidak ada file CSV di cleaning/dataset")
+        return
+
+    tokenizer = get_model(MODEL_NAME)[0]
+
+    for fname in files:
+        print(f"\n▶ Tokenisasi: {fname}")
+        df = read_table(os.path.join(CLEAN_DIR, fname), columns=["cleaned_comment"])
+        if "cleaned_comment" not in df.columns:
+            print(f"[SKIP] Kolom 'cleaned_comment' tidak ditemukan pada {fname}")
+            continue
+
+        # teks yang sama dengan yang diminta inferensi: dinormalisasi lalu diambil yang unik
+        texts = list(dict.fromkeys(normalize_text(t) for t in df["cleaned_comment"].fillna("").astype(str)))
+        tokens = tokenize_cached(texts, tokenizer, max_length=256)
+        print(f"✓ {len(tokens)} komentar, {int(tokens.lengths.sum())} token")
+
+    print("\n🎉 Token cache siap. Inferensi berikutnya tidak perlu tokenisasi ulang.")
+
+if __name__ == "__main__":
+    main()
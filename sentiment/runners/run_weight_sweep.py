@@ -0,0 +1,68 @@
+# sentiment/runners/run_weight_sweep.py
+from pathlib import Path
+import numpy as np
+from sentiment.aggregation import sweep_thread_sentiment, save_sweep
+from pipeline.storage import list_tables, read_table
+from pipeline.stage_cache import file_stage_key, outputs_fresh, record_outputs
+
+INPUT_DIR = Path("sentiment/dataset/sentiment")
+OUTPUT_DIR = Path("sentiment/dataset/sweep")
+
+# Grid bobot agregasi (like_weight x reply_position_weight)
+LIKE_WEIGHTS = np.round(np.arange(0.0, 1.01, 0.1), 2)
+REPLY_WEIGHTS = np.round(np.arange(0.0, 1.01, 0.1), 2)
+
+# Grid contextual adjustment (reply_weight, main_weight); (1.0, 0.0) = tanpa konteks
+CONTEXT_WEIGHTS = [(1.0, 0.0), (0.9, 0.1), (0.8, 0.2), (0.7, 0.3), (0.6, 0.4), (0.5, 0.5)]
+
+def main():
+    files = list_tables(INPUT_DIR)
+    if not files:
+        print("[INFO] Tidak ada file sentiment untuk diproses.")
+        return
+
+    print("\n📂 File sentiment tersedia:")
+    for i, f in enumerate(files, 1):
+        print(f"{i}. {f.name}")
+
+    choice = input("\nPilih file (contoh: 1,2): ").strip()
+    idxs = [int(x)-1 for x in choice.split(",") if x.strip().isdigit()]
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    n_combos = len(LIKE_WEIGHTS) * len(REPLY_WEIGHTS) * len(CONTEXT_WEIGHTS)
+
+    for i in idxs:
+        if i < 0 or i >= len(files):
+            continue
+
+        f = files[i]
+        # path logis .csv; file nyata mengikuti STORAGE_FORMAT (parquet/feather/csv)
+        out_path = OUTPUT_DIR / f.name.replace("_sentiment.csv", "_sweep.csv")
+        key = file_stage_key("sweep", [f], {
+            "like_weights": LIKE_WEIGHTS.tolist(),
+            "reply_weights": REPLY_WEIGHTS.tolist(),
+            "context_weights": CONTEXT_WEIGHTS,
+        })
+        if outputs_fresh([out_path], key):
+            print(f"\n[SKIP] {f.name}: input, grid & kode tidak berubah")
+            continue
+
+        df = read_table(f, columns=["thread_id", "is_reply", "likes_count", "sentiment_score"])
+
+        print(f"\n[PROCESS] {f.name} ({n_combos} kombinasi bobot)")
+        sweep = sweep_thread_sentiment(df, LIKE_WEIGHTS, REPLY_WEIGHTS, CONTEXT_WEIGHTS)
+
+        saved = save_sweep(sweep, out_path)
+        record_outputs([out_path], key)
+        print(f"✓ Saved: {saved} ({len(sweep['thread_id'])} thread)")
+
+        # ringkasan: sentimen keseluruhan per konteks pada bobot default (0.7, 0.3)
+        li = int(np.argmin(np.abs(LIKE_WEIGHTS - 0.7)))
+        ri = int(np.argmin(np.abs(REPLY_WEIGHTS - 0.3)))
+        for k, (rw, mw) in enumerate(CONTEXT_WEIGHTS):
+            print(f"  ↳ context reply={rw}, main={mw}: overall={sweep['overall_sentiment'][li, ri, k]:.4f}")
+
+    print("\n🎉 Sweep bobot agregasi selesai.")
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,32 @@
 # sentiment/sentiment_inference.py
 import os
+import time
+import shutil
 import torch
 import numpy as np
 import pandas as pd
 from tqdm import tqdm
 from torch.nn.functional import softmax
 
-from .model_loader import load_model_and_tokenizer
+from .model_loader import DEFAULT_MODEL_NAME
+from .model_registry import get_model
+from .batching import DEFAULT_MAX_TOKENS, plan_length_batches, collate_batch
+from .token_cache import tokenize_cached
+from .result_cache import get_result_cache, normalize_text, text_hash
+from .parallel_inference import predict_batches_sharded
+from .checkpoint import file_sha256, load_manifest, save_manifest, can_resume
+from pipeline.storage import (
+    STORAGE_FORMAT, apply_schema, read_table, write_table, resolve_table,
+    iter_table_chunks, parts_dir, write_part, merge_parts, to_text_ids
+)
+
+# Mapping label model mdhugol -> label human-readable
+LABEL_MAP_HUMAN = {
+    "LABEL_0": "positive",
+    "LABEL_1": "neutral",
+    "LABEL_2": "negative"
+}
+
 
 # Helper: determine pos/neg indices robustly
 def _resolve_pos_neg_indices(model):
@@ -76,68 +96,300 @@ def _resolve_pos_neg_indices(model):
     )
 
 
-# Batch scoring function
-def compute_sentiment_scores(df, batch_size=64, model_name=None):
-    tokenizer, model, device, id2label = load_model_and_tokenizer(model_name=model_name)
-    pos_idx, neg_idx, neu_idx, label_names = _resolve_pos_neg_indices(model)
-
-    texts = df["cleaned_comment"].fillna("").astype(str).tolist()
-    scores = []
-    predicted_labels = []   # <-- tambahan
-
-    model.eval()
-
-    for i in tqdm(range(0, len(texts), batch_size), desc="Sentiment inference", ncols=80):
-        batch_texts = texts[i:i + batch_size]
-        inputs = tokenizer(batch_texts, padding=True, truncation=True, max_length=256, return_tensors="pt")
-        inputs = {k: v.to(device) for k, v in inputs.items()}
+def _predict_probabilities(texts, tokenizer, model, device, n_labels, batch_size=64,
+                           max_tokens=DEFAULT_MAX_TOKENS, use_token_cache=True,
+                           num_workers=1, model_name=None, backend="torch", batch_timings=None,
+                           show_progress=True):
+    """
+    Forward pass untuk list teks; hasil (n_texts, n_labels) sesuai urutan input.
+    Jika `batch_timings` berupa list, setiap batch menambahkan
+    (jumlah_baris, token_asli, token_setelah_padding, detik) untuk benchmark.
+    """
+    probs_all = np.zeros((len(texts), n_labels), dtype=np.float32)
+    if not texts:
+        return probs_all
+
+    # Tokenisasi sekali tanpa padding, lalu batch disusun berdasarkan panjang token
+    # (batch_size menjadi batas jumlah baris, max_tokens batas token per batch)
+    if use_token_cache:
+        input_ids = tokenize_cached(texts, tokenizer, max_length=256)
+        lengths = input_ids.lengths
+    else:
+        input_ids = tokenizer(texts, truncation=True, max_length=256)["input_ids"]
+        lengths = [len(ids) for ids in input_ids]
+    batches = plan_length_batches(lengths, max_tokens=max_tokens, max_batch_size=batch_size)
+    with_tti = "token_type_ids" in tokenizer.model_input_names
+
+    if num_workers > 1:
+        # beberapa proses, masing-masing dengan salinan model dan core sendiri
+        return predict_batches_sharded(
+            batches,
+            lambda idx: collate_batch(input_ids, idx, tokenizer.pad_token_id or 0, with_token_type_ids=with_tti),
+            len(texts), n_labels, num_workers,
+            model_name=model_name, backend=backend
+        )
+
+    for idx in tqdm(batches, desc="Sentiment inference", ncols=80, disable=not show_progress):
+        t0 = time.perf_counter()
+        batch = collate_batch(input_ids, idx, tokenizer.pad_token_id or 0, with_token_type_ids=with_tti)
+        inputs = {k: torch.from_numpy(v).to(device) for k, v in batch.items()}
 
         with torch.no_grad():
             outputs = model(**inputs)
             logits = outputs.logits
             probs_batch = softmax(logits, dim=-1).cpu().numpy()
 
-        for probs in probs_batch:
-            p_pos = float(probs[pos_idx])
-            p_neg = float(probs[neg_idx])
-            score = max(-1.0, min(1.0, p_pos - p_neg))
+        # kembalikan ke urutan baris asli
+        probs_all[idx] = probs_batch
 
-            scores.append(score)
+        if batch_timings is not None:
+            mask = batch["attention_mask"]
+            batch_timings.append((len(idx), int(mask.sum()), int(mask.size), time.perf_counter() - t0))
 
-            # label kategori
-            predicted_labels.append(_label_from_probabilities(probs, label_names))
+    return probs_all
+
+
+# Batch scoring function
+def compute_sentiment_scores(df, batch_size=64, model_name=None, max_tokens=DEFAULT_MAX_TOKENS,
+                             use_token_cache=True, use_result_cache=True, backend="torch", num_workers=1,
+                             batch_timings=None):
+    tokenizer, model, device, id2label = get_model(model_name, backend=backend)
+    pos_idx, neg_idx, neu_idx, label_names = _resolve_pos_neg_indices(model)
+
+    texts = df["cleaned_comment"].fillna("").astype(str).tolist()
+    model.eval()
+
+    # Komentar identik (setelah normalisasi spasi) cukup diinferensi sekali
+    codes, uniques = pd.factorize(pd.Series([normalize_text(t) for t in texts], dtype=object))
+    uniques = list(uniques)
+    n_labels = len(label_names)
+    probs_unique = np.zeros((len(uniques), n_labels), dtype=np.float32)
+    todo = list(range(len(uniques)))
+
+    if use_result_cache:
+        cache = get_result_cache()
+        cache_model = model_name or DEFAULT_MODEL_NAME
+        if backend != "torch":
+            # hasil ONNX/int8 bisa sedikit berbeda -> disimpan terpisah
+            cache_model = f"{cache_model}@{backend}"
+        hashes = [text_hash(t) for t in uniques]
+        found = cache.get_many(cache_model, hashes)
+        todo = [i for i, h in enumerate(hashes) if h not in found]
+        for i, h in enumerate(hashes):
+            if h in found:
+                probs_unique[i] = found[h]
+        print(f"[CACHE] {len(texts)} komentar, {len(uniques)} unik, "
+              f"{len(uniques) - len(todo)} dari cache, {len(todo)} perlu inferensi")
+
+    if todo:
+        probs_unique[todo] = _predict_probabilities(
+            [uniques[i] for i in todo], tokenizer, model, device, n_labels,
+            batch_size=batch_size, max_tokens=max_tokens, use_token_cache=use_token_cache,
+            num_workers=num_workers, model_name=model_name, backend=backend,
+            batch_timings=batch_timings
+        )
+        if use_result_cache:
+            cache.put_many(cache_model, [hashes[i] for i in todo], probs_unique[todo])
+
+    # Skor & label dihitung sekali per teks unik (operasi array), lalu disebar ke semua baris
+    scores_unique, labels_unique = scores_from_probabilities(probs_unique, pos_idx, neg_idx, label_names)
+    probs_all = probs_unique[codes]
 
     df = df.copy()
-    df["sentiment_score"] = scores
-    df["predicted_label"] = predicted_labels   # <-- tambahan kolom
+    df["sentiment_score"] = scores_unique[codes]
+    df["predicted_label"] = labels_unique[codes]   # <-- tambahan kolom
+
+    # probabilitas mentah (float32)
+    df["p_pos"] = probs_all[:, pos_idx]
+    if neu_idx is not None:
+        df["p_neu"] = probs_all[:, neu_idx]
+    df["p_neg"] = probs_all[:, neg_idx]
 
     return df
 
 
-def analyze_and_save(csv_path, output_path, batch_size=64, model_name=None):
+def score_texts(texts, model_name=None, backend="torch", batch_size=64, max_tokens=DEFAULT_MAX_TOKENS):
+    """
+    Jalur ringan untuk sekumpulan kecil teks (mis. server / mode interaktif):
+    tanpa DataFrame, cache, atau progress bar. Mengembalikan (scores, labels).
+    """
+    tokenizer, model, device, id2label = get_model(model_name, backend=backend)
+    pos_idx, neg_idx, neu_idx, label_names = _resolve_pos_neg_indices(model)
+    probs = _predict_probabilities(
+        list(texts), tokenizer, model, device, len(label_names),
+        batch_size=batch_size, max_tokens=max_tokens, use_token_cache=False,
+        model_name=model_name, backend=backend, show_progress=False
+    )
+    return scores_from_probabilities(probs, pos_idx, neg_idx, label_names)
+
+
+# Kolom yang disimpan pada file *_sentiment.csv
+# (p_neu hanya ada bila model punya label netral; kolom yang tidak ada dilewati)
+OUTPUT_COLUMNS = ["thread_id", "cleaned_comment", "likes_count", "is_reply",
+                  "sentiment_score", "predicted_label", "p_pos", "p_neu", "p_neg"]
+
+# Jumlah baris per chunk pada mode streaming
+DEFAULT_CHUNKSIZE = 20_000
+
+
+def analyze_and_save(csv_path, output_path, batch_size=64, model_name=None, max_tokens=DEFAULT_MAX_TOKENS,
+                     use_token_cache=True, use_result_cache=True, backend="torch", num_workers=1,
+                     chunksize=None, resume=False):
     print(f"[PROCESS] Analysing file: {csv_path}")
-    df = pd.read_csv(csv_path)
+    infer_kwargs = dict(
+        batch_size=batch_size,
+        model_name=model_name,
+        max_tokens=max_tokens,
+        use_token_cache=use_token_cache,
+        use_result_cache=use_result_cache,
+        backend=backend,
+        num_workers=num_workers
+    )
+
+    # resume membutuhkan checkpoint per chunk -> selalu lewat mode streaming
+    if resume and not chunksize:
+        chunksize = DEFAULT_CHUNKSIZE
+
+    if chunksize:
+        return _analyze_and_save_streaming(csv_path, output_path, chunksize, infer_kwargs, resume=resume)
+
+    df = read_table(csv_path)
     if "cleaned_comment" not in df.columns:
         raise ValueError("Input CSV must contain 'cleaned_comment' column.")
-    df_out = compute_sentiment_scores(df, batch_size=batch_size, model_name=model_name)
+    df_out = compute_sentiment_scores(df, **infer_kwargs)
 
     # ===== Simpan kolom yang relevan, termasuk konteks =====
-    keep_cols = []
-    for col in ["thread_id", "cleaned_comment", "likes_count", "is_reply",
-            "sentiment_score", "predicted_label"]:
-        if col in df_out.columns:
-            keep_cols.append(col)
+    keep_cols = [col for col in OUTPUT_COLUMNS if col in df_out.columns]
 
     df_out = df_out[keep_cols]
-    df_out.to_csv(output_path, index=False, encoding="utf-8-sig")
+    saved = write_table(df_out, output_path)
 
-    print(f"[DONE] Saved sentiment CSV: {output_path}")
+    print(f"[DONE] Saved sentiment dataset: {saved}")
+
+
+def _analyze_and_save_streaming(csv_path, output_path, chunksize, infer_kwargs, resume=False):
+    """
+    Mode streaming: baca `chunksize` baris, inferensi, lalu langsung tulis
+    ke disk. Memori tetap datar berapa pun ukuran file.
+
+    Format csv: chunk di-append ke file output. Format kolumnar: tiap chunk
+    ditulis sebagai part parquet (atomik) lalu digabung menjadi satu file di akhir.
+
+    Setiap chunk yang selesai dicatat di manifest sidecar (`*.manifest.json`),
+    sehingga run yang terputus bisa dilanjutkan dengan `resume=True`.
+    """
+    columnar = STORAGE_FORMAT != "csv"
+    part_dir = parts_dir(output_path)
+    csv_output = os.path.splitext(output_path)[0] + ".csv"
+
+    def part_path(chunk_no):
+        return os.path.join(part_dir, f"part-{chunk_no:05d}.parquet")
+
+    expected = {
+        "input_sha256": file_sha256(resolve_table(csv_path)),
+        "chunksize": chunksize,
+        "model_name": infer_kwargs["model_name"] or DEFAULT_MODEL_NAME,
+        "backend": infer_kwargs["backend"],
+        "format": STORAGE_FORMAT,
+        # checkpoint dengan susunan kolom lain tidak boleh disambung
+        "columns": OUTPUT_COLUMNS,
+    }
+
+    manifest = None
+    if resume:
+        old = load_manifest(output_path)
+        ok, reason = can_resume(old, expected)
+        if ok and old.get("finished"):
+            if not os.path.exists(resolve_table(output_path)):
+                ok, reason = False, "file output tidak ditemukan"
+        elif ok:
+            if columnar:
+                if not all(os.path.exists(part_path(i)) for i in range(1, len(old["completed"]) + 1)):
+                    ok, reason = False, "part file checkpoint tidak lengkap"
+            elif not os.path.exists(csv_output) or os.path.getsize(csv_output) < old["output_bytes"]:
+                ok, reason = False, "file output lebih pendek dari checkpoint"
+        if ok:
+            manifest = old
+        else:
+            print(f"[RESUME] Tidak bisa melanjutkan ({reason}), mulai dari awal.")
+
+    if manifest and manifest.get("finished"):
+        print(f"[RESUME] Input tidak berubah dan sudah selesai diproses, dilewati: {output_path}")
+        return
+
+    if manifest is None:
+        manifest = {
+            **expected,
+            "input_path": csv_path,
+            "completed": [],
+            "rows_done": 0,
+            "output_bytes": 0,
+            "finished": False,
+        }
+        if columnar:
+            shutil.rmtree(part_dir, ignore_errors=True)
+            os.makedirs(part_dir)
+        mode = "w"
+    else:
+        print(f"[RESUME] Melanjutkan dari baris {manifest['rows_done']} "
+              f"({len(manifest['completed'])} chunk sudah selesai)")
+        if not columnar:
+            # buang tulisan parsial setelah checkpoint terakhir
+            with open(csv_output, "r+b") as f:
+                f.truncate(manifest["output_bytes"])
+        mode = "a"
+
+    chunks_done = len(manifest["completed"])
+    reader = iter_table_chunks(csv_path, chunksize, columns=OUTPUT_COLUMNS)
+
+    f = None if columnar else open(csv_output, mode, newline="", encoding="utf-8-sig")
+    try:
+        for chunk_no, chunk in enumerate(reader, start=1):
+            if chunk_no <= chunks_done:
+                continue
+            if "cleaned_comment" not in chunk.columns:
+                raise ValueError("Input CSV must contain 'cleaned_comment' column.")
+
+            start_row = manifest["rows_done"]
+            print(f"[CHUNK {chunk_no}] Baris {start_row}–{start_row + len(chunk) - 1}")
+            chunk_out = compute_sentiment_scores(chunk, **infer_kwargs)
+            keep_cols = [col for col in OUTPUT_COLUMNS if col in chunk_out.columns]
+
+            if columnar:
+                write_part(chunk_out[keep_cols], part_path(chunk_no))
+            else:
+                to_text_ids(apply_schema(chunk_out[keep_cols])).to_csv(f, index=False, header=(chunk_no == 1))
+                f.flush()
+                os.fsync(f.fileno())
+                manifest["output_bytes"] = os.path.getsize(csv_output)
+
+            # checkpoint: chunk ini sudah aman di disk
+            manifest["completed"].append([start_row, start_row + len(chunk)])
+            manifest["rows_done"] = start_row + len(chunk)
+            save_manifest(output_path, manifest)
+    finally:
+        if f is not None:
+            f.close()
+
+    saved = csv_output
+    if columnar:
+        n_parts = len(manifest["completed"])
+        if n_parts:
+            saved = merge_parts([part_path(i) for i in range(1, n_parts + 1)], output_path)
+        else:
+            saved = write_table(pd.DataFrame(columns=OUTPUT_COLUMNS), output_path)
+        shutil.rmtree(part_dir, ignore_errors=True)
+
+    manifest["finished"] = True
+    save_manifest(output_path, manifest)
+
+    print(f"[DONE] Saved sentiment dataset (streaming, {manifest['rows_done']} baris): {saved}")
 
 
 
 # Interactive single-sentence inference
-def infer_single_sentence(text, model_name=None):
-    tokenizer, model, device, id2label = load_model_and_tokenizer(model_name=model_name)
+def infer_single_sentence(text, model_name=None, backend="torch"):
+    tokenizer, model, device, id2label = get_model(model_name, backend=backend)
     pos_idx, neg_idx, neu_idx, label_names = _resolve_pos_neg_indices(model)
     model.eval()
     inputs = tokenizer(text, truncation=True, padding=True, max_length=256, return_tensors="pt")
@@ -154,12 +406,7 @@ def infer_single_sentence(text, model_name=None):
     # handle both int and str keys
     label_key = model.config.id2label.get(str(dominant_idx), model.config.id2label.get(dominant_idx, "UNKNOWN"))
 
-    label_map_human = {
-        "LABEL_0": "positive",
-        "LABEL_1": "neutral",
-        "LABEL_2": "negative"
-    }
-    human_label = label_map_human.get(label_key, label_key)
+    human_label = LABEL_MAP_HUMAN.get(label_key, label_key)
 
     print("\n[RESULT] Single-sentence inference")
     print(f"  Input: {text}")
@@ -168,14 +415,17 @@ def infer_single_sentence(text, model_name=None):
     print(f"  Continuous score (pos-neg): {score:.4f}\n")
     return score
 
-def _label_from_probabilities(probs, labels):
-    """Mengembalikan label human-readable ('positive','neutral','negative')."""
-    dominant_idx = int(np.argmax(probs))
-    
-    label_key = labels[dominant_idx]  # ex: "LABEL_0"
-    label_map_human = {
-        "LABEL_0": "positive",
-        "LABEL_1": "neutral",
-        "LABEL_2": "negative"
-    }
-    return label_map_human.get(label_key, "unknown")
+def scores_from_probabilities(probs, pos_idx, neg_idx, labels):
+    """
+    Skor (p_pos - p_neg, di-clip ke [-1, 1]) dan label human-readable
+    ('positive','neutral','negative') untuk seluruh matriks probabilitas sekaligus.
+    """
+    probs = np.asarray(probs, dtype=np.float32)
+    # selisih dihitung dalam float64 seperti versi per-baris (float(p_pos) - float(p_neg))
+    scores = np.clip(
+        probs[:, pos_idx].astype(np.float64) - probs[:, neg_idx].astype(np.float64),
+        -1.0, 1.0
+    )
+    human = np.array([LABEL_MAP_HUMAN.get(l, "unknown") for l in labels], dtype=object)
+    predicted = human[np.argmax(probs, axis=1)] if len(probs) else np.array([], dtype=object)
+    return scores, predicted
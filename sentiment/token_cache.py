@@ -0,0 +1,188 @@
+# sentiment/token_cache.py
+import os
+import shutil
+import hashlib
+import numpy as np
+
+TOKEN_CACHE_DIR = os.path.join(os.path.dirname(__file__), "cache", "tokens")
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+# panjang kunci per teks (digest sha1)
+_KEY_BYTES = 20
+
+
+class RaggedTokens:
+    """
+    Token id hasil tokenisasi (tanpa padding) yang disimpan rata dalam satu array.
+    Komentar ke-i = ids[offsets[i]:offsets[i+1]]; attention_mask dibentuk saat padding.
+    """
+
+    def __init__(self, ids, offsets):
+        self.ids = ids
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.ids[self.offsets[i]:self.offsets[i + 1]]
+
+    @property
+    def lengths(self):
+        return np.diff(self.offsets)
+
+
+class TokenView:
+    """
+    Token untuk list teks yang diambil dari beberapa shard cache (tetap memory-mapped).
+    Komentar ke-i = shards[shard_no[i]][rows[i]].
+    """
+
+    def __init__(self, shards, shard_no, rows):
+        self.shards = shards
+        self.shard_no = shard_no
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, i):
+        return self.shards[self.shard_no[i]][self.rows[i]]
+
+    @property
+    def lengths(self):
+        out = np.zeros(len(self.rows), dtype=np.int64)
+        for no, shard in enumerate(self.shards):
+            sel = self.shard_no == no
+            out[sel] = shard.lengths[self.rows[sel]]
+        return out
+
+
+def _tokenizer_key(tokenizer, max_length):
+    """Identitas tokenizer + max_length (prefix nama shard)."""
+    header = f"{type(tokenizer).__name__}|{tokenizer.name_or_path}|{len(tokenizer)}|{max_length}"
+    return hashlib.sha256(header.encode("utf-8")).hexdigest()[:16]
+
+
+def _text_keys(texts):
+    """Kunci cache per teks (sha1 isi teks), sehingga list apa pun bisa memakai token yang sama."""
+    return [hashlib.sha1(t.encode("utf-8")).digest() for t in texts]
+
+
+def _load(folder):
+    ids = np.load(os.path.join(folder, "input_ids.npy"), mmap_mode="r")
+    offsets = np.load(os.path.join(folder, "offsets.npy"))
+    return RaggedTokens(ids, offsets)
+
+
+def _shard_names(cache_dir, tok_key):
+    if not os.path.isdir(cache_dir):
+        return []
+    return sorted(e.name for e in os.scandir(cache_dir)
+                  if e.is_dir() and e.name.startswith(tok_key + "-") and ".tmp" not in e.name
+                  and os.path.exists(os.path.join(e.path, "offsets.npy")))
+
+
+def _build_index(cache_dir, tok_key):
+    """kunci teks -> (nama shard, baris) untuk semua shard milik tokenizer ini."""
+    index = {}
+    for name in _shard_names(cache_dir, tok_key):
+        raw = np.load(os.path.join(cache_dir, name, "keys.npy")).tobytes()
+        for row in range(len(raw) // _KEY_BYTES):
+            index.setdefault(raw[row * _KEY_BYTES:(row + 1) * _KEY_BYTES], (name, row))
+    return index
+
+
+def _write_shard(cache_dir, tok_key, texts, keys, tokenizer, max_length):
+    """Tokenisasi `texts` dan simpan sebagai satu shard (ids rata + offsets + kunci per teks)."""
+    encoded = tokenizer(list(texts), truncation=True, max_length=max_length)["input_ids"]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(ids) for ids in encoded])
+    flat = np.fromiter(
+        (tok for ids in encoded for tok in ids), dtype=np.int32, count=int(offsets[-1])
+    )
+
+    name = f"{tok_key}-{hashlib.sha256(b''.join(keys)).hexdigest()[:32]}"
+    folder = os.path.join(cache_dir, name)
+    # tulis ke folder sementara lalu rename agar cache tidak pernah setengah jadi
+    tmp_folder = f"{folder}.tmp{os.getpid()}"
+    os.makedirs(tmp_folder, exist_ok=True)
+    np.save(os.path.join(tmp_folder, "input_ids.npy"), flat)
+    np.save(os.path.join(tmp_folder, "offsets.npy"), offsets)
+    # disimpan sebagai matriks uint8 (dtype "S20" membuang byte nol di akhir kunci)
+    np.save(os.path.join(tmp_folder, "keys.npy"),
+            np.frombuffer(b"".join(keys), dtype=np.uint8).reshape(-1, _KEY_BYTES))
+    try:
+        os.replace(tmp_folder, folder)
+    except OSError:
+        # proses lain sudah menulis shard yang sama
+        shutil.rmtree(tmp_folder, ignore_errors=True)
+    return name
+
+
+def _folder_size(folder):
+    return sum(e.stat().st_size for e in os.scandir(folder) if e.is_file())
+
+
+def _evict(cache_dir, max_bytes, keep):
+    """Hapus shard token yang paling lama tidak dipakai (mtime folder) sampai total <= max_bytes."""
+    entries = []
+    for e in os.scandir(cache_dir):
+        if e.is_dir() and ".tmp" not in e.name:
+            entries.append((e.stat().st_mtime, e.name, _folder_size(e.path)))
+    total = sum(size for _, _, size in entries)
+    removed = 0
+    for _, name, size in sorted(entries):
+        if total <= max_bytes:
+            break
+        if name in keep:
+            continue
+        shutil.rmtree(os.path.join(cache_dir, name), ignore_errors=True)
+        total -= size
+        removed += 1
+    if removed:
+        print(f"[CACHE] {removed} token cache lama dihapus (batas {max_bytes / 1024 ** 2:.0f} MB).")
+
+
+def tokenize_cached(texts, tokenizer, max_length=256, cache_dir=TOKEN_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+    """
+    Tokenisasi `texts` dengan cache di disk (memory-mapped).
+    Cache dikunci per teks: hanya teks yang belum pernah ditokenisasi (dengan tokenizer
+    yang sama) yang diproses, lalu disimpan sebagai shard baru.
+    Total ukuran cache dibatasi max_bytes; shard yang paling lama tidak dipakai dihapus lebih dulu.
+    """
+    texts = list(texts)
+    tok_key = _tokenizer_key(tokenizer, max_length)
+    keys = _text_keys(texts)
+    index = _build_index(cache_dir, tok_key)
+
+    # teks yang belum ada di cache (duplikat cukup ditokenisasi sekali)
+    missing = {}
+    for i, k in enumerate(keys):
+        if k not in index and k not in missing:
+            missing[k] = i
+    if missing:
+        os.makedirs(cache_dir, exist_ok=True)
+        name = _write_shard(cache_dir, tok_key, [texts[i] for i in missing.values()],
+                            list(missing), tokenizer, max_length)
+        for row, k in enumerate(missing):
+            index[k] = (name, row)
+    n_cached = sum(1 for k in keys if k not in missing)
+    print(f"[CACHE] Token cache: {len(texts)} komentar, {n_cached} dari cache, {len(missing)} teks ditokenisasi")
+
+    locs = [index[k] for k in keys]
+    names = sorted({name for name, _ in locs})
+    for name in names:
+        # mtime folder = waktu terakhir dipakai (urutan LRU untuk _evict)
+        os.utime(os.path.join(cache_dir, name))
+    if missing:
+        _evict(cache_dir, max_bytes, keep=set(names))
+
+    shards = [_load(os.path.join(cache_dir, name)) for name in names]
+    position = {name: no for no, name in enumerate(names)}
+    shard_no = np.array([position[name] for name, _ in locs], dtype=np.int64)
+    rows = np.array([row for _, row in locs], dtype=np.int64)
+    # satu shard dengan urutan baris persis: langsung kembalikan array memory-mapped-nya
+    if len(shards) == 1 and len(rows) == len(shards[0]) and np.array_equal(rows, np.arange(len(rows))):
+        return shards[0]
+    return TokenView(shards, shard_no, rows)
@@ -1,8 +1,17 @@
 # weighted_average_summary/video_sentiment_summary.py
 import os
+import sys
 import pandas as pd
 from pathlib import Path
 
+# ======================================================
+# FIX PYTHON PATH (PROJECT ROOT)
+# ======================================================
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from pipeline.storage import list_tables, read_table
+
 BASE_SUMMARY_DIR = Path("sentiment/dataset/summary")
 OUTPUT_BASE_DIR = Path("weighted_average_summary")
 OUTPUT_BASE_DIR.mkdir(exist_ok=True)
@@ -31,13 +40,13 @@ def summarize_video_sentiments():
 
         results = []
 
-        files = list(exp_dir.glob("*_cleaned_summary.csv"))
+        files = list_tables(exp_dir, "*_cleaned_summary.csv")
         if not files:
             print(f"[WARN] Tidak ada summary CSV di {exp_dir}")
             continue
 
         for f in files:
-            df = pd.read_csv(f)
+            df = read_table(f)
             if "weighted_avg_sentiment" not in df.columns:
                 print(f"[WARN] Kolom weighted_avg_sentiment tidak ada di {f.name}")
                 continue